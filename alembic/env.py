@@ -23,18 +23,15 @@ config.set_main_option("sqlalchemy.url", str(settings.database_url))
 target_metadata = Base.metadata
 
 
+# Only our application tables take part in migrations
+_ALLOWED_TABLES = frozenset({"tenants", "users", "events", "events_rollup_1m", "alert_rules", "alerts"})
+
+
 def include_name(name: str, type_: str, parent_names: dict) -> bool:
     """Include only our tables in migrations."""
-    if type_ == "table":
-        # Only include our application tables
-        return name in [
-            "tenants",
-            "users", 
-            "events",
-            "alert_rules",
-            "alerts",
-        ]
-    return True
+    if type_ != "table":
+        return True
+    return name in _ALLOWED_TABLES
 
 
 def run_migrations_offline() -> None:
@@ -46,6 +43,7 @@ def run_migrations_offline() -> None:
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         include_name=include_name,
+        transaction_per_migration=True,
     )
 
     with context.begin_transaction():
@@ -65,6 +63,7 @@ def run_migrations_online() -> None:
             connection=connection,
             target_metadata=target_metadata,
             include_name=include_name,
+            transaction_per_migration=True,
         )
 
         with context.begin_transaction():
@@ -1,19 +1,14 @@
 """Fixed Alembic environment for proper auto-generation."""
 
+import os
 from logging.config import fileConfig
-from sqlalchemy import engine_from_config, pool
+from sqlalchemy import engine_from_config
 from alembic import context
 
-# Import our models and config
+# Import our config and metadata
 from core.config import settings
 from core.database import Base
 
-# Import all models to ensure they're registered
-from apps.storage.models.tenant import Tenant
-from apps.storage.models.user import User  
-from apps.storage.models.event import Event
-from apps.storage.models.alert import AlertRule, Alert
-
 # This is the Alembic Config object
 config = context.config
 
@@ -29,23 +24,32 @@ config.set_main_option("sqlalchemy.url", sync_database_url)
 # Add your model's MetaData object here for 'autogenerate' support
 target_metadata = Base.metadata
 
+# Opt-in fast autogenerate for when the models are known to be ahead of the
+# database: skips type/default comparison and database-only objects
+FAST_AUTOGEN = bool(os.getenv("ALEMBIC_FAST_AUTOGEN"))
+
+
+# Only our application tables take part in migrations
+_ALLOWED_TABLES = frozenset({"tenants", "users", "events", "events_rollup_1m", "alert_rules", "alerts"})
+
 
 def include_name(name: str, type_: str, parent_names: dict) -> bool:
     """Include only our tables in migrations."""
-    if type_ == "table":
-        # Only include our application tables
-        return name in [
-            "tenants",
-            "users", 
-            "events",
-            "alert_rules",
-            "alerts",
-        ]
-    return True
+    if type_ != "table":
+        return True
+    return name in _ALLOWED_TABLES
+
+
+def include_object(object, name: str, type_: str, reflected: bool, compare_to) -> bool:
+    """Skip objects that only exist in the database in fast autogenerate mode."""
+    return not (FAST_AUTOGEN and reflected)
 
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
+    # Register models on Base.metadata only when a migration actually runs
+    from apps.storage.models import Tenant, User, Event, AlertRule, Alert  # noqa: F401
+    
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
         url=url,
@@ -53,8 +57,10 @@ def run_migrations_offline() -> None:
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         include_name=include_name,
-        compare_type=True,           # Enable type comparison
-        compare_server_default=True, # Enable default comparison
+        include_object=include_object,
+        transaction_per_migration=True,
+        compare_type=not FAST_AUTOGEN,           # Enable type comparison
+        compare_server_default=not FAST_AUTOGEN, # Enable default comparison
     )
 
     with context.begin_transaction():
@@ -63,12 +69,15 @@ def run_migrations_offline() -> None:
 
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode."""
+    # Register models on Base.metadata only when a migration actually runs
+    from apps.storage.models import Tenant, User, Event, AlertRule, Alert  # noqa: F401
     
     # Create engine with sync driver
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
+        pool_size=1,
+        max_overflow=0,
     )
 
     with connectable.connect() as connection:
@@ -76,8 +85,11 @@ def run_migrations_online() -> None:
             connection=connection,
             target_metadata=target_metadata,
             include_name=include_name,
-            compare_type=True,           # Enable type comparison
-            compare_server_default=True, # Enable default comparison
+            include_object=include_object,
+            transaction_per_migration=True, # Lets revisions use autocommit_block()
+            include_schemas=False,       # Reflect the default schema only
+            compare_type=not FAST_AUTOGEN,           # Enable type comparison
+            compare_server_default=not FAST_AUTOGEN, # Enable default comparison
             # Enable column comparison options
             render_as_batch=True,        # For better SQL generation
         )
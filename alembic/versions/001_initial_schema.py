@@ -30,31 +30,35 @@ def upgrade() -> None:
         sa.Column('is_deleted', sa.Boolean(), nullable=False, default=False),
         sa.Column('name', sa.String(length=255), nullable=False),
         sa.Column('slug', sa.String(length=100), nullable=False),
-        sa.Column('api_key', sa.String(length=64), nullable=False),
+        sa.Column('api_key', postgresql.BYTEA(), nullable=False),
         sa.Column('is_active', sa.Boolean(), nullable=False, default=True),
         sa.Column('rate_limit_per_minute', sa.Integer(), nullable=False, default=100),
         sa.Column('rate_limit_burst', sa.Integer(), nullable=False, default=200),
         sa.Column('subscription_tier', sa.String(length=50), nullable=False, default='free'),
         sa.Column('max_events_per_month', sa.Integer(), nullable=False, default=10000),
         sa.Column('max_alert_rules', sa.Integer(), nullable=False, default=10),
-        sa.Column('contact_email', sa.String(length=255), nullable=True),
-        sa.Column('billing_email', sa.String(length=255), nullable=True),
+        sa.Column('contact_email', sa.String(length=254), nullable=True),
+        sa.Column('billing_email', sa.String(length=254), nullable=True),
         sa.Column('notification_settings', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
         sa.Column('tenant_metadata', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
         sa.Column('current_month_events', sa.Integer(), nullable=False, default=0),
         sa.Column('last_activity_at', sa.DateTime(timezone=True), nullable=True),
         sa.Column('timezone', sa.String(length=50), nullable=False, default='UTC'),
         sa.PrimaryKeyConstraint('id'),
-        sa.UniqueConstraint('api_key', name='uq_tenant_api_key'),
         sa.UniqueConstraint('slug', name='uq_tenant_slug')
     )
     
-    # Create indexes for tenants
-    op.create_index('ix_tenants_id', 'tenants', ['id'])
-    op.create_index('ix_tenants_slug', 'tenants', ['slug'])
-    op.create_index('ix_tenants_api_key', 'tenants', ['api_key'])
-    op.create_index('ix_tenants_is_active', 'tenants', ['is_active'])
-    op.create_index('ix_tenants_is_deleted', 'tenants', ['is_deleted'])
+    # Create indexes for tenants (each table's indexes go out as one round-trip)
+    op.execute("""
+        CREATE INDEX ix_tenants_slug ON tenants (slug);
+        CREATE INDEX ix_tenants_api_key ON tenants USING hash (api_key);
+        CREATE INDEX ix_tenants_is_active ON tenants (is_active);
+        CREATE INDEX ix_tenants_is_deleted ON tenants (is_deleted);
+        CREATE INDEX ix_tenants_notification_settings_gin ON tenants USING gin (notification_settings jsonb_path_ops);
+    """)
+    
+    # Case-insensitive email column type
+    op.execute("CREATE EXTENSION IF NOT EXISTS citext")
     
     # Create users table
     op.create_table(
@@ -64,20 +68,20 @@ def upgrade() -> None:
         sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.Column('is_deleted', sa.Boolean(), nullable=False, default=False),
         sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
-        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('email', postgresql.CITEXT(), nullable=False),
         sa.Column('username', sa.String(length=100), nullable=True),
-        sa.Column('full_name', sa.String(length=255), nullable=True),
+        sa.Column('full_name', sa.String(length=128), nullable=True),
         sa.Column('hashed_password', sa.String(length=128), nullable=False),
         sa.Column('role', sa.String(length=20), nullable=False, default='viewer'),
         sa.Column('is_active', sa.Boolean(), nullable=False, default=True),
         sa.Column('is_verified', sa.Boolean(), nullable=False, default=False),
         sa.Column('last_login_at', sa.DateTime(timezone=True), nullable=True),
         sa.Column('last_active_at', sa.DateTime(timezone=True), nullable=True),
-        sa.Column('login_count', sa.String(length=20), nullable=False, default='0'),
+        sa.Column('login_count', sa.Integer(), nullable=False, server_default=sa.text('0')),
         sa.Column('password_changed_at', sa.DateTime(timezone=True), nullable=True),
         sa.Column('preferences', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
         sa.Column('notification_preferences', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
-        sa.Column('failed_login_attempts', sa.String(length=10), nullable=False, default='0'),
+        sa.Column('failed_login_attempts', sa.SmallInteger(), nullable=False, server_default=sa.text('0')),
         sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True),
         sa.Column('api_access_enabled', sa.Boolean(), nullable=False, default=False),
         sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
@@ -85,22 +89,24 @@ def upgrade() -> None:
     )
     
     # Create indexes for users
-    op.create_index('ix_users_id', 'users', ['id'])
-    op.create_index('ix_users_tenant_id', 'users', ['tenant_id'])
-    op.create_index('ix_users_email', 'users', ['email'])
-    op.create_index('ix_users_is_active', 'users', ['is_active'])
-    op.create_index('ix_users_is_deleted', 'users', ['is_deleted'])
+    op.execute("""
+        CREATE INDEX ix_users_tenant_id ON users (tenant_id);
+        CREATE INDEX ix_users_email ON users (email);
+        CREATE INDEX ix_users_is_active ON users (is_active);
+        CREATE INDEX ix_users_is_deleted ON users (is_deleted);
+    """)
     
     # Create events table
     op.create_table(
         'events',
-        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('id', sa.BigInteger(), sa.Identity(always=True), nullable=False),
+        sa.Column('public_id', postgresql.UUID(as_uuid=True), server_default=sa.text('gen_random_uuid()'), nullable=False),
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.Column('is_deleted', sa.Boolean(), nullable=False, default=False),
         sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('event_type', sa.String(length=50), nullable=False),
-        sa.Column('source', sa.String(length=255), nullable=True),
+        sa.Column('source', sa.String(length=128), nullable=True),
         sa.Column('source_version', sa.String(length=50), nullable=True),
         sa.Column('event_timestamp', sa.DateTime(timezone=True), nullable=False),
         sa.Column('ingested_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
@@ -117,37 +123,58 @@ def upgrade() -> None:
         sa.Column('geo_city', sa.String(length=100), nullable=True),
         sa.Column('user_agent', sa.Text(), nullable=True),
         sa.Column('device_type', sa.String(length=50), nullable=True),
-        sa.Column('alert_processed', sa.String(length=10), nullable=False, default='false'),
+        sa.Column('alert_processed', sa.Boolean(), nullable=False, server_default=sa.text('false')),
         sa.Column('alerts_triggered', sa.Integer(), nullable=False, default=0),
         sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
-        sa.PrimaryKeyConstraint('id')
+        # The partition key has to be part of the primary key
+        sa.PrimaryKeyConstraint('id', 'event_timestamp'),
+        postgresql_partition_by='RANGE (event_timestamp)'
     )
     
+    # Payloads are small-to-medium and read on every evaluation: keep them
+    # out-of-line but uncompressed to skip the LZ decompress on each read.
+    # Set before any partition exists so partitions inherit it.
+    op.execute("ALTER TABLE events ALTER COLUMN payload SET STORAGE EXTERNAL")
+    
+    # Catch-all partition; monthly partitions are created ahead of time by
+    # the create_event_partitions task. Storage parameters cannot be set on a
+    # partitioned parent, so each partition gets fillfactor 90 to leave room
+    # for HOT updates of processing_status/processed_at/alerts_triggered.
+    op.execute("CREATE TABLE events_default PARTITION OF events DEFAULT WITH (fillfactor = 90)")
+    
     # Create indexes for events
-    op.create_index('ix_events_id', 'events', ['id'])
-    op.create_index('ix_events_tenant_id', 'events', ['tenant_id'])
-    op.create_index('ix_events_event_type', 'events', ['event_type'])
-    op.create_index('ix_events_source', 'events', ['source'])
-    op.create_index('ix_events_event_timestamp', 'events', ['event_timestamp'])
-    op.create_index('ix_events_ingested_at', 'events', ['ingested_at'])
-    op.create_index('ix_events_external_id', 'events', ['external_id'])
-    op.create_index('ix_events_correlation_id', 'events', ['correlation_id'])
-    op.create_index('ix_events_processing_status', 'events', ['processing_status'])
-    op.create_index('ix_events_duration_ms', 'events', ['duration_ms'])
-    op.create_index('ix_events_status_code', 'events', ['status_code'])
-    op.create_index('ix_events_geo_country', 'events', ['geo_country'])
-    op.create_index('ix_events_device_type', 'events', ['device_type'])
-    op.create_index('ix_events_alert_processed', 'events', ['alert_processed'])
-    op.create_index('ix_events_is_deleted', 'events', ['is_deleted'])
+    op.execute("""
+        CREATE INDEX ix_events_public_id ON events (public_id);
+        CREATE INDEX ix_events_event_type ON events (event_type);
+        CREATE INDEX ix_events_source ON events (source);
+        CREATE INDEX ix_events_event_timestamp ON events USING brin (event_timestamp) WITH (pages_per_range = 32);
+        CREATE INDEX ix_events_ingested_at ON events USING brin (ingested_at) WITH (pages_per_range = 32);
+        CREATE INDEX ix_events_external_id ON events (external_id);
+        CREATE INDEX ix_events_correlation_id ON events (correlation_id);
+        CREATE INDEX ix_events_status_code ON events (status_code);
+        CREATE INDEX ix_events_geo_country ON events (geo_country);
+        CREATE INDEX ix_events_device_type ON events (device_type);
+        CREATE INDEX ix_events_is_deleted ON events (is_deleted);
+        CREATE INDEX idx_events_tenant_timestamp ON events (tenant_id, event_timestamp DESC) INCLUDE (event_type, status_code);
+        CREATE INDEX idx_events_tenant_type_timestamp ON events (tenant_id, event_type, event_timestamp);
+        CREATE INDEX idx_events_processing_status ON events (processing_status, tenant_id);
+        CREATE INDEX idx_events_alert_processing ON events (alert_processed, tenant_id);
+        CREATE INDEX idx_events_status_code ON events (tenant_id, status_code);
+        CREATE INDEX idx_events_duration ON events (tenant_id, duration_ms);
+        CREATE INDEX idx_events_correlation ON events (tenant_id, correlation_id);
+    """)
     
-    # Create composite indexes for events
-    op.create_index('idx_events_tenant_timestamp', 'events', ['tenant_id', 'event_timestamp'])
-    op.create_index('idx_events_tenant_type_timestamp', 'events', ['tenant_id', 'event_type', 'event_timestamp'])
-    op.create_index('idx_events_processing_status', 'events', ['processing_status', 'tenant_id'])
-    op.create_index('idx_events_alert_processing', 'events', ['alert_processed', 'tenant_id'])
-    op.create_index('idx_events_status_code', 'events', ['tenant_id', 'status_code'])
-    op.create_index('idx_events_duration', 'events', ['tenant_id', 'duration_ms'])
-    op.create_index('idx_events_correlation', 'events', ['tenant_id', 'correlation_id'])
+    # Per-minute event counts for rule evaluation; kept up to date by the
+    # insert trigger added in 002_events_rollup_trigger
+    op.create_table(
+        'events_rollup_1m',
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('event_type', sa.String(length=50), nullable=False),
+        sa.Column('bucket', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('count', sa.BigInteger(), nullable=False, server_default=sa.text('0')),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('tenant_id', 'event_type', 'bucket')
+    )
     
     # Create alert_rules table
     op.create_table(
@@ -179,14 +206,14 @@ def upgrade() -> None:
     )
     
     # Create indexes for alert_rules
-    op.create_index('ix_alert_rules_id', 'alert_rules', ['id'])
-    op.create_index('ix_alert_rules_tenant_id', 'alert_rules', ['tenant_id'])
-    op.create_index('ix_alert_rules_event_type', 'alert_rules', ['event_type'])
-    op.create_index('ix_alert_rules_is_active', 'alert_rules', ['is_active'])
-    op.create_index('ix_alert_rules_is_deleted', 'alert_rules', ['is_deleted'])
-    op.create_index('idx_alert_rules_tenant_active', 'alert_rules', ['tenant_id', 'is_active'])
-    op.create_index('idx_alert_rules_evaluation', 'alert_rules', ['is_active', 'last_evaluated_at'])
-    op.create_index('idx_alert_rules_event_type', 'alert_rules', ['tenant_id', 'event_type'])
+    op.execute("""
+        CREATE INDEX ix_alert_rules_event_type ON alert_rules (event_type);
+        CREATE INDEX ix_alert_rules_is_deleted ON alert_rules (is_deleted);
+        CREATE INDEX idx_alert_rules_tenant_active ON alert_rules (tenant_id, is_active);
+        CREATE INDEX idx_alert_rules_evaluation ON alert_rules (is_active, last_evaluated_at);
+        CREATE INDEX idx_alert_rules_event_type ON alert_rules (tenant_id, event_type);
+        CREATE INDEX ix_alert_rules_channels_gin ON alert_rules USING gin (notification_channels jsonb_path_ops);
+    """)
     
     # Create alerts table
     op.create_table(
@@ -197,7 +224,8 @@ def upgrade() -> None:
         sa.Column('is_deleted', sa.Boolean(), nullable=False, default=False),
         sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('alert_rule_id', postgresql.UUID(as_uuid=True), nullable=False),
-        sa.Column('event_id', postgresql.UUID(as_uuid=True), nullable=True),
+        # No FK to events: the partitioned events PK also covers event_timestamp
+        sa.Column('event_id', sa.BigInteger(), nullable=True),
         sa.Column('title', sa.String(length=255), nullable=False),
         sa.Column('message', sa.Text(), nullable=False),
         sa.Column('severity', sa.String(length=20), nullable=False),
@@ -211,30 +239,33 @@ def upgrade() -> None:
         sa.Column('resolved_by', sa.String(length=255), nullable=True),
         sa.Column('resolution_note', sa.Text(), nullable=True),
         sa.ForeignKeyConstraint(['alert_rule_id'], ['alert_rules.id'], ondelete='CASCADE'),
-        sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='SET NULL'),
         sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id')
     )
     
+    # Alerts are updated in place on resolve/suppress and notification
+    # tracking; leave page space for HOT updates
+    op.execute("ALTER TABLE alerts SET (fillfactor = 90)")
+    
     # Create indexes for alerts
-    op.create_index('ix_alerts_id', 'alerts', ['id'])
-    op.create_index('ix_alerts_tenant_id', 'alerts', ['tenant_id'])
-    op.create_index('ix_alerts_alert_rule_id', 'alerts', ['alert_rule_id'])
-    op.create_index('ix_alerts_event_id', 'alerts', ['event_id'])
-    op.create_index('ix_alerts_severity', 'alerts', ['severity'])
-    op.create_index('ix_alerts_status', 'alerts', ['status'])
-    op.create_index('ix_alerts_triggered_at', 'alerts', ['triggered_at'])
-    op.create_index('ix_alerts_is_deleted', 'alerts', ['is_deleted'])
-    op.create_index('idx_alerts_tenant_status', 'alerts', ['tenant_id', 'status'])
-    op.create_index('idx_alerts_tenant_severity', 'alerts', ['tenant_id', 'severity'])
-    op.create_index('idx_alerts_triggered_at', 'alerts', ['tenant_id', 'triggered_at'])
-    op.create_index('idx_alerts_rule_status', 'alerts', ['alert_rule_id', 'status'])
+    op.execute("""
+        CREATE INDEX ix_alerts_event_id ON alerts (event_id);
+        CREATE INDEX ix_alerts_severity ON alerts (severity);
+        CREATE INDEX ix_alerts_status ON alerts (status);
+        CREATE INDEX ix_alerts_triggered_at ON alerts (triggered_at);
+        CREATE INDEX ix_alerts_is_deleted ON alerts (is_deleted);
+        CREATE INDEX idx_alerts_tenant_status_severity ON alerts (tenant_id, status, severity, triggered_at DESC) INCLUDE (title);
+        CREATE INDEX idx_alerts_tenant_severity ON alerts (tenant_id, severity);
+        CREATE INDEX idx_alerts_triggered_at ON alerts (tenant_id, triggered_at DESC);
+        CREATE INDEX idx_alerts_rule_status ON alerts (alert_rule_id, status);
+    """)
 
 
 def downgrade() -> None:
     """Drop all tables."""
     op.drop_table('alerts')
     op.drop_table('alert_rules')
+    op.drop_table('events_rollup_1m')
     op.drop_table('events')
     op.drop_table('users')
     op.drop_table('tenants')
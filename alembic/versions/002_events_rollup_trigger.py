@@ -0,0 +1,50 @@
+"""Maintain events_rollup_1m from inserts into events
+
+Revision ID: 002_events_rollup_trigger
+Revises: 001_initial_schema
+Create Date: 2025-08-22 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '002_events_rollup_trigger'
+down_revision: Union[str, None] = '001_initial_schema'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the per-minute rollup trigger on events."""
+
+    # Statement-level trigger: a batch insert is grouped once and upserts one
+    # row per (tenant, event_type, minute) instead of one per event
+    op.execute("""
+        CREATE OR REPLACE FUNCTION events_rollup_1m_upsert() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO events_rollup_1m (tenant_id, event_type, bucket, count)
+            SELECT tenant_id, event_type, date_trunc('minute', event_timestamp), count(*)
+            FROM new_events
+            GROUP BY 1, 2, 3
+            ON CONFLICT (tenant_id, event_type, bucket)
+            DO UPDATE SET count = events_rollup_1m.count + EXCLUDED.count;
+            RETURN NULL;
+        END
+        $$
+    """)
+
+    op.execute("""
+        CREATE TRIGGER events_rollup_1m_insert
+        AFTER INSERT ON events
+        REFERENCING NEW TABLE AS new_events
+        FOR EACH STATEMENT EXECUTE FUNCTION events_rollup_1m_upsert()
+    """)
+
+
+def downgrade() -> None:
+    """Drop the rollup trigger."""
+    op.execute("DROP TRIGGER IF EXISTS events_rollup_1m_insert ON events")
+    op.execute("DROP FUNCTION IF EXISTS events_rollup_1m_upsert()")
@@ -0,0 +1,33 @@
+"""Index live events by tenant, type and time for rule evaluation
+
+Revision ID: 003_events_active_index
+Revises: 002_events_rollup_trigger
+Create Date: 2025-08-29 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '003_events_active_index'
+down_revision: Union[str, None] = '002_events_rollup_trigger'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the partial index over non-deleted events."""
+
+    # Rule windows filter on is_deleted = false; leaving soft-deleted rows out
+    # of the index keeps it smaller than idx_events_tenant_type_timestamp
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_events_active_tenant_type_timestamp
+        ON events (tenant_id, event_type, event_timestamp DESC)
+        WHERE is_deleted = false
+    """)
+
+
+def downgrade() -> None:
+    """Drop the partial index."""
+    op.execute("DROP INDEX IF EXISTS idx_events_active_tenant_type_timestamp")
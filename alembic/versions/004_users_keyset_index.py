@@ -0,0 +1,32 @@
+"""Index live users by tenant and creation order for keyset pagination
+
+Revision ID: 004_users_keyset_index
+Revises: 003_events_active_index
+Create Date: 2025-09-05 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '004_users_keyset_index'
+down_revision: Union[str, None] = '003_events_active_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the partial index over non-deleted users."""
+
+    # /auth/users pages seek to (created_at, id) > cursor within a tenant
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_users_active_tenant_created
+        ON users (tenant_id, created_at, id)
+        WHERE is_deleted = false
+    """)
+
+
+def downgrade() -> None:
+    """Drop the partial index."""
+    op.execute("DROP INDEX IF EXISTS idx_users_active_tenant_created")
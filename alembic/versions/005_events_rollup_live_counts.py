@@ -0,0 +1,101 @@
+"""Keep events_rollup_1m to live events across updates and soft deletes
+
+Revision ID: 005_events_rollup_live_counts
+Revises: 004_users_keyset_index
+Create Date: 2025-09-12 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '005_events_rollup_live_counts'
+down_revision: Union[str, None] = '004_users_keyset_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Count only live events, adjust the rollup on update, and rebuild it."""
+
+    # Rows inserted already deleted are not counted
+    op.execute("""
+        CREATE OR REPLACE FUNCTION events_rollup_1m_upsert() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO events_rollup_1m (tenant_id, event_type, bucket, count)
+            SELECT tenant_id, event_type, date_trunc('minute', event_timestamp), count(*)
+            FROM new_events
+            WHERE NOT is_deleted
+            GROUP BY 1, 2, 3
+            ON CONFLICT (tenant_id, event_type, bucket)
+            DO UPDATE SET count = events_rollup_1m.count + EXCLUDED.count;
+            RETURN NULL;
+        END
+        $$
+    """)
+
+    # Updates take the old live rows out of their buckets and add the new
+    # ones, so soft deletes decrement; unchanged buckets net to zero
+    op.execute("""
+        CREATE OR REPLACE FUNCTION events_rollup_1m_adjust() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO events_rollup_1m (tenant_id, event_type, bucket, count)
+            SELECT tenant_id, event_type, bucket, sum(delta)
+            FROM (
+                SELECT tenant_id, event_type, date_trunc('minute', event_timestamp) AS bucket, -1 AS delta
+                FROM old_events
+                WHERE NOT is_deleted
+                UNION ALL
+                SELECT tenant_id, event_type, date_trunc('minute', event_timestamp), 1
+                FROM new_events
+                WHERE NOT is_deleted
+            ) AS changes
+            GROUP BY 1, 2, 3
+            HAVING sum(delta) <> 0
+            ON CONFLICT (tenant_id, event_type, bucket)
+            DO UPDATE SET count = events_rollup_1m.count + EXCLUDED.count;
+            RETURN NULL;
+        END
+        $$
+    """)
+
+    op.execute("""
+        CREATE TRIGGER events_rollup_1m_update
+        AFTER UPDATE ON events
+        REFERENCING OLD TABLE AS old_events NEW TABLE AS new_events
+        FOR EACH STATEMENT EXECUTE FUNCTION events_rollup_1m_adjust()
+    """)
+
+    # Existing buckets still count soft-deleted events; TRUNCATE holds off
+    # concurrent trigger writes until the rebuilt counts commit
+    op.execute("TRUNCATE events_rollup_1m")
+    op.execute("""
+        INSERT INTO events_rollup_1m (tenant_id, event_type, bucket, count)
+        SELECT tenant_id, event_type, date_trunc('minute', event_timestamp), count(*)
+        FROM events
+        WHERE NOT is_deleted
+        GROUP BY 1, 2, 3
+    """)
+
+
+def downgrade() -> None:
+    """Drop the update trigger and count every inserted event again."""
+    op.execute("DROP TRIGGER IF EXISTS events_rollup_1m_update ON events")
+    op.execute("DROP FUNCTION IF EXISTS events_rollup_1m_adjust()")
+    op.execute("""
+        CREATE OR REPLACE FUNCTION events_rollup_1m_upsert() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO events_rollup_1m (tenant_id, event_type, bucket, count)
+            SELECT tenant_id, event_type, date_trunc('minute', event_timestamp), count(*)
+            FROM new_events
+            GROUP BY 1, 2, 3
+            ON CONFLICT (tenant_id, event_type, bucket)
+            DO UPDATE SET count = events_rollup_1m.count + EXCLUDED.count;
+            RETURN NULL;
+        END
+        $$
+    """)
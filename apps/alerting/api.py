@@ -1,87 +1,124 @@
 """Alert management API endpoints for PulseStream."""
 
+import asyncio
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from operator import attrgetter
+from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Query, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from core.auth import get_current_tenant
-from core.database import get_async_session
+from core.database import AsyncSessionLocal, get_async_session
 from core.logging import get_logger
-from apps.alerting.services import AlertManagementService, AlertRuleEngine
-from apps.alerting.notifications import NotificationService
+from apps.alerting.cache import evaluation_jobs, response_cache
+from apps.alerting.schemas import AlertResolveRequest, AlertRuleCreate, AlertRuleUpdate
+from apps.alerting.services import (
+    AlertManagementService, AlertRuleEngine, get_alert_service, get_rule_engine
+)
 from apps.storage.models.alert import AlertRule, Alert
 from apps.storage.models.tenant import Tenant
 
 logger = get_logger(__name__)
 
 # Create router
-router = APIRouter(prefix="/alerting", tags=["Alert Management"])
+router = APIRouter(prefix="/alerting", tags=["Alert Management"], default_response_class=ORJSONResponse)
 
-# Global service instances
-notification_service = NotificationService()
-rule_engine = AlertRuleEngine(notification_service)
-alert_service = AlertManagementService(rule_engine)
+# Response layouts. Summaries are selected as plain column projections;
+# details are one C-level multi-attribute fetch per ORM row, zipped with the
+# keys. UUIDs and datetimes are left for orjson to serialize
+RULE_SUMMARY_KEYS = (
+    "id", "name", "description", "event_type", "severity", "is_active",
+    "time_window", "evaluation_interval", "cooldown_minutes",
+    "max_alerts_per_hour", "last_evaluated_at", "last_triggered_at",
+    "total_triggers", "created_at",
+)
+
+RULE_DETAIL_KEYS = (
+    "id", "name", "description", "event_type", "condition", "threshold_value",
+    "threshold_operator", "severity", "is_active", "time_window",
+    "evaluation_interval", "cooldown_minutes", "max_alerts_per_hour",
+    "notification_channels", "notification_template", "last_evaluated_at",
+    "last_triggered_at", "total_triggers", "created_at", "updated_at",
+)
+RULE_DETAIL_FIELDS = attrgetter(*RULE_DETAIL_KEYS)
+
+ALERT_SUMMARY_KEYS = (
+    "id", "title", "message", "severity", "status", "triggered_at",
+    "resolved_at", "duration_minutes", "alert_rule_id", "notifications_sent",
+    "notification_failures",
+)
+
+ALERT_DETAIL_KEYS = (
+    "id", "title", "message", "severity", "status", "triggered_at",
+    "resolved_at", "duration_minutes", "trigger_data", "alert_metadata",
+    "alert_rule_id", "notifications_sent", "notification_failures",
+    "resolved_by", "resolution_note", "created_at", "updated_at",
+)
+ALERT_DETAIL_FIELDS = attrgetter(*ALERT_DETAIL_KEYS)
+
+
+def _entity_etag(entity_id: UUID, updated_at: datetime) -> str:
+    """Build a weak ETag from a record's id and last update time."""
+    return f'W/"{entity_id}:{int(updated_at.timestamp() * 1_000_000)}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the client's If-None-Match already covers this ETag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip() for tag in if_none_match.split(","))
 
 
 @router.post("/rules", response_model=Dict[str, Any])
 async def create_alert_rule(
-    rule_data: Dict[str, Any],
+    rule_data: AlertRuleCreate,
     current_tenant: Tenant = Depends(get_current_tenant),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_async_session),
+    alert_service: AlertManagementService = Depends(get_alert_service)
 ):
     """Create a new alert rule."""
-    try:
-        # Validate required fields
-        required_fields = ["name", "condition", "severity"]
-        for field in required_fields:
-            if field not in rule_data:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Missing required field: {field}"
-                )
-        
-        # Create rule
-        rule = await alert_service.create_alert_rule(
-            session, rule_data, current_tenant.id
-        )
-        
-        if not rule:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to create alert rule"
-            )
-        
-        logger.info(f"Alert rule created: {rule.name} for tenant {current_tenant.id}")
-        
-        return {
-            "success": True,
-            "rule_id": str(rule.id),
-            "message": "Alert rule created successfully",
-            "rule": {
-                "id": str(rule.id),
-                "name": rule.name,
-                "description": rule.description,
-                "severity": rule.severity,
-                "is_active": rule.is_active
-            }
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error creating alert rule: {e}")
+    # Create rule
+    rule = await alert_service.create_alert_rule(
+        session, rule_data.model_dump(), current_tenant.id
+    )
+    
+    if not rule:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create alert rule"
         )
+    
+    logger.info("Alert rule created: %s for tenant %s", rule.name, current_tenant.id)
+    
+    # Commit before invalidating, so a GET in between cannot cache the old rows
+    # under the new generation
+    await session.commit()
+    await response_cache.invalidate(current_tenant.id, "rules", "stats")
+    
+    return {
+        "success": True,
+        "rule_id": str(rule.id),
+        "message": "Alert rule created successfully",
+        "rule": {
+            "id": str(rule.id),
+            "name": rule.name,
+            "description": rule.description,
+            "severity": rule.severity,
+            "is_active": rule.is_active
+        }
+    }
 
 
 @router.get("/rules", response_model=Dict[str, Any])
 async def list_alert_rules(
+    request: Request,
     current_tenant: Tenant = Depends(get_current_tenant),
     session: AsyncSession = Depends(get_async_session),
     active_only: bool = Query(True, description="Show only active rules"),
@@ -89,177 +126,164 @@ async def list_alert_rules(
     offset: int = Query(0, ge=0, description="Number of rules to skip")
 ):
     """List alert rules for the current tenant."""
+    cache_key = await response_cache.build_key("rules", current_tenant.id, request)
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
         from apps.storage.crud import alert_rule_crud
         
-        # Get rules
-        if active_only:
-            rules = await alert_rule_crud.get_active_rules(session, current_tenant.id)
-        else:
-            rules = await alert_rule_crud.get_by_tenant(session, current_tenant.id, limit, offset)
+        # Plain column rows, no ORM objects
+        rules = await alert_rule_crud.list_rule_projections(
+            session,
+            tenant_id=current_tenant.id,
+            columns=RULE_SUMMARY_KEYS,
+            active_only=active_only,
+            skip=offset,
+            limit=limit
+        )
         
         # Convert to response format
-        rule_list = []
-        for rule in rules:
-            rule_list.append({
-                "id": str(rule.id),
-                "name": rule.name,
-                "description": rule.description,
-                "event_type": rule.event_type,
-                "severity": rule.severity,
-                "is_active": rule.is_active,
-                "time_window": rule.time_window,
-                "evaluation_interval": rule.evaluation_interval,
-                "cooldown_minutes": rule.cooldown_minutes,
-                "max_alerts_per_hour": rule.max_alerts_per_hour,
-                "last_evaluated_at": rule.last_evaluated_at.isoformat() if rule.last_evaluated_at else None,
-                "last_triggered_at": rule.last_triggered_at.isoformat() if rule.last_triggered_at else None,
-                "total_triggers": rule.total_triggers,
-                "created_at": rule.created_at.isoformat() if rule.created_at else None
-            })
+        rule_list = [dict(rule) for rule in rules]
         
-        return {
+        response = ORJSONResponse({
             "success": True,
             "rules": rule_list,
             "total_count": len(rule_list),
-            "tenant_id": str(current_tenant.id)
-        }
-        
-    except Exception as e:
-        logger.error(f"Error listing alert rules: {e}")
+            "tenant_id": current_tenant.id
+        })
+        
+    except (SQLAlchemyError, asyncio.TimeoutError) as e:
+        logger.error("Error listing alert rules: %s", e)
+        stale = await response_cache.get_stale(cache_key)
+        if stale is not None:
+            return stale
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve alert rules"
         )
+    
+    await response_cache.set(cache_key, "rules", response.body)
+    return response
 
 
 @router.get("/rules/{rule_id}", response_model=Dict[str, Any])
 async def get_alert_rule(
     rule_id: UUID,
+    request: Request,
     current_tenant: Tenant = Depends(get_current_tenant),
     session: AsyncSession = Depends(get_async_session)
 ):
     """Get a specific alert rule."""
-    try:
-        from apps.storage.crud import alert_rule_crud
-        
-        rule = await alert_rule_crud.get_by_id(session, rule_id)
-        if not rule or rule.tenant_id != current_tenant.id:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Alert rule not found"
-            )
-        
-        return {
-            "success": True,
-            "rule": {
-                "id": str(rule.id),
-                "name": rule.name,
-                "description": rule.description,
-                "event_type": rule.event_type,
-                "condition": rule.condition,
-                "threshold_value": rule.threshold_value,
-                "threshold_operator": rule.threshold_operator,
-                "severity": rule.severity,
-                "is_active": rule.is_active,
-                "time_window": rule.time_window,
-                "evaluation_interval": rule.evaluation_interval,
-                "cooldown_minutes": rule.cooldown_minutes,
-                "max_alerts_per_hour": rule.max_alerts_per_hour,
-                "notification_channels": rule.notification_channels,
-                "notification_template": rule.notification_template,
-                "last_evaluated_at": rule.last_evaluated_at.isoformat() if rule.last_evaluated_at else None,
-                "last_triggered_at": rule.last_triggered_at.isoformat() if rule.last_triggered_at else None,
-                "total_triggers": rule.total_triggers,
-                "created_at": rule.created_at.isoformat() if rule.created_at else None,
-                "updated_at": rule.updated_at.isoformat() if rule.updated_at else None
-            }
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting alert rule {rule_id}: {e}")
+    from apps.storage.crud import alert_rule_crud
+    
+    # Revalidate against the version timestamp before loading the row
+    updated_at = await alert_rule_crud.get_updated_at_by_tenant(
+        session, tenant_id=current_tenant.id, id=rule_id
+    )
+    if updated_at is None:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve alert rule"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Alert rule not found"
+        )
+    
+    etag = _entity_etag(rule_id, updated_at)
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    cache_key = response_cache.build_detail_key("rule", current_tenant.id, etag)
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        cached.headers["ETag"] = etag
+        return cached
+    
+    rule = await alert_rule_crud.get_by_tenant(
+        session, tenant_id=current_tenant.id, id=rule_id
+    )
+    if not rule:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Alert rule not found"
         )
+    
+    etag = _entity_etag(rule.id, rule.updated_at)
+    response = ORJSONResponse(
+        {
+            "success": True,
+            "rule": dict(zip(RULE_DETAIL_KEYS, RULE_DETAIL_FIELDS(rule)))
+        },
+        headers={"ETag": etag}
+    )
+    await response_cache.set(
+        response_cache.build_detail_key("rule", current_tenant.id, etag), "detail", response.body
+    )
+    return response
 
 
 @router.put("/rules/{rule_id}", response_model=Dict[str, Any])
 async def update_alert_rule(
     rule_id: UUID,
-    rule_data: Dict[str, Any],
+    rule_data: AlertRuleUpdate,
     current_tenant: Tenant = Depends(get_current_tenant),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_async_session),
+    alert_service: AlertManagementService = Depends(get_alert_service)
 ):
     """Update an alert rule."""
-    try:
-        rule = await alert_service.update_alert_rule(
-            session, rule_id, rule_data, current_tenant.id
-        )
-        
-        if not rule:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Alert rule not found"
-            )
-        
-        logger.info(f"Alert rule updated: {rule.name}")
-        
-        return {
-            "success": True,
-            "message": "Alert rule updated successfully",
-            "rule_id": str(rule.id)
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error updating alert rule {rule_id}: {e}")
+    rule = await alert_service.update_alert_rule(
+        session, rule_id, rule_data.model_dump(exclude_unset=True), current_tenant.id
+    )
+    
+    if not rule:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to update alert rule"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Alert rule not found"
         )
+    
+    logger.info("Alert rule updated: %s", rule.name)
+    
+    await session.commit()
+    await response_cache.invalidate(current_tenant.id, "rules", "stats")
+    
+    return {
+        "success": True,
+        "message": "Alert rule updated successfully",
+        "rule_id": str(rule.id)
+    }
 
 
 @router.delete("/rules/{rule_id}", response_model=Dict[str, Any])
 async def delete_alert_rule(
     rule_id: UUID,
     current_tenant: Tenant = Depends(get_current_tenant),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_async_session),
+    alert_service: AlertManagementService = Depends(get_alert_service)
 ):
     """Delete an alert rule."""
-    try:
-        success = await alert_service.delete_alert_rule(
-            session, rule_id, current_tenant.id
-        )
-        
-        if not success:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Alert rule not found"
-            )
-        
-        logger.info(f"Alert rule deleted: {rule_id}")
-        
-        return {
-            "success": True,
-            "message": "Alert rule deleted successfully"
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error deleting alert rule {rule_id}: {e}")
+    success = await alert_service.delete_alert_rule(
+        session, rule_id, current_tenant.id
+    )
+    
+    if not success:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to delete alert rule"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Alert rule not found"
         )
+    
+    logger.info("Alert rule deleted: %s", rule_id)
+    
+    await session.commit()
+    await response_cache.invalidate(current_tenant.id, "rules", "stats")
+    
+    return {
+        "success": True,
+        "message": "Alert rule deleted successfully"
+    }
 
 
 @router.get("/alerts", response_model=Dict[str, Any])
 async def list_alerts(
+    request: Request,
     current_tenant: Tenant = Depends(get_current_tenant),
     session: AsyncSession = Depends(get_async_session),
     status_filter: Optional[str] = Query(None, description="Filter by alert status"),
@@ -268,245 +292,275 @@ async def list_alerts(
     offset: int = Query(0, ge=0, description="Number of alerts to skip")
 ):
     """List alerts for the current tenant."""
+    cache_key = await response_cache.build_key("alerts", current_tenant.id, request)
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
-        from apps.storage.crud import alert_crud
+        from apps.storage.crud import alert_crud, alert_rule_crud
+        
+        # Filters compose in one query; with neither given, list active alerts
+        if not status_filter and not severity_filter:
+            status_filter = "active"
+        
+        alerts = await alert_crud.list_alert_projections(
+            session,
+            tenant_id=current_tenant.id,
+            columns=ALERT_SUMMARY_KEYS,
+            status=status_filter,
+            severity=severity_filter,
+            skip=offset,
+            limit=limit
+        )
         
-        # Get alerts based on filters
-        if status_filter:
-            alerts = await alert_crud.get_by_status(session, current_tenant.id, status_filter, limit, offset)
-        elif severity_filter:
-            alerts = await alert_crud.get_by_severity(session, current_tenant.id, severity_filter, limit, offset)
-        else:
-            alerts = await alert_service.get_active_alerts(session, current_tenant.id, limit)
+        # Rule names for the whole page in one lookup
+        rule_names = await alert_rule_crud.get_names_by_ids(
+            session, ids={alert["alert_rule_id"] for alert in alerts}
+        )
         
         # Convert to response format
-        alert_list = []
-        for alert in alerts:
-            alert_list.append({
-                "id": str(alert.id),
-                "title": alert.title,
-                "message": alert.message,
-                "severity": alert.severity,
-                "status": alert.status,
-                "triggered_at": alert.triggered_at.isoformat() if alert.triggered_at else None,
-                "resolved_at": alert.resolved_at.isoformat() if alert.resolved_at else None,
-                "duration_minutes": alert.duration_minutes,
-                "alert_rule_id": str(alert.alert_rule_id),
-                "rule_name": alert.alert_metadata.get("rule_name") if alert.alert_metadata else None,
-                "notifications_sent": alert.notifications_sent,
-                "notification_failures": alert.notification_failures
-            })
+        alert_list = [
+            {**alert, "rule_name": rule_names.get(alert["alert_rule_id"])}
+            for alert in alerts
+        ]
         
-        return {
+        response = ORJSONResponse({
             "success": True,
             "alerts": alert_list,
             "total_count": len(alert_list),
-            "tenant_id": str(current_tenant.id)
-        }
-        
-    except Exception as e:
-        logger.error(f"Error listing alerts: {e}")
+            "tenant_id": current_tenant.id
+        })
+        
+    except (SQLAlchemyError, asyncio.TimeoutError) as e:
+        logger.error("Error listing alerts: %s", e)
+        stale = await response_cache.get_stale(cache_key)
+        if stale is not None:
+            return stale
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve alerts"
         )
+    
+    await response_cache.set(cache_key, "alerts", response.body)
+    return response
 
 
 @router.get("/alerts/{alert_id}", response_model=Dict[str, Any])
 async def get_alert(
     alert_id: UUID,
+    request: Request,
     current_tenant: Tenant = Depends(get_current_tenant),
     session: AsyncSession = Depends(get_async_session)
 ):
     """Get a specific alert."""
-    try:
-        from apps.storage.crud import alert_crud
-        
-        alert = await alert_crud.get_by_id(session, alert_id)
-        if not alert or alert.tenant_id != current_tenant.id:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Alert not found"
-            )
-        
-        return {
-            "success": True,
-            "alert": {
-                "id": str(alert.id),
-                "title": alert.title,
-                "message": alert.message,
-                "severity": alert.severity,
-                "status": alert.status,
-                "triggered_at": alert.triggered_at.isoformat() if alert.triggered_at else None,
-                "resolved_at": alert.resolved_at.isoformat() if alert.resolved_at else None,
-                "duration_minutes": alert.duration_minutes,
-                "trigger_data": alert.trigger_data,
-                "alert_metadata": alert.alert_metadata,
-                "alert_rule_id": str(alert.alert_rule_id),
-                "notifications_sent": alert.notifications_sent,
-                "notification_failures": alert.notification_failures,
-                "resolved_by": alert.resolved_by,
-                "resolution_note": alert.resolution_note,
-                "created_at": alert.created_at.isoformat() if alert.created_at else None,
-                "updated_at": alert.updated_at.isoformat() if alert.updated_at else None
-            }
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting alert {alert_id}: {e}")
+    from apps.storage.crud import alert_crud
+    
+    # Revalidate against the version timestamp before loading the row
+    updated_at = await alert_crud.get_updated_at_by_tenant(
+        session, tenant_id=current_tenant.id, id=alert_id
+    )
+    if updated_at is None:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve alert"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Alert not found"
+        )
+    
+    etag = _entity_etag(alert_id, updated_at)
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    cache_key = response_cache.build_detail_key("alert", current_tenant.id, etag)
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        cached.headers["ETag"] = etag
+        return cached
+    
+    alert = await alert_crud.get_by_tenant(
+        session, tenant_id=current_tenant.id, id=alert_id
+    )
+    if not alert:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Alert not found"
         )
+    
+    etag = _entity_etag(alert.id, alert.updated_at)
+    response = ORJSONResponse(
+        {
+            "success": True,
+            "alert": dict(zip(ALERT_DETAIL_KEYS, ALERT_DETAIL_FIELDS(alert)))
+        },
+        headers={"ETag": etag}
+    )
+    await response_cache.set(
+        response_cache.build_detail_key("alert", current_tenant.id, etag), "detail", response.body
+    )
+    return response
 
 
 @router.post("/alerts/{alert_id}/resolve", response_model=Dict[str, Any])
 async def resolve_alert(
     alert_id: UUID,
-    resolution_data: Dict[str, Any],
+    resolution_data: AlertResolveRequest,
     current_tenant: Tenant = Depends(get_current_tenant),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_async_session),
+    alert_service: AlertManagementService = Depends(get_alert_service)
 ):
     """Resolve an alert."""
-    try:
-        resolved_by = resolution_data.get("resolved_by", "system")
-        note = resolution_data.get("note")
-        
-        alert = await alert_service.resolve_alert(
-            session, alert_id, current_tenant.id, resolved_by, note
-        )
-        
-        if not alert:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Alert not found"
-            )
-        
-        logger.info(f"Alert {alert_id} resolved by {resolved_by}")
-        
-        return {
-            "success": True,
-            "message": "Alert resolved successfully",
-            "alert_id": str(alert_id),
-            "resolved_by": resolved_by,
-            "resolved_at": alert.resolved_at.isoformat() if alert.resolved_at else None
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error resolving alert {alert_id}: {e}")
+    resolved_by = resolution_data.resolved_by
+    note = resolution_data.note
+    
+    alert = await alert_service.resolve_alert(
+        session, alert_id, current_tenant.id, resolved_by, note
+    )
+    
+    if not alert:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to resolve alert"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Alert not found"
         )
+    
+    logger.info("Alert %s resolved by %s", alert_id, resolved_by)
+    
+    await session.commit()
+    await response_cache.invalidate(current_tenant.id, "alerts", "stats")
+    
+    return {
+        "success": True,
+        "message": "Alert resolved successfully",
+        "alert_id": str(alert_id),
+        "resolved_by": resolved_by,
+        "resolved_at": alert.resolved_at.isoformat() if alert.resolved_at else None
+    }
 
 
 @router.post("/rules/{rule_id}/test", response_model=Dict[str, Any])
 async def test_alert_rule(
     rule_id: UUID,
     current_tenant: Tenant = Depends(get_current_tenant),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_async_session),
+    rule_engine: AlertRuleEngine = Depends(get_rule_engine)
 ):
     """Test an alert rule by evaluating it immediately."""
-    try:
-        from apps.storage.crud import alert_rule_crud
-        
-        # Get the rule
-        rule = await alert_rule_crud.get_by_id(session, rule_id)
-        if not rule or rule.tenant_id != current_tenant.id:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Alert rule not found"
-            )
-        
-        # Test the rule
-        alert = await rule_engine.evaluate_rule(session, rule, current_tenant.id)
-        
-        if alert:
-            return {
-                "success": True,
-                "message": "Alert rule triggered an alert",
-                "alert_id": str(alert.id),
-                "alert_title": alert.title,
-                "triggered_at": alert.triggered_at.isoformat()
-            }
-        else:
-            return {
-                "success": True,
-                "message": "Alert rule did not trigger (condition not met)",
-                "alert_id": None,
-                "triggered_at": None
-            }
-        
-    except Exception as e:
-        logger.error(f"Error testing alert rule {rule_id}: {e}")
+    from apps.storage.crud import alert_rule_crud
+    
+    # Get the rule
+    rule = await alert_rule_crud.get_by_tenant(
+        session, tenant_id=current_tenant.id, id=rule_id
+    )
+    if not rule:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to test alert rule"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Alert rule not found"
         )
+    
+    # Test the rule
+    alert = await rule_engine.evaluate_rule(session, rule, current_tenant.id)
+    
+    # Notify and invalidate only once the alert and the rule's evaluation
+    # stamps are committed
+    await session.commit()
+    
+    if alert:
+        await rule_engine.publish_committed_alerts(session)
+        await response_cache.invalidate(current_tenant.id, "alerts", "rules", "stats")
+        return {
+            "success": True,
+            "message": "Alert rule triggered an alert",
+            "alert_id": str(alert.id),
+            "alert_title": alert.title,
+            "triggered_at": alert.triggered_at.isoformat()
+        }
+    else:
+        await response_cache.invalidate(current_tenant.id, "rules")
+        return {
+            "success": True,
+            "message": "Alert rule did not trigger (condition not met)",
+            "alert_id": None,
+            "triggered_at": None
+        }
 
 
-@router.post("/evaluate", response_model=Dict[str, Any])
+@router.post("/evaluate", response_model=Dict[str, Any], status_code=status.HTTP_202_ACCEPTED)
 async def evaluate_all_rules(
+    background_tasks: BackgroundTasks,
     current_tenant: Tenant = Depends(get_current_tenant),
-    session: AsyncSession = Depends(get_async_session)
+    alert_service: AlertManagementService = Depends(get_alert_service)
 ):
-    """Manually evaluate all active alert rules for the tenant."""
-    try:
-        # Evaluate all rules
-        triggered_alerts = await alert_service.evaluate_all_rules(
-            session, current_tenant.id
-        )
-        
-        logger.info(f"Evaluated all rules for tenant {current_tenant.id}: {len(triggered_alerts)} alerts triggered")
-        
-        return {
-            "success": True,
-            "message": f"Evaluated all alert rules",
-            "total_rules_evaluated": len(triggered_alerts),
-            "alerts_triggered": len(triggered_alerts),
-            "alerts": [
-                {
-                    "id": str(alert.id),
-                    "title": alert.title,
-                    "severity": alert.severity,
-                    "triggered_at": alert.triggered_at.isoformat()
-                }
-                for alert in triggered_alerts
-            ]
-        }
-        
-    except Exception as e:
-        logger.error(f"Error evaluating all rules: {e}")
+    """Queue evaluation of all active alert rules for the tenant.
+    
+    Evaluation runs after the response is sent, on its own session; poll
+    GET /alerting/evaluate/{job_id} for the result.
+    """
+    job_id = uuid4().hex
+    
+    await evaluation_jobs.save(current_tenant.id, job_id, {
+        "job_id": job_id,
+        "status": "pending"
+    })
+    background_tasks.add_task(
+        alert_service.run_evaluation_job, AsyncSessionLocal, current_tenant.id, job_id
+    )
+    
+    logger.info("Queued rule evaluation job %s for tenant %s", job_id, current_tenant.id)
+    
+    return {
+        "success": True,
+        "status": "accepted",
+        "job_id": job_id,
+        "message": "Alert rule evaluation queued"
+    }
+
+
+@router.get("/evaluate/{job_id}", response_model=Dict[str, Any])
+async def get_evaluation_job(
+    job_id: str,
+    current_tenant: Tenant = Depends(get_current_tenant)
+):
+    """Get the status and result of a queued rule evaluation."""
+    result = await evaluation_jobs.get(current_tenant.id, job_id)
+    if result is None:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to evaluate alert rules"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Evaluation job not found or expired"
         )
+    return result
 
 
 @router.get("/stats", response_model=Dict[str, Any])
 async def get_alert_stats(
+    request: Request,
     current_tenant: Tenant = Depends(get_current_tenant),
     session: AsyncSession = Depends(get_async_session)
 ):
     """Get alert statistics for the current tenant."""
+    cache_key = await response_cache.build_key("stats", current_tenant.id, request)
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
         from apps.storage.crud import alert_crud, alert_rule_crud
         
-        # Get counts
-        total_alerts = await alert_crud.count_by_tenant(session, current_tenant.id)
-        active_alerts = await alert_crud.count_by_status(session, current_tenant.id, "active")
-        resolved_alerts = await alert_crud.count_by_status(session, current_tenant.id, "resolved")
-        total_rules = await alert_rule_crud.count_by_tenant(session, current_tenant.id)
-        active_rules = await alert_rule_crud.count_active_by_tenant(session, current_tenant.id)
+        tenant_id = current_tenant.id
         
-        # Get recent activity
-        recent_alerts = await alert_crud.get_recent_alerts(session, current_tenant.id, limit=5)
+        # One FILTER-aggregate per table plus recent activity, all on the
+        # request's connection rather than one pooled connection each
+        alert_counters = await alert_crud.get_tenant_counters(session, tenant_id=tenant_id)
+        rule_counters = await alert_rule_crud.get_tenant_counters(session, tenant_id=tenant_id)
+        recent_alerts = await alert_crud.get_recent_alert_rows(session, tenant_id=tenant_id, limit=5)
         
-        return {
+        total_alerts = alert_counters["total"]
+        active_alerts = alert_counters["active"]
+        resolved_alerts = alert_counters["resolved"]
+        total_rules = rule_counters["total"]
+        active_rules = rule_counters["active"]
+        
+        # Whole percent, integer arithmetic; new tenants have no alerts at all
+        resolution_rate = 100 * resolved_alerts // total_alerts if total_alerts else 0
+        
+        response = ORJSONResponse({
             "success": True,
             "stats": {
                 "total_alerts": total_alerts,
@@ -514,24 +568,21 @@ async def get_alert_stats(
                 "resolved_alerts": resolved_alerts,
                 "total_rules": total_rules,
                 "active_rules": active_rules,
-                "alert_resolution_rate": (resolved_alerts / total_alerts * 100) if total_alerts > 0 else 0
+                "alert_resolution_rate": resolution_rate
             },
-            "recent_alerts": [
-                {
-                    "id": str(alert.id),
-                    "title": alert.title,
-                    "severity": alert.severity,
-                    "status": alert.status,
-                    "triggered_at": alert.triggered_at.isoformat() if alert.triggered_at else None
-                }
-                for alert in recent_alerts
-            ],
-            "tenant_id": str(current_tenant.id)
-        }
-        
-    except Exception as e:
-        logger.error(f"Error getting alert stats: {e}")
+            "recent_alerts": [dict(alert) for alert in recent_alerts],
+            "tenant_id": current_tenant.id
+        })
+        
+    except (SQLAlchemyError, asyncio.TimeoutError) as e:
+        logger.error("Error getting alert stats: %s", e)
+        stale = await response_cache.get_stale(cache_key)
+        if stale is not None:
+            return stale
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve alert statistics"
         )
+    
+    await response_cache.set(cache_key, "stats", response.body)
+    return response
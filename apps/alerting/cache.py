@@ -0,0 +1,299 @@
+"""Short-lived Redis storage for alerting endpoints."""
+
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+
+from core.logging import get_logger
+from core.redis import get_async_redis_client
+
+logger = get_logger(__name__)
+
+# TTL policies (seconds) for dashboard-polled endpoints
+CACHE_TTLS = {
+    "stats": 10,
+    "rules": 30,
+    "alerts": 5,
+    # Detail keys embed the row's ETag, so writes never need to invalidate them
+    "detail": 300,
+}
+
+# Last good response is kept this much longer for the stale fallback
+STALE_TTL_MULTIPLIER = 12
+
+# Cache generations outlive every entry keyed by them; an expired
+# generation restarts at 0 once no entry from that count can be left
+GENERATION_TTL = 86400
+
+# Background evaluation results stay pollable for this long (seconds)
+EVALUATION_JOB_TTL = 300
+
+# Recent-alert windows for rule rate limiting: alerts count for this long,
+# and a rule's window is re-read from the database at least this often
+RECENT_ALERTS_WINDOW = 3600
+RECENT_ALERTS_SEED_TTL = 60
+
+# After a Redis error, the alerting cache skips Redis for this long (seconds),
+# so an outage costs one timeout rather than one per call
+REDIS_RETRY_AFTER = 5
+
+CACHE_PREFIX = "pulse:alerting"
+
+# monotonic() time until which Redis is treated as down
+_redis_down_until = 0.0
+
+
+def _redis():
+    """Return the async Redis client, or None while Redis is marked down."""
+    if time.monotonic() < _redis_down_until:
+        return None
+    return get_async_redis_client()
+
+
+def _redis_failed(action: str, error: Exception) -> None:
+    """Log a Redis error and skip Redis for REDIS_RETRY_AFTER seconds."""
+    global _redis_down_until
+    _redis_down_until = time.monotonic() + REDIS_RETRY_AFTER
+    logger.warning("Alerting cache %s failed: %s", action, error)
+
+
+class AlertingResponseCache:
+    """Per-tenant response cache with a stale copy for DB failures.
+
+    Fresh keys embed a per-tenant, per-policy generation number, so a write
+    invalidates with one INCR and old entries simply age out. Redis errors
+    never fail a request: a broken cache behaves like a miss.
+    """
+
+    @staticmethod
+    def _generation_key(policy: str, tenant_id: UUID) -> str:
+        return f"{CACHE_PREFIX}:generation:{policy}:{tenant_id}"
+
+    async def build_key(self, policy: str, tenant_id: UUID, request: Request) -> str:
+        """Build the cache key from the policy, tenant, its generation and sorted query params."""
+        query = "&".join(
+            f"{name}={value}" for name, value in sorted(request.query_params.multi_items())
+        )
+        generation = 0
+        client = _redis()
+        if client is not None:
+            try:
+                generation = int(await client.get(self._generation_key(policy, tenant_id)) or 0)
+            except Exception as e:
+                _redis_failed("generation read", e)
+        return f"{CACHE_PREFIX}:{policy}:{tenant_id}:{generation}:{query}"
+
+    @staticmethod
+    def build_detail_key(kind: str, tenant_id: UUID, etag: str) -> str:
+        """Build the cache key for one rendered record version."""
+        return f"{CACHE_PREFIX}:detail:{tenant_id}:{kind}:{etag}"
+
+    @staticmethod
+    def _stale_key(key: str) -> str:
+        # Stale copies survive invalidation, so their key drops the generation
+        name = key[len(CACHE_PREFIX) + 1:]
+        if not name.startswith("detail:"):
+            policy, tenant_id, _generation, query = name.split(":", 3)
+            name = f"{policy}:{tenant_id}:{query}"
+        return f"{CACHE_PREFIX}:stale:{name}"
+
+    async def get(self, key: str) -> Optional[Response]:
+        """Return the cached response for a key, if fresh."""
+        client = _redis()
+        if client is None:
+            return None
+
+        try:
+            cached = await client.get(key)
+        except Exception as e:
+            _redis_failed("read", e)
+            return None
+
+        if cached is None:
+            return None
+        return Response(content=cached, media_type="application/json", headers={"X-Cache": "hit"})
+
+    async def get_stale(self, key: str) -> Optional[Response]:
+        """Return the last known good response for a key, if any."""
+        client = _redis()
+        if client is None:
+            return None
+
+        try:
+            cached = await client.get(self._stale_key(key))
+        except Exception as e:
+            _redis_failed("stale read", e)
+            return None
+
+        if cached is None:
+            return None
+        return Response(content=cached, media_type="application/json", headers={"X-Cache": "stale"})
+
+    async def set(self, key: str, policy: str, payload: bytes) -> None:
+        """Store a rendered response body under the policy's TTL."""
+        client = _redis()
+        if client is None:
+            return
+
+        ttl = CACHE_TTLS[policy]
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.setex(key, ttl, payload)
+            pipe.setex(self._stale_key(key), ttl * STALE_TTL_MULTIPLIER, payload)
+            await pipe.execute()
+        except Exception as e:
+            _redis_failed("write", e)
+
+    async def invalidate(self, tenant_id: UUID, *policies: str) -> None:
+        """Retire a tenant's fresh entries after a write by bumping their generations.
+
+        Stale copies stay; retired entries expire under their policy's TTL.
+        """
+        client = _redis()
+        if client is None:
+            return
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for policy in policies:
+                generation_key = self._generation_key(policy, tenant_id)
+                pipe.incr(generation_key)
+                pipe.expire(generation_key, GENERATION_TTL)
+            await pipe.execute()
+        except Exception as e:
+            _redis_failed("invalidation", e)
+
+
+class EvaluationJobStore:
+    """Status and results of background rule evaluations, per tenant."""
+
+    @staticmethod
+    def _key(tenant_id: UUID, job_id: str) -> str:
+        return f"{CACHE_PREFIX}:evaluate:{tenant_id}:{job_id}"
+
+    async def save(self, tenant_id: UUID, job_id: str, result: Dict[str, Any]) -> None:
+        """Store a job's status/result for EVALUATION_JOB_TTL seconds."""
+        client = _redis()
+        if client is None:
+            logger.error("Failed to store evaluation job %s: Redis unavailable", job_id)
+            return
+
+        try:
+            await client.setex(
+                self._key(tenant_id, job_id), EVALUATION_JOB_TTL, orjson.dumps(result)
+            )
+        except Exception as e:
+            _redis_failed(f"evaluation job {job_id} write", e)
+
+    async def get(self, tenant_id: UUID, job_id: str) -> Optional[Response]:
+        """Return a job's stored result as a JSON response, if known."""
+        client = _redis()
+        if client is None:
+            return None
+
+        try:
+            stored = await client.get(self._key(tenant_id, job_id))
+        except Exception as e:
+            _redis_failed(f"evaluation job {job_id} read", e)
+            return None
+
+        if stored is None:
+            return None
+        return Response(content=stored, media_type="application/json")
+
+
+def _epoch(moment: datetime) -> float:
+    """Seconds since the epoch; naive datetimes are taken as UTC."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+class RecentAlertCounter:
+    """Per-rule sliding windows of recent alerts, so rate limits skip a COUNT query.
+    
+    Each rule has a sorted set of its alert ids scored by trigger time, so
+    alerts leave the count exactly RECENT_ALERTS_WINDOW seconds after they
+    fired. A window is only trusted once seeded from the database (marked by
+    SEED_MEMBER); seeding adds alert ids, so it is idempotent with record().
+    Redis errors never fail an evaluation: missing counts are read from the
+    database instead.
+    """
+
+    # Marks a window as complete; scored below any trigger time, so it never
+    # leaves the window and is excluded from counts
+    SEED_MEMBER = "seeded"
+
+    @staticmethod
+    def _key(rule_id: UUID) -> str:
+        return f"{CACHE_PREFIX}:recent:{rule_id}"
+
+    async def get_many(self, rule_ids: List[UUID], now: datetime) -> Dict[UUID, int]:
+        """Return the alert counts of the last window for rules with a seeded window."""
+        client = _redis()
+        if client is None:
+            return {}
+
+        cutoff = _epoch(now) - RECENT_ALERTS_WINDOW
+        try:
+            pipe = client.pipeline(transaction=False)
+            for rule_id in rule_ids:
+                key = self._key(rule_id)
+                pipe.zremrangebyscore(key, 0, f"({cutoff}")
+                pipe.zscore(key, self.SEED_MEMBER)
+                pipe.zcount(key, 0, "+inf")
+            values = await pipe.execute()
+        except Exception as e:
+            _redis_failed("recent alert count read", e)
+            return {}
+
+        return {
+            rule_id: count
+            for rule_id, (_, seeded, count) in zip(rule_ids, zip(*[iter(values)] * 3))
+            if seeded is not None
+        }
+
+    async def seed(self, alerts: Dict[UUID, Iterable[Tuple[UUID, datetime]]]) -> None:
+        """Store each rule's (alert id, triggered at) pairs read from the database."""
+        client = _redis()
+        if client is None:
+            return
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for rule_id, rule_alerts in alerts.items():
+                key = self._key(rule_id)
+                members = {str(alert_id): _epoch(triggered_at) for alert_id, triggered_at in rule_alerts}
+                members[self.SEED_MEMBER] = -1
+                pipe.zadd(key, members)
+                pipe.expire(key, RECENT_ALERTS_SEED_TTL)
+            await pipe.execute()
+        except Exception as e:
+            _redis_failed("recent alert count seed", e)
+
+    async def record(self, rule_id: UUID, alert_id: UUID, triggered_at: datetime) -> None:
+        """Add a committed alert to its rule's window."""
+        client = _redis()
+        if client is None:
+            return
+
+        key = self._key(rule_id)
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.zadd(key, {str(alert_id): _epoch(triggered_at)})
+            pipe.expire(key, RECENT_ALERTS_SEED_TTL)
+            await pipe.execute()
+        except Exception as e:
+            _redis_failed(f"recent alert count for rule {rule_id}", e)
+
+
+# Global instances
+response_cache = AlertingResponseCache()
+evaluation_jobs = EvaluationJobStore()
+recent_alert_counts = RecentAlertCounter()
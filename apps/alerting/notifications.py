@@ -1,264 +1,614 @@
 """Notification service for PulseStream alerts."""
 
-import json
+import asyncio
 import logging
+import random
+import time
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from functools import lru_cache
+from string import Formatter
+from types import MappingProxyType
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Any, Set, Tuple
+from urllib.parse import urlparse
 from uuid import UUID
 
-import httpx
-from sqlalchemy.ext.asyncio import AsyncSession
+import aiohttp
+import orjson
+from sqlalchemy import update
 
 from core.logging import get_logger
 from core.config import settings
+from core.database import AsyncSessionLocal
 from core.constants import NotificationChannel
+from core.errors import AlertingError
 from apps.storage.models.alert import Alert, AlertRule
 
 logger = get_logger(__name__)
 
+# Responses worth retrying: timeouts, rate limiting and transient server errors
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+# Alerts bound for the same Slack endpoint (or a webhook that opted in with
+# "batch": true) within this window are coalesced into one POST of at most
+# NOTIFICATION_MAX_BATCH alerts
+NOTIFICATION_BATCH_WINDOW_SECONDS = 0.25
+NOTIFICATION_MAX_BATCH = 50
+
+# A host failing this many POSTs in a row is skipped for
+# BREAKER_OPEN_SECONDS before being tried again
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_OPEN_SECONDS = 60
+
+# Alerts whose notifications may be in flight at once
+MAX_CONCURRENT_NOTIFICATIONS = 50
+
+# Slack attachment color per severity (read-only)
+_SEVERITY_COLOR = MappingProxyType({
+    "low": "#36a64f",      # Green
+    "medium": "#ff8c00",   # Orange
+    "high": "#ff0000",     # Red
+    "critical": "#8b0000"  # Dark Red
+})
+_DEFAULT_SEVERITY_COLOR = _SEVERITY_COLOR["low"]
+
+SLACK_FOOTER = "PulseStream Alerting System"
+
+# Static text of the email body, interleaved with the values in
+# _generate_email_body
+_EMAIL_PARTS = (
+    "Alert Details:\n==============\n\nTitle: ",
+    "\nSeverity: ",
+    "\nStatus: ",
+    "\nTriggered: ",
+    "\n\nMessage:\n",
+    "\n\n",
+    "\n\nAlert Context:\n==============\nAlert ID: ",
+    "\nRule ID: ",
+    "\nTenant ID: ",
+    "\n\nThis is an automated alert from PulseStream.",
+)
+
+
+class AlertTimestamps(NamedTuple):
+    """An alert's rendered times, computed once per dispatch."""
+    triggered_str: str
+    triggered_ts: int
+    triggered_iso: str
+    now_iso: str
+    
+    @classmethod
+    def for_alert(cls, alert: Alert) -> "AlertTimestamps":
+        """Render the alert's trigger time and the dispatch time."""
+        triggered_at = alert.triggered_at
+        return cls(
+            triggered_at.strftime('%Y-%m-%d %H:%M:%S UTC'),
+            int(triggered_at.timestamp()),
+            triggered_at.isoformat(),
+            datetime.utcnow().isoformat()
+        )
+
+
+class RuleFragments(NamedTuple):
+    """Rule-dependent parts of each notification format (shared, do not mutate)."""
+    email_section: str
+    slack_skeleton: Dict[str, Any]
+    webhook_rule: Dict[str, Any]
+
+
+@lru_cache(maxsize=1024)
+def _rule_static_fragments(
+    rule_id: UUID,
+    rule_name: str,
+    rule_description: Optional[str],
+    rule_severity: str,
+    rule_time_window: str,
+    rule_evaluation_interval: int
+) -> RuleFragments:
+    """Build a rule's notification fragments once per rule version.
+    
+    Keyed by every rule attribute they render, so an edited rule simply
+    gets a new entry.
+    """
+    email_section = (
+        f"Rule Information:\n"
+        f"=================\n"
+        f"Rule Name: {rule_name}\n"
+        f"Description: {rule_description or 'No description'}\n"
+        f"Time Window: {rule_time_window}\n"
+        f"Evaluation Interval: {rule_evaluation_interval} seconds"
+    )
+    slack_skeleton = {
+        "footer": SLACK_FOOTER,
+        "fields": (
+            {"title": "Rule", "value": rule_name, "short": True},
+            {"title": "Time Window", "value": rule_time_window, "short": True},
+        ),
+    }
+    webhook_rule = {
+        "id": str(rule_id),
+        "name": rule_name,
+        "description": rule_description,
+        "severity": rule_severity,
+        "time_window": rule_time_window
+    }
+    return RuleFragments(email_section, slack_skeleton, webhook_rule)
+
+
+@lru_cache(maxsize=32)
+def _slack_severity_parts(severity: str) -> Tuple[str, Dict[str, Any]]:
+    """Get the attachment color and Severity field for a severity (shared)."""
+    severity_lower = severity.lower()
+    color = _SEVERITY_COLOR.get(severity_lower, _DEFAULT_SEVERITY_COLOR)
+    return color, {"title": "Severity", "value": severity_lower.upper(), "short": True}
+
+
+def _get_rule_fragments(rule: AlertRule) -> RuleFragments:
+    """Get the cached notification fragments for a rule."""
+    return _rule_static_fragments(
+        rule.id, rule.name, rule.description, rule.severity,
+        rule.time_window, rule.evaluation_interval
+    )
+
+
+# Process-wide HTTP session shared by every NotificationService, so all of
+# them draw on one TCP/TLS connection pool. Opened lazily, since an aiohttp
+# session belongs to the loop it is created in
+_SHARED_CLIENT: Optional[aiohttp.ClientSession] = None
+_SHARED_CLIENT_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_shared_client() -> aiohttp.ClientSession:
+    """Get the shared HTTP session for the running loop, opening it if needed.
+    
+    Creation does not await, so concurrent callers on one loop cannot race
+    here and no lock is needed.
+    """
+    global _SHARED_CLIENT, _SHARED_CLIENT_LOOP
+    loop = asyncio.get_running_loop()
+    if _SHARED_CLIENT is None or _SHARED_CLIENT.closed or _SHARED_CLIENT_LOOP is not loop:
+        _SHARED_CLIENT = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=30),
+            connector=aiohttp.TCPConnector(limit=100, limit_per_host=20, keepalive_timeout=75)
+        )
+        _SHARED_CLIENT_LOOP = loop
+    return _SHARED_CLIENT
+
+
+async def _close_shared_client() -> None:
+    """Close the shared HTTP session, if open."""
+    global _SHARED_CLIENT, _SHARED_CLIENT_LOOP
+    if _SHARED_CLIENT is not None and not _SHARED_CLIENT.closed:
+        await _SHARED_CLIENT.close()
+    _SHARED_CLIENT = None
+    _SHARED_CLIENT_LOOP = None
+
 
 class NotificationService:
     """Service for sending alert notifications via various channels."""
     
     def __init__(self):
-        self.http_client = httpx.AsyncClient(timeout=30.0)
+        # Loop-bound state, reset by _bind_loop(): one queue and dispatcher
+        # task per (channel, url, headers) endpoint, background dispatches
+        # and the concurrency limit
+        self._batch_queues: Dict[Tuple, asyncio.Queue] = {}
+        self._batch_tasks: Dict[Tuple, asyncio.Task] = {}
+        self._background_tasks: Set[asyncio.Task] = set()
+        self._send_sem: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Channel -> sender; NotificationChannel is a str enum, so plain
+        # channel strings from rule configs hash to the same keys
+        self._handlers: Dict[str, Callable[..., Awaitable[None]]] = {
+            NotificationChannel.EMAIL: self._send_email_notification,
+            NotificationChannel.SLACK: self._send_slack_notification,
+            NotificationChannel.WEBHOOK: self._send_webhook_notification,
+        }
+        # Host -> (consecutive failures, monotonic time the breaker stays open until)
+        self._breakers: Dict[str, Tuple[int, float]] = {}
+    
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the running loop, resetting loop-bound state if it changed."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._batch_queues = {}
+            self._batch_tasks = {}
+            self._background_tasks = set()
+            self._send_sem = asyncio.Semaphore(MAX_CONCURRENT_NOTIFICATIONS)
+            self._loop = loop
+        return loop
+    
+    async def _post_with_retry(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        headers: Dict[str, str],
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        jitter: float = 0.5
+    ) -> Tuple[int, str]:
+        """POST JSON, retrying transient failures with exponential backoff.
+        
+        The payload is serialized once with orjson, whatever the attempts.
+        
+        Connection errors, timeouts and RETRYABLE_STATUSES are retried up to
+        max_retries times in total; a 429's Retry-After (in seconds) takes
+        precedence over the computed delay. Other statuses return at once.
+        Returns the final (status, body text); the last connection error is
+        raised once attempts run out.
+        
+        Exhausted attempts and 5xx outcomes count against the host's circuit
+        breaker; while it is open, AlertingError is raised without a request.
+        """
+        host = urlparse(url).netloc
+        failures, open_until = self._breakers.get(host, (0, 0.0))
+        if time.monotonic() < open_until:
+            raise AlertingError(
+                f"Circuit open for {host}, skipping notification",
+                details={"host": host, "failures": failures}
+            )
+        
+        body = orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+        headers = {"Content-Type": "application/json", **headers}
+        
+        for attempt in range(max_retries):
+            retry_after = None
+            try:
+                async with _get_shared_client().post(url, data=body, headers=headers) as response:
+                    response_status = response.status
+                    response_text = await response.text()
+                    retry_after = response.headers.get("Retry-After")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == max_retries - 1:
+                    self._record_post_outcome(host, success=False)
+                    raise
+                logger.warning("POST to %s failed (%s), retrying", url, e)
+            else:
+                if response_status not in RETRYABLE_STATUSES or attempt == max_retries - 1:
+                    self._record_post_outcome(host, success=response_status < 500)
+                    return response_status, response_text
+                logger.warning("POST to %s returned %s, retrying", url, response_status)
+            
+            delay = min(max_delay, base_delay * (2 ** attempt)) * (1 + random.random() * jitter)
+            if retry_after is not None and retry_after.isdigit():
+                delay = min(max_delay, float(retry_after))
+            await asyncio.sleep(delay)
+    
+    def _record_post_outcome(self, host: str, success: bool) -> None:
+        """Reset the host's breaker on success, or count a failure and open it."""
+        if success:
+            self._breakers.pop(host, None)
+            return
+        
+        failures = self._breakers.get(host, (0, 0.0))[0] + 1
+        open_until = 0.0
+        if failures >= BREAKER_FAILURE_THRESHOLD:
+            open_until = time.monotonic() + BREAKER_OPEN_SECONDS
+            logger.warning(
+                "%s consecutive failed POSTs to %s, skipping it for %ss",
+                failures, host, BREAKER_OPEN_SECONDS
+            )
+        self._breakers[host] = (failures, open_until)
+    
+    async def _post_batched(
+        self,
+        channel: str,
+        url: str,
+        headers: Dict[str, str],
+        payload: Dict[str, Any]
+    ) -> Tuple[int, str]:
+        """Queue one alert's payload for its endpoint and wait for the batch POST.
+        
+        Returns the (status, body text) of the POST that carried it.
+        """
+        loop = self._bind_loop()
+        
+        key = (channel, url, tuple(sorted(headers.items())))
+        queue = self._batch_queues.get(key)
+        if queue is None:
+            queue = self._batch_queues[key] = asyncio.Queue()
+            self._batch_tasks[key] = loop.create_task(
+                self._batch_dispatcher(channel, url, headers, queue)
+            )
+        
+        future = loop.create_future()
+        await queue.put((payload, future))
+        return await future
+    
+    async def _batch_dispatcher(
+        self,
+        channel: str,
+        url: str,
+        headers: Dict[str, str],
+        queue: asyncio.Queue
+    ) -> None:
+        """Drain an endpoint's queue, one combined POST per batch window."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + NOTIFICATION_BATCH_WINDOW_SECONDS
+            while len(batch) < NOTIFICATION_MAX_BATCH:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                payload = self._combine_payloads(channel, [payload for payload, _ in batch])
+                result = await self._post_with_retry(url, payload, headers)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                logger.info("Sent %s %s notification(s) in one POST to %s", len(batch), channel, url)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_result(result)
+    
+    @staticmethod
+    def _combine_payloads(channel: str, payloads: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Merge per-alert payloads into one request body.
+        
+        Slack batches become one message with every alert's attachments (a
+        single alert is sent unchanged). Batching webhooks always receive
+        {"alerts": [...]}, even for one alert, so their body shape does not
+        depend on timing.
+        """
+        if channel == NotificationChannel.SLACK:
+            if len(payloads) == 1:
+                return payloads[0]
+            return {
+                "attachments": [
+                    attachment for payload in payloads for attachment in payload["attachments"]
+                ]
+            }
+        return {"alerts": payloads}
+    
+    def dispatch_alert_notifications(self, alert: Alert, rule: AlertRule) -> asyncio.Task:
+        """Send an alert's notifications in the background (best effort).
+        
+        The task is tracked until done so it is not garbage collected, and
+        close() waits for it.
+        """
+        loop = self._bind_loop()
+        task = loop.create_task(self.send_alert_notifications(alert, rule))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
     
     async def send_alert_notifications(self, alert: Alert, rule: AlertRule) -> None:
-        """Send notifications for an alert via configured channels."""
+        """Send notifications for an alert via configured channels.
+        
+        At most MAX_CONCURRENT_NOTIFICATIONS alerts are sent at a time.
+        """
+        self._bind_loop()
+        async with self._send_sem:
+            await self._send_alert_notifications(alert, rule)
+    
+    async def _send_alert_notifications(self, alert: Alert, rule: AlertRule) -> None:
+        """Send notifications for an alert to each configured channel."""
         try:
             # Get notification channels from rule
             channels = rule.get_notification_channels()
             
             if not channels:
-                logger.info(f"No notification channels configured for rule {rule.name}")
+                logger.info("No notification channels configured for rule %s", rule.name)
                 return
             
-            logger.info(f"Sending notifications for alert {alert.id} via channels: {channels}")
+            logger.info("Sending notifications for alert %s via channels: %s", alert.id, channels)
             
-            # Send notifications to each channel
-            for channel in channels:
-                try:
-                    await self._send_notification(channel, alert, rule)
-                except Exception as e:
-                    logger.error(f"Failed to send notification via {channel}: {e}")
+            timestamps = AlertTimestamps.for_alert(alert)
+            
+            # Send to all channels concurrently; a slow channel no longer
+            # delays the others
+            results = await asyncio.gather(
+                *(self._send_notification(channel, alert, rule, timestamps) for channel in channels),
+                return_exceptions=True
+            )
+            
+            for channel, result in zip(channels, results):
+                if isinstance(result, Exception):
+                    logger.error("Failed to send notification via %s: %s", channel, result)
                     # Record failure in alert
-                    alert.record_notification_sent(channel, False, {"error": str(e)})
+                    alert.record_notification_sent(channel, False, error=str(result))
             
             await self._update_alert_notifications(alert)
             
         except Exception as e:
-            logger.error(f"Error sending alert notifications: {e}")
+            logger.error("Error sending alert notifications: %s", e)
     
     async def _send_notification(
         self, 
         channel: str, 
         alert: Alert, 
-        rule: AlertRule
+        rule: AlertRule,
+        timestamps: AlertTimestamps
     ) -> None:
         """Send notification via a specific channel."""
-        try:
-            if channel == NotificationChannel.EMAIL:
-                await self._send_email_notification(alert, rule)
-            elif channel == NotificationChannel.SLACK:
-                await self._send_slack_notification(alert, rule)
-            elif channel == NotificationChannel.WEBHOOK:
-                await self._send_webhook_notification(alert, rule)
-            else:
-                logger.warning(f"Unsupported notification channel: {channel}")
-                
-        except Exception as e:
-            logger.error(f"Error sending {channel} notification: {e}")
-            raise
+        handler = self._handlers.get(channel)
+        if handler is None:
+            logger.warning("Unsupported notification channel: %s", channel)
+            return
+        await handler(alert, rule, timestamps)
     
-    async def _send_email_notification(self, alert: Alert, rule: AlertRule) -> None:
+    async def _send_email_notification(
+        self,
+        alert: Alert,
+        rule: AlertRule,
+        timestamps: AlertTimestamps
+    ) -> None:
         """Send email notification."""
-        try:
-            # Check if email is configured
-            if not settings.smtp_host or not settings.smtp_username:
-                logger.warning("SMTP not configured, skipping email notification")
-                return
-            
-            # Get email template
-            subject = f"[{alert.severity.upper()}] {alert.title}"
-            body = self._generate_email_body(alert, rule)
-            
-            # TODO: Implement actual SMTP sending
-            # For now, just log the email content
-            logger.info(f"Email notification prepared:")
-            logger.info(f"  To: {settings.email_from}")
-            logger.info(f"  Subject: {subject}")
-            logger.info(f"  Body: {body[:200]}...")
-            
-            # Record success
-            alert.record_notification_sent(NotificationChannel.EMAIL, True, {
-                "subject": subject,
-                "body_length": len(body)
-            })
-            
-        except Exception as e:
-            logger.error(f"Error sending email notification: {e}")
-            raise
+        # Check if email is configured
+        if not settings.smtp_host or not settings.smtp_username:
+            logger.warning("SMTP not configured, skipping email notification")
+            return
+        
+        # Get email template
+        severity_upper = alert.severity.upper()
+        subject = f"[{severity_upper}] {alert.title}"
+        body = self._generate_email_body(alert, rule, timestamps, severity_upper)
+        
+        # TODO: Implement actual SMTP sending
+        # For now, just log the email content
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Email notification prepared:")
+            logger.info("  To: %s", settings.email_from)
+            logger.info("  Subject: %s", subject)
+            logger.info("  Body: %s...", body[:200])
+        
+        # Record success
+        alert.record_notification_sent(
+            NotificationChannel.EMAIL, True, body_length=len(body)
+        )
     
-    async def _send_slack_notification(self, alert: Alert, rule: AlertRule) -> None:
+    async def _send_slack_notification(
+        self,
+        alert: Alert,
+        rule: AlertRule,
+        timestamps: AlertTimestamps
+    ) -> None:
         """Send Slack notification."""
-        try:
-            # Check if Slack is configured
-            if not settings.slack_webhook_url:
-                logger.warning("Slack webhook not configured, skipping Slack notification")
-                return
-            
-            # Prepare Slack message
-            slack_message = self._generate_slack_message(alert, rule)
-            
-            # Send to Slack webhook
-            response = await self.http_client.post(
-                settings.slack_webhook_url,
-                json=slack_message,
-                headers={"Content-Type": "application/json"}
+        # Check if Slack is configured
+        if not settings.slack_webhook_url:
+            logger.warning("Slack webhook not configured, skipping Slack notification")
+            return
+        
+        # Prepare Slack message
+        slack_message = self._generate_slack_message(alert, rule, timestamps)
+        
+        # Send to Slack webhook
+        response_status, response_text = await self._post_batched(
+            NotificationChannel.SLACK,
+            settings.slack_webhook_url,
+            {"Content-Type": "application/json"},
+            slack_message
+        )
+        
+        if response_status == 200:
+            logger.info("Slack notification sent successfully")
+            alert.record_notification_sent(
+                NotificationChannel.SLACK, True, status=response_status
+            )
+        else:
+            logger.error("Slack notification failed: %s", response_status)
+            alert.record_notification_sent(
+                NotificationChannel.SLACK, False, status=response_status, error=response_text
             )
-            
-            if response.status_code == 200:
-                logger.info(f"Slack notification sent successfully")
-                alert.record_notification_sent(NotificationChannel.SLACK, True, {
-                    "response_status": response.status_code
-                })
-            else:
-                logger.error(f"Slack notification failed: {response.status_code}")
-                alert.record_notification_sent(NotificationChannel.SLACK, False, {
-                    "response_status": response.status_code,
-                    "response_text": response.text
-                })
-                
-        except Exception as e:
-            logger.error(f"Error sending Slack notification: {e}")
-            raise
     
-    async def _send_webhook_notification(self, alert: Alert, rule: AlertRule) -> None:
+    async def _send_webhook_notification(
+        self,
+        alert: Alert,
+        rule: AlertRule,
+        timestamps: AlertTimestamps
+    ) -> None:
         """Send webhook notification."""
-        try:
-            # Get webhook configuration from rule
-            webhook_config = rule.get_channel_config(NotificationChannel.WEBHOOK)
-            webhook_url = webhook_config.get("url")
-            
-            if not webhook_url:
-                logger.warning("Webhook URL not configured, skipping webhook notification")
-                return
-            
-            # Prepare webhook payload
-            webhook_payload = self._generate_webhook_payload(alert, rule)
-            
-            # Send webhook
-            response = await self.http_client.post(
-                webhook_url,
-                json=webhook_payload,
-                headers=webhook_config.get("headers", {"Content-Type": "application/json"})
+        # Get webhook configuration from rule
+        webhook_config = rule.get_channel_config(NotificationChannel.WEBHOOK)
+        webhook_url = webhook_config.get("url")
+        
+        if not webhook_url:
+            logger.warning("Webhook URL not configured, skipping webhook notification")
+            return
+        
+        # Prepare webhook payload
+        webhook_payload = self._generate_webhook_payload(alert, rule, timestamps)
+        headers = webhook_config.get("headers", {"Content-Type": "application/json"})
+        
+        # Send webhook: one alert per POST, unless the endpoint opted into the
+        # batched {"alerts": [...]} envelope
+        if webhook_config.get("batch", False):
+            response_status, response_text = await self._post_batched(
+                NotificationChannel.WEBHOOK, webhook_url, headers, webhook_payload
+            )
+        else:
+            response_status, response_text = await self._post_with_retry(
+                webhook_url, webhook_payload, headers
+            )
+        
+        if response_status in [200, 201, 202]:
+            logger.info("Webhook notification sent successfully to %s", webhook_url)
+            alert.record_notification_sent(
+                NotificationChannel.WEBHOOK, True, status=response_status
+            )
+        else:
+            logger.error("Webhook notification failed: %s", response_status)
+            alert.record_notification_sent(
+                NotificationChannel.WEBHOOK, False, status=response_status, error=response_text
             )
-            
-            if response.status_code in [200, 201, 202]:
-                logger.info(f"Webhook notification sent successfully to {webhook_url}")
-                alert.record_notification_sent(NotificationChannel.WEBHOOK, True, {
-                    "webhook_url": webhook_url,
-                    "response_status": response.status_code
-                })
-            else:
-                logger.error(f"Webhook notification failed: {response.status_code}")
-                alert.record_notification_sent(NotificationChannel.WEBHOOK, False, {
-                    "webhook_url": webhook_url,
-                    "response_status": response.status_code,
-                    "response_text": response.text
-                })
-                
-        except Exception as e:
-            logger.error(f"Error sending webhook notification: {e}")
-            raise
     
-    def _generate_email_body(self, alert: Alert, rule: AlertRule) -> str:
+    def _generate_email_body(
+        self,
+        alert: Alert,
+        rule: AlertRule,
+        timestamps: Optional[AlertTimestamps] = None,
+        severity_upper: Optional[str] = None
+    ) -> str:
         """Generate email body content."""
-        body = f"""
-Alert Details:
-==============
-
-Title: {alert.title}
-Severity: {alert.severity.upper()}
-Status: {alert.status}
-Triggered: {alert.triggered_at.strftime('%Y-%m-%d %H:%M:%S UTC')}
-
-Message:
-{alert.message}
-
-Rule Information:
-=================
-Rule Name: {rule.name}
-Description: {rule.description or 'No description'}
-Time Window: {rule.time_window}
-Evaluation Interval: {rule.evaluation_interval} seconds
-
-Alert Context:
-==============
-Alert ID: {alert.id}
-Rule ID: {rule.id}
-Tenant ID: {alert.tenant_id}
-
-This is an automated alert from PulseStream.
-        """
+        if timestamps is None:
+            timestamps = AlertTimestamps.for_alert(alert)
+        if severity_upper is None:
+            severity_upper = alert.severity.upper()
         
-        return body.strip()
+        parts = _EMAIL_PARTS
+        return "".join((
+            parts[0], alert.title,
+            parts[1], severity_upper,
+            parts[2], str(alert.status),
+            parts[3], timestamps.triggered_str,
+            parts[4], alert.message,
+            parts[5], _get_rule_fragments(rule).email_section,
+            parts[6], str(alert.id),
+            parts[7], str(rule.id),
+            parts[8], str(alert.tenant_id),
+            parts[9],
+        ))
     
-    def _generate_slack_message(self, alert: Alert, rule: AlertRule) -> Dict[str, Any]:
+    def _generate_slack_message(
+        self,
+        alert: Alert,
+        rule: AlertRule,
+        timestamps: Optional[AlertTimestamps] = None
+    ) -> Dict[str, Any]:
         """Generate Slack message format."""
-        # Determine color based on severity
-        color_map = {
-            "low": "#36a64f",      # Green
-            "medium": "#ff8c00",   # Orange
-            "high": "#ff0000",     # Red
-            "critical": "#8b0000"  # Dark Red
-        }
-        color = color_map.get(alert.severity.lower(), "#36a64f")
+        if timestamps is None:
+            timestamps = AlertTimestamps.for_alert(alert)
         
-        # Create Slack message
-        message = {
+        # Only the alert-specific parts are built here; the rule's skeleton
+        # and the severity's color/field are shared across alerts
+        skeleton = _get_rule_fragments(rule).slack_skeleton
+        color, severity_field = _slack_severity_parts(alert.severity)
+        
+        return {
             "attachments": [
                 {
+                    **skeleton,
                     "color": color,
                     "title": alert.title,
                     "text": alert.message,
                     "fields": [
-                        {
-                            "title": "Severity",
-                            "value": alert.severity.upper(),
-                            "short": True
-                        },
-                        {
-                            "title": "Status",
-                            "value": alert.status,
-                            "short": True
-                        },
-                        {
-                            "title": "Rule",
-                            "value": rule.name,
-                            "short": True
-                        },
-                        {
-                            "title": "Time Window",
-                            "value": rule.time_window,
-                            "short": True
-                        },
-                        {
-                            "title": "Triggered At",
-                            "value": alert.triggered_at.strftime('%Y-%m-%d %H:%M:%S UTC'),
-                            "short": False
-                        }
+                        severity_field,
+                        {"title": "Status", "value": alert.status, "short": True},
+                        *skeleton["fields"],
+                        {"title": "Triggered At", "value": timestamps.triggered_str, "short": False}
                     ],
-                    "footer": "PulseStream Alerting System",
-                    "ts": int(alert.triggered_at.timestamp())
+                    "ts": timestamps.triggered_ts
                 }
             ]
         }
-        
-        return message
     
-    def _generate_webhook_payload(self, alert: Alert, rule: AlertRule) -> Dict[str, Any]:
+    def _generate_webhook_payload(
+        self,
+        alert: Alert,
+        rule: AlertRule,
+        timestamps: Optional[AlertTimestamps] = None
+    ) -> Dict[str, Any]:
         """Generate webhook payload."""
+        if timestamps is None:
+            timestamps = AlertTimestamps.for_alert(alert)
+        
         return {
             "alert": {
                 "id": str(alert.id),
@@ -266,37 +616,133 @@ This is an automated alert from PulseStream.
                 "message": alert.message,
                 "severity": alert.severity,
                 "status": alert.status,
-                "triggered_at": alert.triggered_at.isoformat(),
+                "triggered_at": timestamps.triggered_iso,
                 "trigger_data": alert.trigger_data
             },
-            "rule": {
-                "id": str(rule.id),
-                "name": rule.name,
-                "description": rule.description,
-                "severity": rule.severity,
-                "time_window": rule.time_window
-            },
+            "rule": _get_rule_fragments(rule).webhook_rule,
             "metadata": {
                 "source": "pulsestream",
                 "version": "1.0",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": timestamps.now_iso
             }
         }
     
     async def _update_alert_notifications(self, alert: Alert) -> None:
-        """Update alert with notification records."""
+        """Persist the alert's notification records.
+        
+        Dispatch runs after the evaluating session has closed, so the records
+        are written on a session of their own, in one UPDATE by alert id.
+        """
         try:
-            # This would typically update the alert in the database
-            # For now, we'll just log the notification records
-            if alert.notifications_sent:
-                logger.info(f"Alert {alert.id} notifications: {alert.notifications_sent}")
-                
+            # Serialize the buffered records onto the (detached) alert
+            alert.flush_notification_records()
+            if not alert.notifications_sent:
+                return
+            
+            async with AsyncSessionLocal() as session:
+                await session.execute(
+                    update(Alert)
+                    .where(Alert.id == alert.id)
+                    .values(
+                        notifications_sent=alert.notifications_sent,
+                        notification_failures=alert.notification_failures
+                    )
+                )
+                await session.commit()
+            
+            logger.info("Alert %s notifications: %s", alert.id, alert.notifications_sent)
+            
         except Exception as e:
-            logger.error(f"Error updating alert notifications: {e}")
+            logger.error("Error updating alert notifications: %s", e)
     
     async def close(self):
-        """Close the HTTP client."""
-        await self.http_client.aclose()
+        """Finish pending dispatches and stop the batch dispatchers.
+        
+        The shared HTTP session stays open for other instances; it is closed
+        by close_notification_service().
+        """
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        
+        for task in self._batch_tasks.values():
+            task.cancel()
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks.values(), return_exceptions=True)
+        self._batch_queues = {}
+        self._batch_tasks = {}
+        self._background_tasks = set()
+        self._send_sem = None
+        self._loop = None
+
+
+_CONVERSIONS = {"s": str, "r": repr, "a": ascii}
+
+
+@lru_cache(maxsize=256)
+def _compile_template(template: str) -> Callable[[Dict[str, Any]], str]:
+    """Parse a str.format-style template once into a render closure.
+    
+    Placeholders whose variable is missing are rendered back verbatim.
+    Raises ValueError for malformed templates.
+    """
+    segments = []
+    for literal, field_name, format_spec, conversion in Formatter().parse(template):
+        if literal:
+            segments.append(literal)
+        if field_name is not None:
+            placeholder = "{" + field_name
+            if conversion:
+                placeholder += "!" + conversion
+            if format_spec:
+                placeholder += ":" + format_spec
+            placeholder += "}"
+            segments.append((field_name, format_spec, _CONVERSIONS.get(conversion), placeholder))
+    segments = tuple(segments)
+    
+    def render(variables: Dict[str, Any]) -> str:
+        parts = []
+        for segment in segments:
+            if isinstance(segment, str):
+                parts.append(segment)
+                continue
+            
+            field_name, format_spec, convert, placeholder = segment
+            if field_name not in variables:
+                parts.append(placeholder)
+                continue
+            
+            value = variables[field_name]
+            if convert is not None:
+                value = convert(value)
+            parts.append(format(value, format_spec))
+        return "".join(parts)
+    
+    return render
+
+
+@lru_cache(maxsize=128)
+def _compile_json_template(template_json: bytes) -> Callable[[Dict[str, Any]], Any]:
+    """Compile a JSON template, given as its orjson serialization, into a render closure.
+    
+    The tree is walked once here; string leaves become compiled templates
+    and every other leaf, including a malformed string, is returned as-is
+    on each render.
+    """
+    def compile_node(node: Any) -> Callable[[Dict[str, Any]], Any]:
+        if isinstance(node, dict):
+            items = tuple((key, compile_node(value)) for key, value in node.items())
+            return lambda variables: {key: render(variables) for key, render in items}
+        if isinstance(node, list):
+            renders = tuple(compile_node(item) for item in node)
+            return lambda variables: [render(variables) for render in renders]
+        if isinstance(node, str):
+            try:
+                return _compile_template(node)
+            except ValueError as e:
+                logger.warning("Invalid template: %s", e)
+        return lambda variables: node
+    
+    return compile_node(orjson.loads(template_json))
 
 
 class NotificationTemplateService:
@@ -366,19 +812,46 @@ This alert was generated by PulseStream.
     def render_template(template: str, variables: Dict[str, Any]) -> str:
         """Render a template with variables."""
         try:
-            return template.format(**variables)
-        except KeyError as e:
-            logger.warning(f"Missing template variable: {e}")
+            return _compile_template(template)(variables)
+        except ValueError as e:
+            logger.warning("Invalid template: %s", e)
             return template
     
     @staticmethod
     def render_json_template(template: Dict[str, Any], variables: Dict[str, Any]) -> Dict[str, Any]:
-        """Render a JSON template with variables."""
+        """Render a JSON template with variables.
+        
+        Only the string leaves are formatted, a placeholder with a missing
+        variable is left as-is. The template is compiled once per distinct
+        content (keyed by its orjson serialization), so hot templates skip
+        the tree walk and per-leaf parsing.
+        """
         try:
-            # Convert to string, render, then back to JSON
-            template_str = json.dumps(template)
-            rendered_str = NotificationTemplateService.render_template(template_str, variables)
-            return json.loads(rendered_str)
+            return _compile_json_template(orjson.dumps(template))(variables)
         except Exception as e:
-            logger.error(f"Error rendering JSON template: {e}")
+            logger.error("Error rendering JSON template: %s", e)
             return template
+
+
+# Process-wide notification service; created at app startup (or on first use
+# in workers) and shared by every dispatch so its HTTP session is pooled
+_notification_service: Optional[NotificationService] = None
+
+
+def get_notification_service() -> NotificationService:
+    """Get the process-wide notification service."""
+    global _notification_service
+    if _notification_service is None:
+        _notification_service = NotificationService()
+    return _notification_service
+
+
+async def close_notification_service() -> None:
+    """Drain the shared service and close the HTTP session at shutdown.
+    
+    The instance itself is kept, since the rule engine holds a reference;
+    the session reopens if it is used again.
+    """
+    if _notification_service is not None:
+        await _notification_service.close()
+    await _close_shared_client()
@@ -0,0 +1,96 @@
+"""Alert management schemas for PulseStream."""
+
+from typing import Optional, Dict, Any, List, Literal, Union
+from pydantic import BaseModel, Field, validator
+
+from core.constants import AlertSeverity, TIME_WINDOWS
+from apps.alerting.services import compile_condition
+
+
+ThresholdOperator = Literal[">", ">=", "<", "<=", "==", "!="]
+
+
+def _check_time_window(v: Optional[str]) -> Optional[str]:
+    """Ensure a time window is one of the supported windows."""
+    if v is not None and v not in TIME_WINDOWS:
+        raise ValueError(f"Time window must be one of: {', '.join(TIME_WINDOWS)}")
+    return v
+
+
+def _check_condition(v: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Reject conditions the rule engine cannot compile."""
+    if v is not None:
+        compile_condition(v)
+    return v
+
+
+class AlertRuleCreate(BaseModel):
+    """Alert rule creation request schema."""
+    name: str = Field(..., min_length=1, max_length=255, description="Human-readable rule name")
+    description: Optional[str] = Field(None, description="What this rule monitors")
+    event_type: Optional[str] = Field(None, max_length=50, description="Event type to monitor (null = all types)")
+    condition: Dict[str, Any] = Field(..., description="Condition definition (type: count, threshold or pattern)")
+    threshold_value: Optional[float] = Field(None, description="Numerical threshold for comparison")
+    threshold_operator: Optional[ThresholdOperator] = Field(None, description="Comparison operator")
+    time_window: str = Field(default="5m", description="Evaluation time window")
+    evaluation_interval: int = Field(default=60, ge=1, description="Evaluation interval in seconds")
+    severity: AlertSeverity = Field(..., description="Alert severity level")
+    notification_channels: Optional[Union[List[str], Dict[str, Any]]] = Field(
+        None, description="Notification channels, as a list or per-channel configuration"
+    )
+    notification_template: Optional[str] = Field(None, description="Custom notification message template")
+    is_active: bool = Field(default=True, description="Whether the rule is active")
+    cooldown_minutes: int = Field(default=5, ge=0, description="Minimum minutes between alerts")
+    max_alerts_per_hour: int = Field(default=10, ge=1, description="Maximum alerts per hour")
+
+    @validator('time_window')
+    def validate_time_window(cls, v):
+        """Validate time window."""
+        return _check_time_window(v)
+
+    @validator('condition')
+    def validate_condition(cls, v):
+        """Validate condition."""
+        return _check_condition(v)
+
+    class Config:
+        use_enum_values = True
+
+
+class AlertRuleUpdate(BaseModel):
+    """Alert rule update request schema."""
+    name: Optional[str] = Field(None, min_length=1, max_length=255, description="Human-readable rule name")
+    description: Optional[str] = Field(None, description="What this rule monitors")
+    event_type: Optional[str] = Field(None, max_length=50, description="Event type to monitor (null = all types)")
+    condition: Optional[Dict[str, Any]] = Field(None, description="Condition definition")
+    threshold_value: Optional[float] = Field(None, description="Numerical threshold for comparison")
+    threshold_operator: Optional[ThresholdOperator] = Field(None, description="Comparison operator")
+    time_window: Optional[str] = Field(None, description="Evaluation time window")
+    evaluation_interval: Optional[int] = Field(None, ge=1, description="Evaluation interval in seconds")
+    severity: Optional[AlertSeverity] = Field(None, description="Alert severity level")
+    notification_channels: Optional[Union[List[str], Dict[str, Any]]] = Field(
+        None, description="Notification channels, as a list or per-channel configuration"
+    )
+    notification_template: Optional[str] = Field(None, description="Custom notification message template")
+    is_active: Optional[bool] = Field(None, description="Whether the rule is active")
+    cooldown_minutes: Optional[int] = Field(None, ge=0, description="Minimum minutes between alerts")
+    max_alerts_per_hour: Optional[int] = Field(None, ge=1, description="Maximum alerts per hour")
+
+    @validator('time_window')
+    def validate_time_window(cls, v):
+        """Validate time window."""
+        return _check_time_window(v)
+
+    @validator('condition')
+    def validate_condition(cls, v):
+        """Validate condition."""
+        return _check_condition(v)
+
+    class Config:
+        use_enum_values = True
+
+
+class AlertResolveRequest(BaseModel):
+    """Alert resolution request schema."""
+    resolved_by: str = Field(default="system", min_length=1, max_length=255, description="Who or what resolved the alert")
+    note: Optional[str] = Field(None, description="How the alert was resolved")
@@ -1,478 +1,921 @@
 """Alert management services for PulseStream."""
 
-import json
+import asyncio
 import logging
+import math
+from collections import ChainMap, OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from functools import lru_cache, wraps
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, NamedTuple, Optional, Any, Tuple
 from uuid import UUID
 
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import case, select, and_, func, update
 from sqlalchemy.orm import selectinload
 
+from core.config import settings
+from core.database import AsyncSessionLocal
 from core.logging import get_logger
 from core.constants import AlertSeverity, AlertStatus, TIME_WINDOWS
 from apps.storage.models.alert import AlertRule, Alert
 from apps.storage.models.event import Event
-from apps.storage.crud import alert_rule_crud, alert_crud
-from apps.alerting.notifications import NotificationService
+from apps.storage.crud import alert_rule_crud, alert_crud, event_crud
+from apps.alerting.cache import RECENT_ALERTS_WINDOW, evaluation_jobs, recent_alert_counts, response_cache
+from apps.alerting.notifications import NotificationService, get_notification_service
 
 logger = get_logger(__name__)
 
+# Aggregates every condition is evaluated from, computed by the database
+EVENT_AGGREGATE_COLUMNS = (
+    func.count(),
+    func.count().filter(Event.status_code >= 400),
+    func.avg(Event.status_code),
+    func.avg(Event.duration_ms),
+)
+
+# Columns of the events_sample rows attached to triggered count alerts
+EVENT_SAMPLE_COLUMNS = (Event.public_id, Event.event_type, Event.event_timestamp, Event.source)
+
+# Rows fetched for trigger_data samples, newest first
+EVENTS_SAMPLE_SIZE = 5
+RESPONSE_TIME_SAMPLE_SIZE = 10
+
+
+class EventAggregates(NamedTuple):
+    """A rule's window of events, reduced in SQL (count only: just total)."""
+    total: int
+    errors: Optional[int]
+    avg_status: Optional[float]
+    avg_duration: Optional[float]
+    # Fraction (0.95 for p95) -> duration_ms at that percentile, for the
+    # percentiles the window's rules asked for
+    duration_percentiles: Mapping[float, Optional[float]] = MappingProxyType({})
+    
+    @classmethod
+    def from_row(cls, row, percentiles: Tuple[float, ...] = ()) -> "EventAggregates":
+        """Build from an EVENT_AGGREGATE_COLUMNS row (AVG comes back as Decimal),
+        followed by one column per requested percentile."""
+        total, errors, avg_status, avg_duration = row[:4]
+        return cls(
+            total,
+            errors,
+            float(avg_status) if avg_status is not None else None,
+            float(avg_duration) if avg_duration is not None else None,
+            dict(zip(percentiles, row[4:]))
+        )
+
+
+def _is_count_condition(condition: Any) -> bool:
+    """Check whether a condition only needs the window's event count."""
+    return isinstance(condition, dict) and condition.get("type", "count") == "count"
+
+
+def _is_unbounded_count_condition(condition: Any) -> bool:
+    """Check whether a count condition holds for any count (0 to unlimited)."""
+    return (
+        _is_count_condition(condition)
+        and condition.get("min_count", 0) == 0
+        and condition.get("max_count", float('inf')) == float('inf')
+    )
+
+
+def _can_never_trigger(rule: AlertRule) -> bool:
+    """Check whether a rule fails without looking at any events."""
+    condition = rule.condition
+    if isinstance(condition, dict) and condition.get("type") == "threshold":
+        # Mirrors the check in _evaluate_threshold_condition
+        return not rule.threshold_value or not rule.threshold_operator
+    return False
+
+
+def _condition_percentile(condition: Any) -> Optional[float]:
+    """Get the duration percentile (as a fraction) a condition reads, if any."""
+    if not isinstance(condition, dict) or condition.get("type") != "pattern":
+        return None
+    pattern = condition.get("pattern")
+    if not isinstance(pattern, dict) or pattern.get("type") != "response_time":
+        return None
+    percentile = pattern.get("percentile")
+    return percentile / 100 if isinstance(percentile, (int, float)) else None
+
+
+# EventAggregates.total of a window that was never queried
+UNCOUNTED_EVENTS = -1
+
+# A compiled condition: evaluates a window's aggregates for its rule
+ConditionEvaluator = Callable[[EventAggregates, AlertRule], Tuple[bool, Dict[str, Any]]]
+
+# Upper bound on cached compiled conditions per engine
+MAX_COMPILED_CONDITIONS = 4096
+
+# Window aggregate queries one evaluation may run at once, each on its own
+# pooled connection; half the pool stays free for request handlers
+MAX_CONCURRENT_WINDOW_QUERIES = max(1, settings.database_pool_size // 2)
+
+# session.info key under which an evaluation keeps its (alert, rule) pairs
+# until the caller has committed them
+PENDING_ALERTS_INFO_KEY = "alerting.pending_alerts"
+
+# Event fields a threshold condition can aggregate
+METRIC_FIELDS = frozenset({"status_code", "duration_ms", "count"})
+
+
+def catch_and_log(message: str):
+    """Make an async method log (with traceback) and return None on error.
+    
+    Marks an error boundary, so the helpers it calls need no try/except of
+    their own.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await fn(*args, **kwargs)
+            except Exception:
+                logger.exception(message)
+                return None
+        return wrapper
+    return decorator
+
+
+def _condition_number(source: Dict[str, Any], key: str, default: float) -> float:
+    """Read a numeric condition parameter, rejecting anything else."""
+    value = source.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{key} must be a number")
+    return value
+
+
+def compile_condition(condition: Dict[str, Any]) -> ConditionEvaluator:
+    """Validate a rule condition and compile it into an evaluator.
+    
+    The type dispatch and parameter lookups happen once here, with the
+    parameters captured by the returned closure. Raises ValueError for a
+    malformed condition.
+    """
+    if not isinstance(condition, dict) or not condition:
+        raise ValueError("Condition must be a non-empty object")
+    
+    condition_type = condition.get("type", "count")
+    
+    if condition_type == "count":
+        min_count = _condition_number(condition, "min_count", 0)
+        max_count = _condition_number(condition, "max_count", float('inf'))
+        if min_count > max_count:
+            raise ValueError("min_count must not exceed max_count")
+        return lambda aggregates, rule: _evaluate_count_condition(aggregates, min_count, max_count, rule)
+    
+    if condition_type == "threshold":
+        metric_field = condition.get("metric_field", "status_code")
+        if metric_field not in METRIC_FIELDS:
+            raise ValueError(f"metric_field must be one of: {', '.join(sorted(METRIC_FIELDS))}")
+        return lambda aggregates, rule: _evaluate_threshold_condition(aggregates, metric_field, rule)
+    
+    if condition_type == "pattern":
+        pattern = condition.get("pattern", {})
+        if not isinstance(pattern, dict):
+            raise ValueError("pattern must be an object")
+        pattern_type = pattern.get("type", "error_rate")
+        
+        if pattern_type == "error_rate":
+            max_error_rate = _condition_number(pattern, "max_error_rate", 0.1)  # Default 10%
+            return lambda aggregates, rule: _evaluate_error_rate_pattern(aggregates, max_error_rate)
+        if pattern_type == "response_time" and "percentile" in pattern:
+            percentile = _condition_number(pattern, "percentile", 95)
+            if not 0 < percentile <= 100:
+                raise ValueError("percentile must be in (0, 100]")
+            max_response_time_ms = _condition_number(pattern, "max_response_time_ms", 1000)  # Default 1s
+            return lambda aggregates, rule: _evaluate_response_time_percentile(
+                aggregates, percentile, max_response_time_ms
+            )
+        if pattern_type == "response_time":
+            max_avg_response_time = _condition_number(pattern, "max_avg_response_time", 1000)  # Default 1s
+            return lambda aggregates, rule: _evaluate_response_time_pattern(aggregates, max_avg_response_time)
+        raise ValueError(f"Unknown pattern type: {pattern_type}")
+    
+    raise ValueError(f"Unknown condition type: {condition_type}")
+
+
+def _evaluate_count_condition(
+    aggregates: EventAggregates, 
+    min_count: float, 
+    max_count: float, 
+    rule: AlertRule
+) -> Tuple[bool, Dict[str, Any]]:
+    """Evaluate count-based condition (events_sample is attached on trigger).
+    
+    A window that was not counted, because every rule reading it accepts
+    any count, triggers without an event_count.
+    """
+    event_count = aggregates.total
+    if event_count == UNCOUNTED_EVENTS:
+        return True, {
+            "condition_type": "count",
+            "min_count": min_count,
+            "max_count": max_count,
+            "time_window": rule.time_window
+        }
+    
+    # Check if count is within bounds
+    should_trigger = min_count <= event_count <= max_count
+    
+    trigger_data = {
+        "condition_type": "count",
+        "event_count": event_count,
+        "min_count": min_count,
+        "max_count": max_count,
+        "time_window": rule.time_window
+    }
+    
+    return should_trigger, trigger_data
+
+
+def _evaluate_threshold_condition(
+    aggregates: EventAggregates, 
+    metric_field: str, 
+    rule: AlertRule
+) -> Tuple[bool, Dict[str, Any]]:
+    """Evaluate threshold-based condition."""
+    # Threshold criteria live on the rule itself
+    threshold_value = rule.threshold_value
+    operator = rule.threshold_operator
+    if not threshold_value or not operator:
+        return False, {}
+    
+    # Calculate metric value
+    metric_value = _calculate_metric_value(aggregates, metric_field)
+    
+    # Compare with threshold
+    should_trigger = _compare_values(metric_value, operator, threshold_value)
+    
+    trigger_data = {
+        "condition_type": "threshold",
+        "metric_field": metric_field,
+        "metric_value": metric_value,
+        "threshold_value": threshold_value,
+        "operator": operator,
+        "time_window": rule.time_window,
+        "events_count": aggregates.total
+    }
+    
+    return should_trigger, trigger_data
+
+
+def _evaluate_error_rate_pattern(
+    aggregates: EventAggregates, 
+    max_error_rate: float
+) -> Tuple[bool, Dict[str, Any]]:
+    """Evaluate error rate pattern."""
+    if not aggregates.total:
+        return False, {}
+    
+    # Error events have status code >= 400
+    error_rate = aggregates.errors / aggregates.total
+    
+    should_trigger = error_rate > max_error_rate
+    
+    trigger_data = {
+        "condition_type": "pattern",
+        "pattern_type": "error_rate",
+        "error_rate": error_rate,
+        "max_error_rate": max_error_rate,
+        "total_events": aggregates.total,
+        "error_events": aggregates.errors
+    }
+    
+    return should_trigger, trigger_data
+
+
+def _evaluate_response_time_pattern(
+    aggregates: EventAggregates, 
+    max_avg_response_time: float
+) -> Tuple[bool, Dict[str, Any]]:
+    """Evaluate response time pattern (response_time_sample is attached on trigger)."""
+    # Average over the events that have a duration
+    avg_response_time = aggregates.avg_duration
+    if avg_response_time is None:
+        return False, {}
+    
+    should_trigger = avg_response_time > max_avg_response_time
+    
+    trigger_data = {
+        "condition_type": "pattern",
+        "pattern_type": "response_time",
+        "avg_response_time": avg_response_time,
+        "max_avg_response_time": max_avg_response_time,
+        "total_events": aggregates.total
+    }
+    
+    return should_trigger, trigger_data
+
+
+def _evaluate_response_time_percentile(
+    aggregates: EventAggregates, 
+    percentile: float, 
+    max_response_time_ms: float
+) -> Tuple[bool, Dict[str, Any]]:
+    """Evaluate a response time percentile (e.g. p95) against its limit."""
+    # percentile_cont over the events that have a duration
+    response_time = aggregates.duration_percentiles.get(percentile / 100)
+    if response_time is None:
+        return False, {}
+    
+    should_trigger = response_time > max_response_time_ms
+    
+    trigger_data = {
+        "condition_type": "pattern",
+        "pattern_type": "response_time_percentile",
+        "percentile": percentile,
+        "response_time": response_time,
+        "max_response_time_ms": max_response_time_ms,
+        "total_events": aggregates.total
+    }
+    
+    return should_trigger, trigger_data
+
+
+def _calculate_metric_value(aggregates: EventAggregates, metric_field: str) -> float:
+    """Calculate metric value from events."""
+    if metric_field == "status_code":
+        # Return average status code
+        return aggregates.avg_status if aggregates.avg_status is not None else 0.0
+    
+    elif metric_field == "duration_ms":
+        # Return average response time
+        return aggregates.avg_duration if aggregates.avg_duration is not None else 0.0
+    
+    # "count": the number of events
+    return aggregates.total
+
+
+def _values_equal(value: float, threshold: float) -> bool:
+    """Check equality: exact for integral values (counts, status codes),
+    within a relative tolerance for floats (durations, averages)."""
+    # threshold_value is a Float column, so a whole-number threshold arrives
+    # as e.g. 500.0
+    if isinstance(value, int) and float(threshold).is_integer():
+        return value == int(threshold)
+    return math.isclose(value, threshold, rel_tol=1e-9, abs_tol=1e-9)
+
+
+def _compare_values(value: float, operator: str, threshold: float) -> bool:
+    """Compare value with threshold using operator."""
+    if operator == ">":
+        return value > threshold
+    elif operator == ">=":
+        return value >= threshold
+    elif operator == "<":
+        return value < threshold
+    elif operator == "<=":
+        return value <= threshold
+    elif operator == "==":
+        return _values_equal(value, threshold)
+    elif operator == "!=":
+        return not _values_equal(value, threshold)
+    else:
+        logger.warning("Unknown operator: %s", operator)
+        return False
+
+
+# Alert title/message per (condition type, pattern type), rendered with
+# format_map over the trigger data, the rule's name and time window, and
+# _TEMPLATE_DEFAULTS for anything missing. ("count", UNCOUNTED_TEMPLATE) is
+# a count trigger on a window that was not counted
+UNCOUNTED_TEMPLATE = "uncounted"
+ALERT_TITLE_TEMPLATES = {
+    ("count", None): "High Event Count Alert: {event_count} events in {time_window}",
+    ("count", UNCOUNTED_TEMPLATE): "Event Count Alert: events received in {time_window}",
+    ("threshold", None): "Threshold Exceeded: {metric_field} = {metric_value}",
+    ("pattern", "error_rate"): "High Error Rate: {error_rate:.1%} in {time_window}",
+    ("pattern", "response_time"): "High Response Time: {avg_response_time:.0f}ms average",
+    ("pattern", "response_time_percentile"): "High Response Time: {response_time:.0f}ms at p{percentile:g}",
+}
+DEFAULT_ALERT_TITLE = "Alert: {rule_name}"
+
+ALERT_MESSAGE_HEADER = "Alert rule '{rule_name}' has been triggered.\n\n"
+ALERT_MESSAGE_TEMPLATES = {
+    ("count", None): (
+        "Event count: {event_count}\n"
+        "Threshold: {min_count} - {max_count}\n"
+        "Time window: {time_window}"
+    ),
+    ("count", UNCOUNTED_TEMPLATE): (
+        "Threshold: any event count\n"
+        "Time window: {time_window}"
+    ),
+    ("threshold", None): (
+        "Metric: {metric_field}\n"
+        "Current value: {metric_value}\n"
+        "Threshold: {operator} {threshold_value}"
+    ),
+    ("pattern", "error_rate"): (
+        "Error rate: {error_rate:.1%}\n"
+        "Maximum allowed: {max_error_rate:.1%}"
+    ),
+    ("pattern", "response_time"): (
+        "Average response time: {avg_response_time:.0f}ms\n"
+        "Maximum allowed: {max_avg_response_time:.0f}ms"
+    ),
+    ("pattern", "response_time_percentile"): (
+        "p{percentile:g} response time: {response_time:.0f}ms\n"
+        "Maximum allowed: {max_response_time_ms:.0f}ms"
+    ),
+}
+
+_TEMPLATE_DEFAULTS = MappingProxyType({
+    "event_count": 0,
+    "min_count": 0,
+    "max_count": "unlimited",
+    "metric_field": "unknown",
+    "metric_value": 0,
+    "threshold_value": 0,
+    "operator": "unknown",
+    "error_rate": 0,
+    "max_error_rate": 0,
+    "avg_response_time": 0,
+    "max_avg_response_time": 0,
+    "percentile": 0,
+    "response_time": 0,
+    "max_response_time_ms": 0,
+})
+
+
+def _template_key(trigger_data: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    """Select the alert templates for a trigger."""
+    condition_type = trigger_data.get("condition_type")
+    if condition_type == "count" and "event_count" not in trigger_data:
+        return condition_type, UNCOUNTED_TEMPLATE
+    return condition_type, trigger_data.get("pattern_type")
+
+
+def _template_values(rule: AlertRule, trigger_data: Dict[str, Any]) -> ChainMap:
+    """Layer the rule's fields over the trigger data and the defaults."""
+    return ChainMap(
+        {"rule_name": rule.name, "time_window": rule.time_window},
+        trigger_data,
+        _TEMPLATE_DEFAULTS
+    )
+
 
 class AlertRuleEngine:
     """Engine for evaluating alert rules against events."""
     
     def __init__(self, notification_service: NotificationService):
         self.notification_service = notification_service
+        # (rule_id, condition JSON) -> evaluator; an edited condition gets a
+        # new key, so stale entries are simply never hit again and age out
+        self._compiled_conditions: "OrderedDict[Tuple[UUID, bytes], Optional[ConditionEvaluator]]" = OrderedDict()
     
+    @catch_and_log("Error evaluating alert rule")
     async def evaluate_rule(
         self, 
         session: AsyncSession, 
         rule: AlertRule, 
-        tenant_id: UUID
+        tenant_id: UUID,
+        now: Optional[datetime] = None
     ) -> Optional[Alert]:
         """Evaluate a single alert rule against current events."""
-        try:
-            logger.info(f"Evaluating alert rule: {rule.name} for tenant {tenant_id}")
-            
-            # Check if rule can trigger
-            if not rule.can_trigger_alert(0):  # We'll get actual count below
-                logger.debug(f"Rule {rule.name} cannot trigger (inactive/cooldown)")
-                return None
-            
-            # Get recent alerts count for rate limiting
-            recent_alerts_count = await self._get_recent_alerts_count(
-                session, rule.id, tenant_id
-            )
-            
-            if not rule.can_trigger_alert(recent_alerts_count):
-                logger.debug(f"Rule {rule.name} rate limited ({recent_alerts_count} recent alerts)")
-                return None
-            
-            # Evaluate rule condition
-            should_trigger, trigger_data = await self._evaluate_condition(
-                session, rule, tenant_id
-            )
-            
-            if not should_trigger:
-                logger.debug(f"Rule {rule.name} condition not met")
-                rule.record_evaluation()
-                await session.flush()
-                return None
-            
-            # Create alert
-            alert = await self._create_alert(session, rule, trigger_data, tenant_id)
-            
-            # Record rule trigger
-            rule.record_trigger()
-            rule.record_evaluation()
-            await session.flush()
-            
-            # Send notifications
-            await self._send_notifications(alert, rule)
-            
-            logger.info(f"Alert rule {rule.name} triggered alert {alert.id}")
-            return alert
-            
-        except Exception as e:
-            logger.error(f"Error evaluating rule {rule.name}: {e}")
-            return None
+        logger.info("Evaluating alert rule: %s for tenant %s", rule.name, tenant_id)
+        alerts = await self.evaluate_rules(session, [rule], tenant_id, now)
+        return alerts[0] if alerts else None
     
-    async def _evaluate_condition(
-        self, 
-        session: AsyncSession, 
-        rule: AlertRule, 
-        tenant_id: UUID
-    ) -> Tuple[bool, Dict[str, Any]]:
-        """Evaluate the rule condition against current events."""
+    async def evaluate_rules(
+        self,
+        session: AsyncSession,
+        rules: List[AlertRule],
+        tenant_id: UUID,
+        now: Optional[datetime] = None
+    ) -> List[Alert]:
+        """Evaluate a tenant's rules, sharing database work between them.
+        
+        Rate limits come from one grouped count of the last hour's alerts,
+        and rules with the same time window and event type are evaluated
+        against one aggregate query over their common window. Every window
+        and timestamp is taken from one ``now`` (default: the current time),
+        so rules sharing a window length share the exact same bounds.
+        
+        Alerts are added to the session uncommitted; after committing, the
+        caller sends their notifications by awaiting publish_committed_alerts().
+        """
+        # Cheapest checks first: inactive, cooling-down and unusable rules are
+        # dropped before any query
+        rules = [
+            rule for rule in rules
+            if self._is_armed(rule) and not _can_never_trigger(rule)
+        ]
+        if not rules:
+            return []
+        
+        if now is None:
+            now = datetime.utcnow()
+        
+        # Get recent alerts counts for rate limiting
         try:
-            # Parse condition
-            condition = rule.condition
-            if not condition:
-                return False, {}
-            
-            # Get time window
-            time_window_seconds = rule.get_time_window_seconds()
-            since_time = datetime.utcnow() - timedelta(seconds=time_window_seconds)
-            
-            # Build base query
-            query = select(Event).where(
-                and_(
-                    Event.tenant_id == tenant_id,
-                    Event.event_timestamp >= since_time,
-                    not Event.is_deleted
-                )
+            recent_counts = await self._get_recent_alerts_counts(
+                session, [rule.id for rule in rules], tenant_id, now
             )
-            
-            # Apply event type filter
-            if rule.event_type:
-                query = query.where(Event.event_type == rule.event_type)
-            
-            # Execute query
-            result = await session.execute(query)
-            events = list(result.scalars().all())
-            
-            # Evaluate condition based on type
-            condition_type = condition.get("type", "count")
-            
-            if condition_type == "count":
-                return self._evaluate_count_condition(events, condition, rule)
-            elif condition_type == "threshold":
-                return self._evaluate_threshold_condition(events, condition, rule)
-            elif condition_type == "pattern":
-                return self._evaluate_pattern_condition(events, condition, rule)
-            else:
-                logger.warning(f"Unknown condition type: {condition_type}")
-                return False, {}
-                
         except Exception as e:
-            logger.error(f"Error evaluating condition: {e}")
-            return False, {}
-    
-    def _evaluate_count_condition(
-        self, 
-        events: List[Event], 
-        condition: Dict[str, Any], 
-        rule: AlertRule
-    ) -> Tuple[bool, Dict[str, Any]]:
-        """Evaluate count-based condition."""
-        try:
-            # Get count criteria
-            min_count = condition.get("min_count", 0)
-            max_count = condition.get("max_count", float('inf'))
-            
-            # Count events
-            event_count = len(events)
-            
-            # Check if count is within bounds
-            should_trigger = event_count >= min_count and event_count <= max_count
-            
-            trigger_data = {
-                "condition_type": "count",
-                "event_count": event_count,
-                "min_count": min_count,
-                "max_count": max_count,
-                "time_window": rule.time_window,
-                "events_sample": [
-                    {
-                        "id": str(event.id),
-                        "event_type": event.event_type,
-                        "timestamp": event.event_timestamp.isoformat(),
-                        "source": event.source
-                    }
-                    for event in events[:5]  # Sample first 5 events
-                ]
-            }
-            
-            return should_trigger, trigger_data
+            logger.error("Error getting recent alerts counts: %s", e)
+            recent_counts = {}
+        
+        # Group the rules under their rate limit by the window of events they read
+        groups: Dict[Tuple[int, Optional[str]], List[AlertRule]] = {}
+        for rule in rules:
+            recent_alerts_count = recent_counts.get(rule.id, 0)
+            if not rule.within_rate_limit(recent_alerts_count):
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Rule %s rate limited (%s recent alerts)", rule.name, recent_alerts_count)
+                continue
+            key = (rule.get_time_window_seconds(), rule.event_type)
+            groups.setdefault(key, []).append(rule)
+        
+        window_starts = {
+            seconds: now - timedelta(seconds=seconds)
+            for seconds in {seconds for seconds, _ in groups}
+        }
+        since_times = {key: window_starts[key[0]] for key in groups}
+        window_aggregates = await self._fetch_window_aggregates(
+            session, groups, since_times, tenant_id
+        )
+        
+        # Alerts and rule updates go through the caller's session, in order
+        triggered_alerts = []
+        evaluated_ids: List[UUID] = []
+        triggered_ids: List[UUID] = []
+        for key, group in groups.items():
+            aggregates = window_aggregates[key]
+            if aggregates is None:
+                continue
             
-        except Exception as e:
-            logger.error(f"Error evaluating count condition: {e}")
-            return False, {}
+            since_time = since_times[key]
+            for rule in group:
+                alert = await self._evaluate_against(session, rule, tenant_id, since_time, aggregates, now)
+                evaluated_ids.append(rule.id)
+                if alert:
+                    triggered_alerts.append(alert)
+                    triggered_ids.append(rule.id)
+        
+        await self._record_evaluations(session, evaluated_ids, triggered_ids, now)
+        return triggered_alerts
     
-    def _evaluate_threshold_condition(
-        self, 
-        events: List[Event], 
-        condition: Dict[str, Any], 
-        rule: AlertRule
-    ) -> Tuple[bool, Dict[str, Any]]:
-        """Evaluate threshold-based condition."""
+    async def _record_evaluations(
+        self,
+        session: AsyncSession,
+        evaluated_ids: List[UUID],
+        triggered_ids: List[UUID],
+        now: datetime
+    ) -> None:
+        """Stamp evaluated rules, and count triggers, in a single UPDATE.
+        
+        Bulk counterpart of AlertRule.record_evaluation/record_trigger; the
+        loaded rule objects are not refreshed. Stamps use the pass's ``now``,
+        matching its window bounds and alert triggered_at. updated_at is kept
+        as is, so it (and the rule's ETag) only changes when the rule is edited.
+        """
+        if not evaluated_ids:
+            return
+        
+        # Assigning updated_at suppresses its onupdate=now()
+        values = {"last_evaluated_at": now, "updated_at": AlertRule.updated_at}
+        if triggered_ids:
+            triggered = AlertRule.id.in_(triggered_ids)
+            values["last_triggered_at"] = case((triggered, now), else_=AlertRule.last_triggered_at)
+            values["total_triggers"] = AlertRule.total_triggers + case((triggered, 1), else_=0)
+        
+        query = (
+            update(AlertRule)
+            .where(AlertRule.id.in_(evaluated_ids))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        
         try:
-            if not rule.threshold_value or not rule.threshold_operator:
-                return False, {}
-            
-            # Get threshold criteria
-            threshold_value = rule.threshold_value
-            operator = rule.threshold_operator
-            metric_field = condition.get("metric_field", "status_code")
-            
-            # Calculate metric value
-            metric_value = self._calculate_metric_value(events, metric_field)
-            
-            # Compare with threshold
-            should_trigger = self._compare_values(metric_value, operator, threshold_value)
-            
-            trigger_data = {
-                "condition_type": "threshold",
-                "metric_field": metric_field,
-                "metric_value": metric_value,
-                "threshold_value": threshold_value,
-                "operator": operator,
-                "time_window": rule.time_window,
-                "events_count": len(events)
-            }
-            
-            return should_trigger, trigger_data
-            
+            await session.execute(query)
         except Exception as e:
-            logger.error(f"Error evaluating threshold condition: {e}")
-            return False, {}
+            logger.error("Error recording evaluation of %s rules: %s", len(evaluated_ids), e)
     
-    def _evaluate_pattern_condition(
-        self, 
-        events: List[Event], 
-        condition: Dict[str, Any], 
-        rule: AlertRule
-    ) -> Tuple[bool, Dict[str, Any]]:
-        """Evaluate pattern-based condition."""
+    async def _fetch_window_aggregates(
+        self,
+        session: AsyncSession,
+        groups: Dict[Tuple[int, Optional[str]], List[AlertRule]],
+        since_times: Dict[Tuple[int, Optional[str]], datetime],
+        tenant_id: UUID
+    ) -> Dict[Tuple[int, Optional[str]], Optional[EventAggregates]]:
+        """Aggregate each rule group's window, concurrently when there are several.
+        
+        An AsyncSession cannot run statements concurrently, so with more than
+        one window every query takes its own pooled session, at most
+        MAX_CONCURRENT_WINDOW_QUERIES at a time. A failed window maps to None;
+        a window only unbounded count rules read is not queried at all.
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_WINDOW_QUERIES)
+        
+        async def fetch(key: Tuple[int, Optional[str]]) -> Optional[EventAggregates]:
+            rule, since_time = groups[key][0], since_times[key]
+            if all(_is_unbounded_count_condition(member.condition) for member in groups[key]):
+                return EventAggregates(UNCOUNTED_EVENTS, None, None, None)
+            count_only = all(_is_count_condition(member.condition) for member in groups[key])
+            percentiles = tuple(sorted({
+                fraction
+                for fraction in map(_condition_percentile, (member.condition for member in groups[key]))
+                if fraction is not None
+            }))
+            try:
+                if len(groups) == 1:
+                    return await self._fetch_event_aggregates(
+                        session, rule, since_time, tenant_id, count_only, percentiles
+                    )
+                async with semaphore, AsyncSessionLocal() as own_session:
+                    return await self._fetch_event_aggregates(
+                        own_session, rule, since_time, tenant_id, count_only, percentiles
+                    )
+            except Exception as e:
+                logger.error("Error aggregating events for %s rules: %s", len(groups[key]), e)
+                return None
+        
+        results = await asyncio.gather(*(fetch(key) for key in groups))
+        return dict(zip(groups, results))
+    
+    def _is_armed(self, rule: AlertRule) -> bool:
+        """Check whether a rule is active and out of cooldown."""
         try:
-            pattern = condition.get("pattern", {})
-            pattern_type = pattern.get("type", "error_rate")
-            
-            if pattern_type == "error_rate":
-                return self._evaluate_error_rate_pattern(events, pattern)
-            elif pattern_type == "response_time":
-                return self._evaluate_response_time_pattern(events, pattern)
-            else:
-                logger.warning(f"Unknown pattern type: {pattern_type}")
-                return False, {}
-                
+            if not rule.is_armed():
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Rule %s cannot trigger (inactive/cooldown)", rule.name)
+                return False
         except Exception as e:
-            logger.error(f"Error evaluating pattern condition: {e}")
-            return False, {}
+            logger.error("Error evaluating rule %s: %s", rule.name, e)
+            return False
+        return True
     
-    def _evaluate_error_rate_pattern(
-        self, 
-        events: List[Event], 
-        pattern: Dict[str, Any]
-    ) -> Tuple[bool, Dict[str, Any]]:
-        """Evaluate error rate pattern."""
-        if not events:
-            return False, {}
-        
-        # Count error events (status code >= 400)
-        error_events = [e for e in events if e.status_code and e.status_code >= 400]
-        error_rate = len(error_events) / len(events)
-        
-        # Get threshold
-        max_error_rate = pattern.get("max_error_rate", 0.1)  # Default 10%
-        
-        should_trigger = error_rate > max_error_rate
-        
-        trigger_data = {
-            "condition_type": "pattern",
-            "pattern_type": "error_rate",
-            "error_rate": error_rate,
-            "max_error_rate": max_error_rate,
-            "total_events": len(events),
-            "error_events": len(error_events)
-        }
+    @catch_and_log("Error evaluating alert rule against its window")
+    async def _evaluate_against(
+        self,
+        session: AsyncSession,
+        rule: AlertRule,
+        tenant_id: UUID,
+        since_time: datetime,
+        aggregates: EventAggregates,
+        now: datetime
+    ) -> Optional[Alert]:
+        """Evaluate a rule's condition on its window's aggregates and raise the alert.
+        
+        This is the per-rule error boundary: a failing rule is logged and
+        skipped, and the rest of the batch still runs.
+        """
+        # Conditions that failed to compile never trigger
+        evaluator = self._get_compiled_condition(rule)
+        if evaluator is None:
+            should_trigger, trigger_data = False, {}
+        else:
+            should_trigger, trigger_data = evaluator(aggregates, rule)
         
-        return should_trigger, trigger_data
+        if not should_trigger:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Rule %s condition not met", rule.name)
+            return None
+        
+        # Rows are only read for the sample of a rule that actually triggers
+        await self._attach_samples(session, rule, since_time, tenant_id, trigger_data)
+        
+        # Create alert
+        alert = await self._create_alert(session, rule, trigger_data, tenant_id, now)
+        
+        # Notifications wait for the caller's commit (publish_committed_alerts)
+        session.info.setdefault(PENDING_ALERTS_INFO_KEY, []).append((alert, rule))
+        
+        logger.info("Alert rule %s triggered alert %s", rule.name, alert.id)
+        return alert
     
-    def _evaluate_response_time_pattern(
-        self, 
-        events: List[Event], 
-        pattern: Dict[str, Any]
-    ) -> Tuple[bool, Dict[str, Any]]:
-        """Evaluate response time pattern."""
-        if not events:
-            return False, {}
-        
-        # Get response times
-        response_times = [e.duration_ms for e in events if e.duration_ms is not None]
-        if not response_times:
-            return False, {}
-        
-        # Calculate average response time
-        avg_response_time = sum(response_times) / len(response_times)
-        
-        # Get threshold
-        max_avg_response_time = pattern.get("max_avg_response_time", 1000)  # Default 1s
-        
-        should_trigger = avg_response_time > max_avg_response_time
-        
-        trigger_data = {
-            "condition_type": "pattern",
-            "pattern_type": "response_time",
-            "avg_response_time": avg_response_time,
-            "max_avg_response_time": max_avg_response_time,
-            "total_events": len(events),
-            "response_time_sample": response_times[:10]  # Sample first 10
-        }
+    @staticmethod
+    def _event_window_filter(rule: AlertRule, since_time: datetime, tenant_id: UUID):
+        """Build the WHERE clause selecting a rule's window of events."""
+        criteria = [
+            Event.tenant_id == tenant_id,
+            Event.event_timestamp >= since_time,
+            Event.is_deleted == False
+        ]
+        
+        # Apply event type filter
+        if rule.event_type:
+            criteria.append(Event.event_type == rule.event_type)
+        
+        return and_(*criteria)
+    
+    async def _fetch_event_aggregates(
+        self,
+        session: AsyncSession,
+        rule: AlertRule,
+        since_time: datetime,
+        tenant_id: UUID,
+        count_only: bool = False,
+        percentiles: Tuple[float, ...] = ()
+    ) -> EventAggregates:
+        """Count and average a rule's window of events in one aggregate query.
+        
+        With count_only, the count is summed from the per-minute rollup
+        instead of scanning events; only the window's partial first minute
+        is read from events. Each requested percentile (a fraction) adds a
+        percentile_cont over duration_ms.
+        """
+        if count_only:
+            total = await event_crud.count_from_rollup(
+                session, tenant_id=tenant_id, since=since_time, event_type=rule.event_type
+            )
+            return EventAggregates(total, None, None, None)
+        
+        window_filter = self._event_window_filter(rule, since_time, tenant_id)
+        columns = EVENT_AGGREGATE_COLUMNS + tuple(
+            func.percentile_cont(fraction).within_group(Event.duration_ms)
+            for fraction in percentiles
+        )
+        result = await session.execute(select(*columns).where(window_filter))
+        return EventAggregates.from_row(result.one(), percentiles)
+    
+    async def _attach_samples(
+        self,
+        session: AsyncSession,
+        rule: AlertRule,
+        since_time: datetime,
+        tenant_id: UUID,
+        trigger_data: Dict[str, Any]
+    ) -> None:
+        """Add the newest events (count) or durations (response time) to trigger_data."""
+        window_filter = self._event_window_filter(rule, since_time, tenant_id)
+        
+        if trigger_data.get("condition_type") == "count":
+            query = (
+                select(*EVENT_SAMPLE_COLUMNS)
+                .where(window_filter)
+                .order_by(Event.event_timestamp.desc())
+                .limit(EVENTS_SAMPLE_SIZE)
+            )
+            result = await session.execute(query)
+            # UUIDs and datetimes are stored as-is; the engine's orjson
+            # serializer renders them
+            trigger_data["events_sample"] = [
+                {
+                    "id": public_id,
+                    "event_type": event_type,
+                    "timestamp": event_timestamp,
+                    "source": source
+                }
+                for public_id, event_type, event_timestamp, source in result.tuples()
+            ]
         
-        return should_trigger, trigger_data
+        elif trigger_data.get("pattern_type") in ("response_time", "response_time_percentile"):
+            query = (
+                select(Event.duration_ms)
+                .where(window_filter, Event.duration_ms.isnot(None))
+                .order_by(Event.event_timestamp.desc())
+                .limit(RESPONSE_TIME_SAMPLE_SIZE)
+            )
+            result = await session.execute(query)
+            trigger_data["response_time_sample"] = list(result.scalars())
     
-    def _calculate_metric_value(self, events: List[Event], metric_field: str) -> float:
-        """Calculate metric value from events."""
-        if not events:
-            return 0.0
+    def _get_compiled_condition(self, rule: AlertRule) -> Optional[ConditionEvaluator]:
+        """Get the compiled evaluator for a rule, compiling it once per condition.
         
-        if metric_field == "status_code":
-            # Return average status code
-            status_codes = [e.status_code for e in events if e.status_code is not None]
-            return sum(status_codes) / len(status_codes) if status_codes else 0.0
+        Keyed on the condition itself rather than updated_at, so unrelated
+        writes to the rule do not recompile it.
+        """
+        key = (rule.id, orjson.dumps(rule.condition, option=orjson.OPT_SORT_KEYS))
         
-        elif metric_field == "duration_ms":
-            # Return average response time
-            durations = [e.duration_ms for e in events if e.duration_ms is not None]
-            return sum(durations) / len(durations) if durations else 0.0
+        try:
+            self._compiled_conditions.move_to_end(key)
+            return self._compiled_conditions[key]
+        except KeyError:
+            pass
         
-        elif metric_field == "count":
-            # Return event count
-            return len(events)
+        try:
+            evaluator = compile_condition(rule.condition)
+        except ValueError as e:
+            logger.warning("Invalid condition for rule %s: %s", rule.name, e)
+            evaluator = None
         
-        else:
-            logger.warning(f"Unknown metric field: {metric_field}")
-            return 0.0
-    
-    def _compare_values(self, value: float, operator: str, threshold: float) -> bool:
-        """Compare value with threshold using operator."""
-        if operator == ">":
-            return value > threshold
-        elif operator == ">=":
-            return value >= threshold
-        elif operator == "<":
-            return value < threshold
-        elif operator == "<=":
-            return value <= threshold
-        elif operator == "==":
-            return abs(value - threshold) < 0.001  # Float comparison
-        elif operator == "!=":
-            return abs(value - threshold) >= 0.001
-        else:
-            logger.warning(f"Unknown operator: {operator}")
-            return False
+        self._compiled_conditions[key] = evaluator
+        if len(self._compiled_conditions) > MAX_COMPILED_CONDITIONS:
+            self._compiled_conditions.popitem(last=False)
+        return evaluator
     
-    async def _get_recent_alerts_count(
+    async def _get_recent_alerts_counts(
         self, 
         session: AsyncSession, 
-        rule_id: UUID, 
-        tenant_id: UUID
-    ) -> int:
-        """Get count of recent alerts for this rule."""
-        try:
-            # Count alerts in the last hour
-            since_time = datetime.utcnow() - timedelta(hours=1)
-            
-            query = select(func.count(Alert.id)).where(
+        rule_ids: List[UUID], 
+        tenant_id: UUID,
+        now: datetime
+    ) -> Dict[UUID, int]:
+        """Get counts of recent alerts per rule.
+        
+        Counts come from the Redis windows; rules without one have their
+        last hour of alerts read in one query, and their windows seeded.
+        """
+        counts = await recent_alert_counts.get_many(rule_ids, now)
+        missing = [rule_id for rule_id in rule_ids if rule_id not in counts]
+        if not missing:
+            return counts
+        
+        # Alerts in the last hour
+        since_time = now - timedelta(seconds=RECENT_ALERTS_WINDOW)
+        
+        query = (
+            select(Alert.alert_rule_id, Alert.id, Alert.triggered_at)
+            .where(
                 and_(
-                    Alert.alert_rule_id == rule_id,
+                    Alert.alert_rule_id.in_(missing),
                     Alert.tenant_id == tenant_id,
                     Alert.triggered_at >= since_time
                 )
             )
-            
-            result = await session.execute(query)
-            return result.scalar() or 0
-            
-        except Exception as e:
-            logger.error(f"Error getting recent alerts count: {e}")
-            return 0
+        )
+        
+        result = await session.execute(query)
+        recent_alerts: Dict[UUID, List[Tuple[UUID, datetime]]] = {rule_id: [] for rule_id in missing}
+        for rule_id, alert_id, triggered_at in result.tuples():
+            recent_alerts[rule_id].append((alert_id, triggered_at))
+        await recent_alert_counts.seed(recent_alerts)
+        
+        counts.update((rule_id, len(rule_alerts)) for rule_id, rule_alerts in recent_alerts.items())
+        return counts
     
     async def _create_alert(
         self, 
         session: AsyncSession, 
         rule: AlertRule, 
         trigger_data: Dict[str, Any], 
-        tenant_id: UUID
+        tenant_id: UUID,
+        now: datetime
     ) -> Alert:
         """Create a new alert."""
-        try:
-            # Generate alert title and message
-            title = self._generate_alert_title(rule, trigger_data)
-            message = self._generate_alert_message(rule, trigger_data)
-            
-            # Create alert
-            alert = Alert(
-                title=title,
-                message=message,
-                severity=rule.severity,
-                status=AlertStatus.ACTIVE,
-                triggered_at=datetime.utcnow(),
-                trigger_data=trigger_data,
-                alert_metadata={
-                    "rule_name": rule.name,
-                    "rule_description": rule.description,
-                    "evaluation_time": datetime.utcnow().isoformat()
-                },
-                tenant_id=tenant_id,
-                alert_rule_id=rule.id
-            )
-            
-            # Save to database
-            session.add(alert)
-            await session.flush()
-            
-            logger.info(f"Created alert {alert.id} for rule {rule.name}")
-            return alert
-            
-        except Exception as e:
-            logger.error(f"Error creating alert: {e}")
-            raise
-    
-    def _generate_alert_title(self, rule: AlertRule, trigger_data: Dict[str, Any]) -> str:
-        """Generate alert title."""
-        condition_type = trigger_data.get("condition_type", "unknown")
-        
-        if condition_type == "count":
-            count = trigger_data.get("event_count", 0)
-            return f"High Event Count Alert: {count} events in {rule.time_window}"
+        # Generate alert title and message
+        title = self._generate_alert_title(rule, trigger_data)
+        message = self._generate_alert_message(rule, trigger_data)
         
-        elif condition_type == "threshold":
-            metric = trigger_data.get("metric_field", "unknown")
-            value = trigger_data.get("metric_value", 0)
-            return f"Threshold Exceeded: {metric} = {value}"
+        # Create alert
+        alert = Alert(
+            title=title,
+            message=message,
+            severity=rule.severity,
+            status=AlertStatus.ACTIVE,
+            triggered_at=now,
+            trigger_data=trigger_data,
+            alert_metadata={
+                "rule_name": rule.name,
+                "rule_description": rule.description,
+                "evaluation_time": now
+            },
+            tenant_id=tenant_id,
+            alert_rule_id=rule.id
+        )
         
-        elif condition_type == "pattern":
-            pattern_type = trigger_data.get("pattern_type", "unknown")
-            if pattern_type == "error_rate":
-                rate = trigger_data.get("error_rate", 0)
-                return f"High Error Rate: {rate:.1%} in {rule.time_window}"
-            elif pattern_type == "response_time":
-                time = trigger_data.get("avg_response_time", 0)
-                return f"High Response Time: {time:.0f}ms average"
+        # Save to database
+        session.add(alert)
+        await session.flush()
         
-        return f"Alert: {rule.name}"
+        logger.info("Created alert %s for rule %s", alert.id, rule.name)
+        return alert
+    
+    def _generate_alert_title(self, rule: AlertRule, trigger_data: Dict[str, Any]) -> str:
+        """Generate alert title."""
+        template = ALERT_TITLE_TEMPLATES.get(_template_key(trigger_data), DEFAULT_ALERT_TITLE)
+        return template.format_map(_template_values(rule, trigger_data))
     
     def _generate_alert_message(self, rule: AlertRule, trigger_data: Dict[str, Any]) -> str:
         """Generate alert message."""
-        condition_type = trigger_data.get("condition_type", "unknown")
-        
-        base_message = f"Alert rule '{rule.name}' has been triggered.\n\n"
-        
-        if condition_type == "count":
-            count = trigger_data.get("event_count", 0)
-            min_count = trigger_data.get("min_count", 0)
-            max_count = trigger_data.get("max_count", "unlimited")
-            base_message += f"Event count: {count}\n"
-            base_message += f"Threshold: {min_count} - {max_count}\n"
-            base_message += f"Time window: {rule.time_window}"
-        
-        elif condition_type == "threshold":
-            metric = trigger_data.get("metric_field", "unknown")
-            value = trigger_data.get("metric_value", 0)
-            threshold = trigger_data.get("threshold_value", 0)
-            operator = trigger_data.get("operator", "unknown")
-            base_message += f"Metric: {metric}\n"
-            base_message += f"Current value: {value}\n"
-            base_message += f"Threshold: {operator} {threshold}"
-        
-        elif condition_type == "pattern":
-            pattern_type = trigger_data.get("pattern_type", "unknown")
-            if pattern_type == "error_rate":
-                rate = trigger_data.get("error_rate", 0)
-                max_rate = trigger_data.get("max_error_rate", 0)
-                base_message += f"Error rate: {rate:.1%}\n"
-                base_message += f"Maximum allowed: {max_rate:.1%}"
-            elif pattern_type == "response_time":
-                time = trigger_data.get("avg_response_time", 0)
-                max_time = trigger_data.get("max_avg_response_time", 0)
-                base_message += f"Average response time: {time:.0f}ms\n"
-                base_message += f"Maximum allowed: {max_time:.0f}ms"
+        values = _template_values(rule, trigger_data)
+        
+        base_message = ALERT_MESSAGE_HEADER.format_map(values)
+        template = ALERT_MESSAGE_TEMPLATES.get(_template_key(trigger_data))
+        if template:
+            base_message += template.format_map(values)
         
         if rule.description:
             base_message += f"\n\nRule description: {rule.description}"
         
         return base_message
     
-    async def _send_notifications(self, alert: Alert, rule: AlertRule) -> None:
-        """Send notifications for the alert."""
+    async def publish_committed_alerts(self, session: AsyncSession) -> None:
+        """Send notifications for the alerts evaluated on a session.
+        
+        Call once session.commit() has succeeded, so alerts from an
+        evaluation that rolled back are never announced, nor counted
+        against their rule's rate limit.
+        """
+        for alert, rule in session.info.pop(PENDING_ALERTS_INFO_KEY, ()):
+            await recent_alert_counts.record(rule.id, alert.id, alert.triggered_at)
+            self._send_notifications(alert, rule)
+    
+    def _send_notifications(self, alert: Alert, rule: AlertRule) -> None:
+        """Hand the alert's notifications off to a background task.
+        
+        Evaluation does not wait on outbound HTTP; delivery is best effort.
+        """
         try:
-            await self.notification_service.send_alert_notifications(alert, rule)
+            self.notification_service.dispatch_alert_notifications(alert, rule)
         except Exception as e:
-            logger.error(f"Error sending notifications for alert {alert.id}: {e}")
+            logger.error("Error sending notifications for alert %s: %s", alert.id, e)
 
 
 class AlertManagementService:
@@ -489,28 +932,60 @@ class AlertManagementService:
         """Evaluate all active alert rules for a tenant."""
         try:
             # Get active rules
-            rules = await alert_rule_crud.get_active_rules(session, tenant_id)
+            rules = await alert_rule_crud.get_active_rules(session, tenant_id=tenant_id)
             
-            logger.info(f"Evaluating {len(rules)} active rules for tenant {tenant_id}")
+            logger.info("Evaluating %s active rules for tenant %s", len(rules), tenant_id)
             
-            # Evaluate each rule
-            triggered_alerts = []
-            for rule in rules:
-                try:
-                    alert = await self.rule_engine.evaluate_rule(session, rule, tenant_id)
-                    if alert:
-                        triggered_alerts.append(alert)
-                except Exception as e:
-                    logger.error(f"Error evaluating rule {rule.name}: {e}")
-                    continue
+            triggered_alerts = await self.rule_engine.evaluate_rules(session, rules, tenant_id)
             
-            logger.info(f"Triggered {len(triggered_alerts)} alerts for tenant {tenant_id}")
+            logger.info("Triggered %s alerts for tenant %s", len(triggered_alerts), tenant_id)
             return triggered_alerts
             
         except Exception as e:
-            logger.error(f"Error evaluating all rules: {e}")
+            logger.error("Error evaluating all rules: %s", e)
             return []
     
+    async def run_evaluation_job(
+        self,
+        session_factory: async_sessionmaker,
+        tenant_id: UUID,
+        job_id: str
+    ) -> None:
+        """Evaluate all rules for a tenant outside the request and store the outcome."""
+        try:
+            async with session_factory() as session:
+                triggered_alerts = await self.evaluate_all_rules(session, tenant_id)
+                await session.commit()
+                await self.rule_engine.publish_committed_alerts(session)
+        except Exception as e:
+            logger.error("Evaluation job %s failed: %s", job_id, e)
+            await evaluation_jobs.save(tenant_id, job_id, {
+                "job_id": job_id,
+                "status": "failed",
+                "completed_at": datetime.utcnow()
+            })
+            return
+        
+        if triggered_alerts:
+            await response_cache.invalidate(tenant_id, "alerts", "rules", "stats")
+        
+        await evaluation_jobs.save(tenant_id, job_id, {
+            "job_id": job_id,
+            "status": "completed",
+            "completed_at": datetime.utcnow(),
+            "alerts_triggered": len(triggered_alerts),
+            "alerts": [
+                {
+                    "id": alert.id,
+                    "title": alert.title,
+                    "severity": alert.severity,
+                    "triggered_at": alert.triggered_at
+                }
+                for alert in triggered_alerts
+            ]
+        })
+        logger.info("Evaluation job %s completed: %s alerts triggered", job_id, len(triggered_alerts))
+    
     async def get_active_alerts(
         self, 
         session: AsyncSession, 
@@ -519,9 +994,9 @@ class AlertManagementService:
     ) -> List[Alert]:
         """Get active alerts for a tenant."""
         try:
-            return await alert_crud.get_active_alerts(session, tenant_id, limit)
+            return await alert_crud.get_active_alerts(session, tenant_id=tenant_id, limit=limit)
         except Exception as e:
-            logger.error(f"Error getting active alerts: {e}")
+            logger.error("Error getting active alerts: %s", e)
             return []
     
     async def resolve_alert(
@@ -541,11 +1016,11 @@ class AlertManagementService:
             alert.resolve(resolved_by, note)
             await session.flush()
             
-            logger.info(f"Alert {alert_id} resolved by {resolved_by}")
+            logger.info("Alert %s resolved by %s", alert_id, resolved_by)
             return alert
             
         except Exception as e:
-            logger.error(f"Error resolving alert {alert_id}: {e}")
+            logger.error("Error resolving alert %s: %s", alert_id, e)
             return None
     
     async def create_alert_rule(
@@ -564,11 +1039,11 @@ class AlertManagementService:
             session.add(rule)
             await session.flush()
             
-            logger.info(f"Created alert rule {rule.id}: {rule.name}")
+            logger.info("Created alert rule %s: %s", rule.id, rule.name)
             return rule
             
         except Exception as e:
-            logger.error(f"Error creating alert rule: {e}")
+            logger.error("Error creating alert rule: %s", e)
             return None
     
     async def update_alert_rule(
@@ -591,11 +1066,11 @@ class AlertManagementService:
             
             await session.flush()
             
-            logger.info(f"Updated alert rule {rule_id}")
+            logger.info("Updated alert rule %s", rule_id)
             return rule
             
         except Exception as e:
-            logger.error(f"Error updating alert rule {rule_id}: {e}")
+            logger.error("Error updating alert rule %s: %s", rule_id, e)
             return None
     
     async def delete_alert_rule(
@@ -614,9 +1089,21 @@ class AlertManagementService:
             rule.is_deleted = True
             await session.flush()
             
-            logger.info(f"Deleted alert rule {rule_id}")
+            logger.info("Deleted alert rule %s", rule_id)
             return True
             
         except Exception as e:
-            logger.error(f"Error deleting alert rule {rule_id}: {e}")
+            logger.error("Error deleting alert rule %s: %s", rule_id, e)
             return False
+
+
+@lru_cache(maxsize=1)
+def get_rule_engine() -> AlertRuleEngine:
+    """Get the per-process alert rule engine, created on first use."""
+    return AlertRuleEngine(get_notification_service())
+
+
+@lru_cache(maxsize=1)
+def get_alert_service() -> AlertManagementService:
+    """Get the per-process alert management service, created on first use."""
+    return AlertManagementService(get_rule_engine())
@@ -4,14 +4,18 @@ import secrets
 from datetime import datetime, timedelta
 from typing import List, Optional
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
-from fastapi.security import HTTPBearer
+from fastapi.responses import ORJSONResponse, Response
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.auth import (
     get_current_user, get_current_active_user, get_current_tenant,
-    require_permissions, require_roles
+    require_permissions, require_roles, auth_manager, tenant_auth_manager
 )
+from core.config import settings
 from core.database import get_async_session
 from core.logging import get_logger
 from apps.auth.schemas import (
@@ -21,17 +25,38 @@ from apps.auth.schemas import (
     TenantProfileResponse, TenantProfileUpdateRequest, UserListResponse
 )
 from apps.auth.services import auth_service, user_service, tenant_service
+from apps.storage.crud import user_crud
 from apps.storage.models.user import User
 from apps.storage.models.tenant import Tenant
 
 logger = get_logger(__name__)
 
 # Create router
-router = APIRouter(prefix="/auth", tags=["Authentication"])
+router = APIRouter(prefix="/auth", tags=["Authentication"], default_response_class=ORJSONResponse)
 
 # Security
 security = HTTPBearer()
 
+# Role dependencies, built once and shared by the routes that use them
+require_admin_or_owner = require_roles("admin", "owner")
+
+# Token lifetimes reported to clients, in seconds
+ACCESS_TOKEN_EXPIRES_IN = settings.access_token_expire_minutes * 60
+REFRESH_TOKEN_EXPIRES_IN = settings.refresh_token_expire_days * 24 * 60 * 60
+
+# User list rows are selected as plain column projections
+USER_PROFILE_KEYS = tuple(UserProfileResponse.model_fields)
+
+# Validates a whole page of users in one call into pydantic-core
+_USER_LIST_ADAPTER = TypeAdapter(List[UserProfileResponse])
+
+# Health check body without its closing brace; each probe only appends the timestamp
+HEALTH_BODY_PREFIX = orjson.dumps({
+    "status": "healthy",
+    "service": "authentication",
+    "version": "1.0.0"
+})[:-1]
+
 
 @router.post("/login", response_model=TokenResponse)
 async def login(
@@ -46,15 +71,11 @@ async def login(
             session, login_data, request
         )
         
-        # Calculate expiration times
-        expires_in = settings.access_token_expire_minutes * 60  # Convert to seconds
-        refresh_expires_in = settings.refresh_token_expire_days * 24 * 60 * 60  # Convert to seconds
-        
         return TokenResponse(
             access_token=access_token,
             refresh_token=refresh_token,
-            expires_in=expires_in,
-            refresh_expires_in=refresh_expires_in,
+            expires_in=ACCESS_TOKEN_EXPIRES_IN,
+            refresh_expires_in=REFRESH_TOKEN_EXPIRES_IN,
             user_id=str(user.id),
             tenant_id=str(user.tenant_id),
             email=user.email,
@@ -78,29 +99,21 @@ async def refresh_token(
 ):
     """Refresh access token endpoint."""
     try:
-        # Refresh tokens
-        new_access_token, new_refresh_token = await auth_service.refresh_access_token(
+        # Refresh tokens; the user they were minted for comes back with them,
+        # so the new tokens need not be decoded again
+        user, new_access_token, new_refresh_token = await auth_service.refresh_access_token(
             session, refresh_data.refresh_token
         )
         
-        # Decode tokens to get user info
-        from core.auth import auth_manager
-        access_payload = auth_manager.verify_token(new_access_token)
-        refresh_payload = auth_manager.verify_token(new_refresh_token)
-        
-        # Calculate expiration times
-        expires_in = settings.access_token_expire_minutes * 60
-        refresh_expires_in = settings.refresh_token_expire_days * 24 * 60 * 60
-        
         return TokenResponse(
             access_token=new_access_token,
             refresh_token=new_refresh_token,
-            expires_in=expires_in,
-            refresh_expires_in=refresh_expires_in,
-            user_id=access_payload.get("sub"),
-            tenant_id=access_payload.get("tenant_id"),
-            email=access_payload.get("email"),
-            role=access_payload.get("role")
+            expires_in=ACCESS_TOKEN_EXPIRES_IN,
+            refresh_expires_in=REFRESH_TOKEN_EXPIRES_IN,
+            user_id=str(user.id),
+            tenant_id=str(user.tenant_id),
+            email=user.email,
+            role=user.role
         )
         
     except HTTPException:
@@ -120,12 +133,10 @@ async def register_tenant(
 ):
     """Register a new tenant with owner user."""
     try:
-        # Register tenant and create owner user
-        tenant, owner_user = await tenant_service.register_tenant(session, tenant_data)
-        
-        # Generate temporary password for owner
-        temp_password = secrets.token_urlsafe(12)
-        owner_user.set_password(temp_password)
+        # Register tenant and create owner user with a temporary password
+        tenant, owner_user, api_key, temp_password = await tenant_service.register_tenant(
+            session, tenant_data
+        )
         await session.commit()
         
         return {
@@ -134,7 +145,7 @@ async def register_tenant(
                 "id": str(tenant.id),
                 "name": tenant.name,
                 "slug": tenant.slug,
-                "api_key": tenant.api_key
+                "api_key": api_key
             },
             "owner_user": {
                 "id": str(owner_user.id),
@@ -161,7 +172,7 @@ async def register_tenant(
 @router.post("/register/user", response_model=UserProfileResponse)
 async def register_user(
     user_data: UserRegistrationRequest,
-    current_user: User = Depends(require_roles("admin", "owner")),
+    current_user: User = Depends(require_admin_or_owner),
     session: AsyncSession = Depends(get_async_session)
 ):
     """Register a new user in the current tenant."""
@@ -171,7 +182,7 @@ async def register_user(
             session, user_data, current_user.tenant_id, current_user
         )
         
-        return UserProfileResponse.from_orm(user)
+        return UserProfileResponse.model_validate(user)
         
     except HTTPException:
         raise
@@ -188,7 +199,7 @@ async def get_user_profile(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get current user profile."""
-    return UserProfileResponse.from_orm(current_user)
+    return UserProfileResponse.model_validate(current_user)
 
 
 @router.put("/profile", response_model=UserProfileResponse)
@@ -203,7 +214,7 @@ async def update_user_profile(
             session, current_user, profile_data
         )
         
-        return UserProfileResponse.from_orm(updated_user)
+        return UserProfileResponse.model_validate(updated_user)
         
     except HTTPException:
         raise
@@ -247,27 +258,22 @@ async def change_password(
 
 @router.get("/users", response_model=UserListResponse)
 async def get_users(
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor"),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
     search: Optional[str] = Query(None, description="Search term for email or name"),
-    current_user: User = Depends(require_roles("admin", "owner")),
+    current_user: User = Depends(require_admin_or_owner),
     session: AsyncSession = Depends(get_async_session)
 ):
     """Get users in the current tenant."""
     try:
-        users, total = await user_service.get_users_by_tenant(
-            session, current_user.tenant_id, skip, limit, search
+        users, next_cursor = await user_service.get_users_by_tenant(
+            session, current_user.tenant_id, USER_PROFILE_KEYS, limit, cursor, search
         )
         
-        # Calculate pagination
-        pages = (total + limit - 1) // limit
-        
         return UserListResponse(
-            users=[UserProfileResponse.from_orm(user) for user in users],
-            total=total,
-            page=(skip // limit) + 1,
+            users=_USER_LIST_ADAPTER.validate_python(users),
             size=limit,
-            pages=pages
+            next_cursor=next_cursor
         )
         
     except HTTPException:
@@ -300,6 +306,7 @@ async def update_tenant_profile(
         updated_tenant = await tenant_service.update_tenant_profile(
             session, current_tenant, profile_data
         )
+        tenant_auth_manager.invalidate_tenant(current_tenant.id)
         
         return TenantProfileResponse.from_orm(updated_tenant)
         
@@ -321,6 +328,7 @@ async def regenerate_api_key(
     """Regenerate tenant API key."""
     try:
         new_api_key = await tenant_service.regenerate_api_key(session, current_tenant)
+        tenant_auth_manager.invalidate_tenant(current_tenant.id)
         
         return {
             "message": "API key regenerated successfully",
@@ -340,14 +348,17 @@ async def regenerate_api_key(
 
 @router.post("/logout")
 async def logout(
-    current_user: User = Depends(get_current_active_user),
-    session: AsyncSession = Depends(get_async_session)
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    current_user: User = Depends(get_current_active_user)
 ):
-    """User logout endpoint."""
+    """User logout endpoint.
+    
+    Last activity needs no write here: resolving current_user has already
+    recorded it for this request.
+    """
     try:
-        # Update last activity
-        current_user.update_activity()
-        await session.commit()
+        # Stop serving this token's payload from the verification cache
+        auth_manager.invalidate_token(credentials.credentials)
         
         logger.info(f"User {current_user.email} logged out")
         
@@ -366,16 +377,12 @@ async def request_password_reset(
 ):
     """Request password reset."""
     try:
-        # Get tenant by slug
-        tenant = await tenant_crud.get_by_slug(session, slug=reset_data.tenant_slug)
-        if not tenant:
-            # Don't reveal if tenant exists
-            return {"message": "If the email exists, a reset link has been sent"}
-        
-        # Get user by email
-        user = await user_crud.get_by_email(session, tenant_id=tenant.id, email=reset_data.email)
+        # Get user by tenant slug and email
+        user = await user_crud.get_by_tenant_slug_and_email(
+            session, slug=reset_data.tenant_slug, email=reset_data.email
+        )
         if not user:
-            # Don't reveal if user exists
+            # Don't reveal if tenant or user exists
             return {"message": "If the email exists, a reset link has been sent"}
         
         # Generate reset token (implement email sending logic here)
@@ -417,9 +424,7 @@ async def confirm_password_reset(
 @router.get("/health")
 async def auth_health_check():
     """Health check endpoint for authentication service."""
-    return {
-        "status": "healthy",
-        "service": "authentication",
-        "timestamp": datetime.utcnow().isoformat(),
-        "version": "1.0.0"
-    }
+    return Response(
+        content=HEALTH_BODY_PREFIX + b',"timestamp":"' + datetime.utcnow().isoformat().encode() + b'"}',
+        media_type="application/json"
+    )
@@ -1,11 +1,20 @@
 """Authentication schemas for PulseStream."""
 
+import re
 from datetime import datetime
 from typing import Optional, List
+from uuid import UUID
 from pydantic import BaseModel, EmailStr, Field, validator
 
 from core.constants import TenantRole
 
+# Role names a user can be registered with. Plain values: TenantRole members
+# hash by name, so a str would never be found in a set of members
+VALID_ROLES = frozenset(role.value for role in TenantRole)
+
+# Tenant slugs: letters, digits, hyphens and underscores
+SLUG_PATTERN = re.compile(r"[A-Za-z0-9_-]+")
+
 
 class TokenResponse(BaseModel):
     """JWT token response schema."""
@@ -50,8 +59,8 @@ class UserRegistrationRequest(BaseModel):
     
     @validator('role')
     def validate_role(cls, v):
-        if v not in [TenantRole.VIEWER, TenantRole.ADMIN, TenantRole.OWNER]:
-            raise ValueError(f'Invalid role. Must be one of: {", ".join([TenantRole.VIEWER, TenantRole.ADMIN, TenantRole.OWNER])}')
+        if v not in VALID_ROLES:
+            raise ValueError(f'Invalid role. Must be one of: {", ".join(role.value for role in TenantRole)}')
         return v
 
 
@@ -66,7 +75,7 @@ class TenantRegistrationRequest(BaseModel):
     
     @validator('slug')
     def validate_slug(cls, v):
-        if not v.replace('-', '').replace('_', '').isalnum():
+        if not SLUG_PATTERN.fullmatch(v):
             raise ValueError('Slug must contain only letters, numbers, hyphens, and underscores')
         return v.lower()
 
@@ -114,11 +123,17 @@ class UserProfileResponse(BaseModel):
     is_verified: bool = Field(..., description="Email verification status")
     last_login_at: Optional[datetime] = Field(None, description="Last login timestamp")
     last_active_at: Optional[datetime] = Field(None, description="Last activity timestamp")
-    login_count: str = Field(..., description="Total login count")
+    login_count: int = Field(..., description="Total login count")
     api_access_enabled: bool = Field(..., description="API access status")
     created_at: datetime = Field(..., description="Account creation timestamp")
     updated_at: datetime = Field(..., description="Last update timestamp")
     
+    @validator('id', pre=True)
+    def stringify_id(cls, v):
+        if isinstance(v, UUID):
+            return str(v)
+        return v
+    
     class Config:
         from_attributes = True
 
@@ -136,7 +151,7 @@ class TenantProfileResponse(BaseModel):
     id: str = Field(..., description="Tenant ID")
     name: str = Field(..., description="Company/organization name")
     slug: str = Field(..., description="Tenant slug")
-    api_key: str = Field(..., description="API key (masked)")
+    api_key: str = Field(..., description="API key fingerprint (the key itself is not stored)")
     is_active: bool = Field(..., description="Tenant active status")
     subscription_tier: str = Field(..., description="Subscription tier")
     contact_email: Optional[str] = Field(None, description="Contact email")
@@ -149,6 +164,12 @@ class TenantProfileResponse(BaseModel):
     created_at: datetime = Field(..., description="Tenant creation timestamp")
     updated_at: datetime = Field(..., description="Last update timestamp")
     
+    @validator('api_key', pre=True)
+    def mask_api_key(cls, v):
+        if isinstance(v, bytes):
+            return f"sha256:{v.hex()[:12]}"
+        return v
+    
     class Config:
         from_attributes = True
 
@@ -165,10 +186,8 @@ class TenantProfileUpdateRequest(BaseModel):
 class UserListResponse(BaseModel):
     """User list response schema."""
     users: List[UserProfileResponse] = Field(..., description="List of users")
-    total: int = Field(..., description="Total number of users")
-    page: int = Field(..., description="Current page number")
     size: int = Field(..., description="Page size")
-    pages: int = Field(..., description="Total number of pages")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page (null on the last page)")
 
 
 class AuthenticationAuditLog(BaseModel):
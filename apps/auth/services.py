@@ -1,9 +1,11 @@
 """Authentication services for PulseStream."""
 
+import asyncio
+import base64
 import uuid
 import secrets
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Sequence, Tuple
 
 from fastapi import HTTPException, status, Request
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -24,6 +26,20 @@ from apps.auth.schemas import (
 logger = get_logger(__name__)
 
 
+def encode_user_cursor(created_at: datetime, user_id: uuid.UUID) -> str:
+    """Encode the position after a user as an opaque page cursor."""
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{user_id}".encode()).decode()
+
+
+def decode_user_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Decode a page cursor; raises ValueError if it is malformed."""
+    try:
+        created_at, user_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+    except ValueError as e:
+        raise ValueError(f"Malformed cursor: {e}")
+    return datetime.fromisoformat(created_at), uuid.UUID(user_id)
+
+
 class AuthenticationService:
     """Service for user authentication operations."""
     
@@ -119,8 +135,8 @@ class AuthenticationService:
         self, 
         session: AsyncSession, 
         refresh_token: str
-    ) -> Tuple[str, str]:
-        """Refresh access token using refresh token."""
+    ) -> Tuple[User, str, str]:
+        """Refresh access token using refresh token; returns the user with the new tokens."""
         try:
             # Verify refresh token
             payload = self.auth_manager.verify_token(refresh_token)
@@ -155,7 +171,7 @@ class AuthenticationService:
             new_access_token = await self._create_user_access_token(user, tenant)
             new_refresh_token = await self._create_user_refresh_token(user, tenant)
             
-            return new_access_token, new_refresh_token
+            return user, new_access_token, new_refresh_token
             
         except HTTPException:
             raise
@@ -244,15 +260,17 @@ class UserManagementService:
                         detail="Username already taken in this tenant"
                     )
             
-            # Hash password
-            hashed_password = self.auth_manager.get_password_hash(user_data.password)
+            # Hash password in a worker thread: bcrypt would stall the event loop
+            hashed_password = await asyncio.to_thread(
+                self.auth_manager.get_password_hash, user_data.password
+            )
             
             # Create user
             user = await user_crud.create_user(
                 session,
                 tenant_id=tenant_id,
                 email=user_data.email,
-                password=user_data.password,  # Use raw password, method will hash it
+                hashed_password=hashed_password,
                 full_name=user_data.full_name,
                 role=user_data.role
             )
@@ -358,21 +376,41 @@ class UserManagementService:
         self, 
         session: AsyncSession, 
         tenant_id: uuid.UUID,
-        skip: int = 0,
+        columns: Sequence[str],
         limit: int = 100,
+        cursor: Optional[str] = None,
         search: Optional[str] = None
-    ) -> Tuple[List[User], int]:
-        """Get users for a tenant with pagination and search."""
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get a page of a tenant's users, as dicts of the given columns.
+        
+        Returns the page and the cursor of the next one (None on the last
+        page). columns must include created_at and id, which the cursor is
+        built from.
+        """
         try:
-            users, total = await user_crud.get_multi_by_tenant(
-                session, 
+            after = decode_user_cursor(cursor) if cursor else None
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        
+        try:
+            rows = user_crud.stream_user_projections(
+                session,
                 tenant_id=tenant_id,
-                skip=skip,
+                columns=columns,
+                after=after,
                 limit=limit,
                 search=search
             )
+            users = [dict(row) async for row in rows]
+            
+            next_cursor = None
+            if len(users) == limit:
+                next_cursor = encode_user_cursor(users[-1]["created_at"], users[-1]["id"])
             
-            return users, total
+            return users, next_cursor
             
         except Exception as e:
             logger.error(f"Error getting users for tenant {tenant_id}: {e}")
@@ -389,8 +427,12 @@ class TenantManagementService:
         self, 
         session: AsyncSession, 
         tenant_data: TenantRegistrationRequest
-    ) -> Tuple[Tenant, User]:
-        """Register a new tenant with owner user."""
+    ) -> Tuple[Tenant, User, str, str]:
+        """Register a new tenant with owner user.
+        
+        Returns the plaintext API key and the owner's temporary password;
+        neither is stored, so this is the only time they can be shown.
+        """
         try:
             # Check if tenant slug already exists
             existing_tenant = await tenant_crud.get_by_slug(session, slug=tenant_data.slug)
@@ -425,7 +467,7 @@ class TenantManagementService:
             
             # Create owner user
             user_service = UserManagementService()
-            temp_password = secrets.token_urlsafe(12)  # Generate single temporary password
+            temp_password = secrets.token_urlsafe(12)  # Generate the owner's temporary password
             owner_user = await user_service.register_user(
                 session,
                 user_data=UserRegistrationRequest(
@@ -439,7 +481,7 @@ class TenantManagementService:
             )
             
             logger.info(f"Tenant {tenant_data.name} registered with slug {tenant_data.slug}")
-            return tenant, owner_user
+            return tenant, owner_user, api_key, temp_password
             
         except HTTPException:
             raise
@@ -512,7 +554,7 @@ class TenantManagementService:
             new_api_key = secrets.token_urlsafe(32)
             
             # Update tenant
-            tenant.api_key = new_api_key
+            tenant.set_api_key(new_api_key)
             tenant.updated_at = datetime.utcnow()
             
             await session.commit()
@@ -68,7 +68,7 @@ async def get_event_stream(
         stream_data = []
         for event in events:
             stream_data.append({
-                "id": str(event.id),
+                "id": str(event.public_id),
                 "event_type": event.event_type,
                 "timestamp": event.event_timestamp.isoformat(),
                 "status_code": event.status_code,
@@ -103,10 +103,10 @@ async def get_alert_summary(
         from apps.storage.crud import alert_crud, alert_rule_crud
         
         # Get active alerts
-        active_alerts = await alert_crud.get_active_alerts(session, current_tenant.id, limit=20)
+        active_alerts = await alert_crud.get_active_alerts(session, tenant_id=current_tenant.id, limit=20)
         
         # Get alert rules
-        alert_rules = await alert_rule_crud.get_active_rules(session, current_tenant.id)
+        alert_rules = await alert_rule_crud.get_active_rules(session, tenant_id=current_tenant.id)
         
         # Count by severity
         severity_counts = {}
@@ -115,7 +115,7 @@ async def get_alert_summary(
             severity_counts[severity] = severity_counts.get(severity, 0) + 1
         
         # Recent alert activity
-        recent_alerts = await alert_crud.get_recent_alerts(session, current_tenant.id, limit=10)
+        recent_alerts = await alert_crud.get_recent_alert_rows(session, tenant_id=current_tenant.id, limit=10)
         
         summary_data = {
             "tenant_id": str(current_tenant.id),
@@ -124,10 +124,10 @@ async def get_alert_summary(
             "total_rules": len(alert_rules),
             "recent_alerts": [
                 {
-                    "id": str(alert.id),
-                    "title": alert.title,
-                    "severity": alert.severity,
-                    "triggered_at": alert.triggered_at.isoformat() if alert.triggered_at else None
+                    "id": alert["id"],
+                    "title": alert["title"],
+                    "severity": alert["severity"],
+                    "triggered_at": alert["triggered_at"].isoformat() if alert["triggered_at"] else None
                 }
                 for alert in recent_alerts
             ]
@@ -322,7 +322,7 @@ class DashboardDataService:
             event_list = []
             for event in events:
                 event_dict = {
-                    "id": str(event.id),
+                    "id": str(event.public_id),
                     "event_type": event.event_type,
                     "timestamp": event.event_timestamp.isoformat() if event.event_timestamp else None,
                     "status_code": event.status_code,
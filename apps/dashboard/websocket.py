@@ -176,7 +176,7 @@ class DashboardWebSocketHandler:
             stream_data = []
             for event in events:
                 stream_data.append({
-                    "id": str(event.id),
+                    "id": str(event.public_id),
                     "event_type": event.event_type,
                     "timestamp": event.event_timestamp.isoformat(),
                     "status_code": event.status_code,
@@ -202,10 +202,10 @@ class DashboardWebSocketHandler:
             from apps.storage.crud import alert_crud, alert_rule_crud
             
             # Get active alerts
-            active_alerts = await alert_crud.get_active_alerts(session, tenant_id, limit=20)
+            active_alerts = await alert_crud.get_active_alerts(session, tenant_id=tenant_id, limit=20)
             
             # Get alert rules
-            alert_rules = await alert_rule_crud.get_active_rules(session, tenant_id)
+            alert_rules = await alert_rule_crud.get_active_rules(session, tenant_id=tenant_id)
             
             # Count by severity
             severity_counts = {}
@@ -214,7 +214,7 @@ class DashboardWebSocketHandler:
                 severity_counts[severity] = severity_counts.get(severity, 0) + 1
             
             # Recent alert activity
-            recent_alerts = await alert_crud.get_recent_alerts(session, tenant_id, limit=10)
+            recent_alerts = await alert_crud.get_recent_alert_rows(session, tenant_id=tenant_id, limit=10)
             
             return {
                 "tenant_id": str(tenant_id),
@@ -223,10 +223,10 @@ class DashboardWebSocketHandler:
                 "total_rules": len(alert_rules),
                 "recent_alerts": [
                     {
-                        "id": str(alert.id),
-                        "title": alert.title,
-                        "severity": alert.severity,
-                        "triggered_at": alert.triggered_at.isoformat() if alert.triggered_at else None
+                        "id": alert["id"],
+                        "title": alert["title"],
+                        "severity": alert["severity"],
+                        "triggered_at": alert["triggered_at"].isoformat() if alert["triggered_at"] else None
                     }
                     for alert in recent_alerts
                 ]
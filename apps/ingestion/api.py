@@ -245,7 +245,7 @@ async def get_event(
         
         # Convert to dict
         event_dict = {
-            "id": str(event.id),
+            "id": str(event.public_id),
             "event_type": event.event_type,
             "source": event.source,
             "source_version": event.source_version,
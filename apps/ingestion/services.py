@@ -545,7 +545,7 @@ class EventIngestionService:
             event_dicts = []
             for event in events:
                 event_dict = {
-                    "id": str(event.id),
+                    "id": str(event.public_id),
                     "event_type": event.event_type,
                     "source": event.source,
                     "source_version": event.source_version,
@@ -7,6 +7,7 @@ from .tasks import (
     enrich_event_data,
     generate_event_analytics,
     cleanup_old_events,
+    create_event_partitions,
     heartbeat
 )
 
@@ -17,5 +18,6 @@ __all__ = [
     "enrich_event_data",
     "generate_event_analytics",
     "cleanup_old_events",
+    "create_event_partitions",
     "heartbeat"
 ]
@@ -533,6 +533,23 @@ def cleanup_old_events(self, tenant_id: str, retention_days: int = 90) -> Dict[s
         
         # Delete old events
         if events_to_delete > 0:
+            # alerts.event_id has no FK to the partitioned events table, so
+            # clear references to the rows being removed ourselves
+            session.execute(
+                text("""
+                    UPDATE alerts SET event_id = NULL
+                    WHERE event_id IN (
+                        SELECT id FROM events
+                        WHERE tenant_id = :tenant_id
+                        AND event_timestamp < :cutoff_date
+                    )
+                """),
+                {
+                    "tenant_id": tenant_id,
+                    "cutoff_date": cutoff_date
+                }
+            )
+            
             delete_result = session.execute(
                 text("""
                     DELETE FROM events 
@@ -545,6 +562,18 @@ def cleanup_old_events(self, tenant_id: str, retention_days: int = 90) -> Dict[s
                 }
             )
             
+            session.execute(
+                text("""
+                    DELETE FROM events_rollup_1m
+                    WHERE tenant_id = :tenant_id
+                    AND bucket < :cutoff_date
+                """),
+                {
+                    "tenant_id": tenant_id,
+                    "cutoff_date": cutoff_date
+                }
+            )
+            
             session.commit()
             
             deleted_count = delete_result.rowcount
@@ -599,6 +628,48 @@ def cleanup_old_events(self, tenant_id: str, retention_days: int = 90) -> Dict[s
         raise
 
 
+@celery_app.task(bind=True, name="create_event_partitions")
+def create_event_partitions(self, months_ahead: int = 2) -> Dict[str, Any]:
+    """Create monthly partitions of the events table ahead of time.
+    
+    Starts from next month: rows for the current month may already sit in
+    events_default, and PostgreSQL refuses to attach a range that overlaps
+    rows in the default partition.
+    """
+    task_id = self.request.id
+    logger.info(f"Starting event partition task {task_id} ({months_ahead} months ahead)")
+    
+    try:
+        session = get_db_session()
+        created = []
+        
+        month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        for _ in range(months_ahead):
+            month_start = (month_start + timedelta(days=32)).replace(day=1)
+            month_end = (month_start + timedelta(days=32)).replace(day=1)
+            partition = f"events_{month_start:%Y_%m}"
+            
+            session.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {partition} PARTITION OF events "
+                    f"FOR VALUES FROM ('{month_start:%Y-%m-%d} 00:00:00+00') "
+                    f"TO ('{month_end:%Y-%m-%d} 00:00:00+00') "
+                    f"WITH (fillfactor = 90)"
+                )
+            )
+            created.append(partition)
+        
+        session.commit()
+        session.close()
+        
+        logger.info(f"Event partition task {task_id} completed: {', '.join(created)}")
+        return {"partitions": created}
+        
+    except Exception as e:
+        logger.error(f"Event partition task {task_id} failed: {e}")
+        raise
+
+
 # Helper functions for event processing
 def process_api_event(event_data: Dict[str, Any]) -> Dict[str, Any]:
     """Process API request/response events."""
@@ -724,4 +795,5 @@ def heartbeat():
 
 # Export Celery app
 __all__ = ["celery_app", "process_event", "process_batch_events", "enrich_event_data", 
-           "generate_event_analytics", "cleanup_old_events", "heartbeat"]
+           "generate_event_analytics", "cleanup_old_events", "create_event_partitions",
+           "heartbeat"]
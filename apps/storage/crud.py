@@ -1,19 +1,20 @@
 """CRUD operations with tenant isolation for PulseStream."""
 
 import uuid
-from typing import Any, Dict, List, Optional, Type, TypeVar, Generic
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple, Type, TypeVar, Generic
 from datetime import datetime, timedelta
 
-from sqlalchemy import and_, desc, func, select, update, delete, or_
+from sqlalchemy import String, and_, cast, desc, func, select, tuple_, update, delete, or_
+from sqlalchemy.engine import RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload, selectinload
 
 from core.database import Base, TenantMixin
 from core.errors import TenantNotFoundError, ValidationError
 from core.logging import get_logger
 from apps.storage.models.tenant import Tenant
 from apps.storage.models.user import User
-from apps.storage.models.event import Event
+from apps.storage.models.event import Event, events_rollup_1m
 from apps.storage.models.alert import AlertRule, Alert
 
 logger = get_logger(__name__)
@@ -134,6 +135,25 @@ class TenantCRUD(BaseCRUD[TenantModelType]):
         )
         return result.scalar_one_or_none()
     
+    async def get_updated_at_by_tenant(
+        self,
+        session: AsyncSession,
+        *,
+        tenant_id: uuid.UUID,
+        id: uuid.UUID
+    ) -> Optional[datetime]:
+        """Get only a record's last update timestamp, with tenant isolation."""
+        result = await session.execute(
+            select(self.model.updated_at).where(
+                and_(
+                    self.model.id == id,
+                    self.model.tenant_id == tenant_id,
+                    self.model.is_deleted == False
+                )
+            )
+        )
+        return result.scalar_one_or_none()
+    
     async def get_multi_by_tenant(
         self,
         session: AsyncSession,
@@ -217,7 +237,7 @@ class TenantCRUDOperations(BaseCRUD[Tenant]):
         result = await session.execute(
             select(Tenant).where(
                 and_(
-                    Tenant.api_key == api_key,
+                    Tenant.api_key == Tenant.hash_api_key(api_key),
                     Tenant.is_active == True,
                     Tenant.is_deleted == False
                 )
@@ -254,7 +274,7 @@ class TenantCRUDOperations(BaseCRUD[Tenant]):
         timezone: Optional[str] = None,
         api_key: Optional[str] = None
     ) -> Tenant:
-        """Create a new tenant with auto-generated API key."""
+        """Create a new tenant, storing the digest of the given (or a generated) API key."""
         # Check if slug already exists
         existing = await self.get_by_slug(session, slug=slug)
         if existing:
@@ -263,7 +283,7 @@ class TenantCRUDOperations(BaseCRUD[Tenant]):
         tenant_data = {
             "name": name,
             "slug": slug,
-            "api_key": api_key or Tenant.generate_api_key(),
+            "api_key": Tenant.hash_api_key(api_key or Tenant.generate_api_key()),
             "contact_email": contact_email,
             "billing_email": billing_email,
             "subscription_tier": subscription_tier,
@@ -322,17 +342,81 @@ class UserCRUDOperations(TenantCRUD[User]):
         )
         return result.scalar_one_or_none()
     
+    async def get_by_tenant_slug_and_email(
+        self,
+        session: AsyncSession,
+        *,
+        slug: str,
+        email: str
+    ) -> Optional[User]:
+        """Get user by email within the tenant with the given slug, in one query."""
+        result = await session.execute(
+            select(User)
+            .join(Tenant, User.tenant_id == Tenant.id)
+            .where(
+                and_(
+                    Tenant.slug == slug,
+                    Tenant.is_deleted == False,
+                    User.email == email,
+                    User.is_deleted == False
+                )
+            )
+        )
+        return result.scalar_one_or_none()
+    
+    async def stream_user_projections(
+        self,
+        session: AsyncSession,
+        *,
+        tenant_id: uuid.UUID,
+        columns: Sequence[str],
+        after: Optional[Tuple[datetime, uuid.UUID]] = None,
+        limit: int = 100,
+        search: Optional[str] = None
+    ) -> AsyncIterator[RowMapping]:
+        """Stream a page of a tenant's users, in (created_at, id) order, as mapping rows.
+        
+        Keyset pagination: the page starts after the (created_at, id) of
+        the previous page's last row, so deep pages cost the same as the
+        first. Rows skip ORM hydration and arrive as the server sends them.
+        """
+        query = select(*(getattr(User, column) for column in columns)).where(
+            and_(
+                User.tenant_id == tenant_id,
+                User.is_deleted == False
+            )
+        )
+        
+        if after is not None:
+            query = query.where(tuple_(User.created_at, User.id) > tuple_(*after))
+        
+        if search:
+            pattern = f"%{search}%"
+            query = query.where(
+                or_(
+                    User.email.ilike(pattern),
+                    User.full_name.ilike(pattern),
+                    User.username.ilike(pattern)
+                )
+            )
+        
+        query = query.order_by(User.created_at, User.id).limit(limit)
+        result = await session.stream(query)
+        async for row in result.mappings():
+            yield row
+    
     async def create_user(
         self,
         session: AsyncSession,
         *,
         tenant_id: uuid.UUID,
         email: str,
-        password: str,
+        password: Optional[str] = None,
         full_name: Optional[str] = None,
-        role: str = "viewer"
+        role: str = "viewer",
+        hashed_password: Optional[str] = None
     ) -> User:
-        """Create a new user."""
+        """Create a new user from a plain password, or one already hashed."""
         # Check if email already exists for this tenant
         existing = await self.get_by_email(session, tenant_id=tenant_id, email=email)
         if existing:
@@ -343,7 +427,7 @@ class UserCRUDOperations(TenantCRUD[User]):
             "email": email,
             "full_name": full_name,
             "role": role,
-            "hashed_password": User.get_password_hash(password),
+            "hashed_password": hashed_password or User.get_password_hash(password),
             "password_changed_at": func.now(),
         }
         
@@ -519,6 +603,44 @@ class EventCRUDOperations(TenantCRUD[Event]):
         result = await session.execute(query)
         return result.scalar()
     
+    async def count_from_rollup(
+        self,
+        session: AsyncSession,
+        *,
+        tenant_id: uuid.UUID,
+        since: datetime,
+        event_type: Optional[str] = None
+    ) -> int:
+        """Count live events since a time from the per-minute rollup.
+        
+        Whole minutes are summed from the rollup, one row per bucket; the
+        partial minute starting at ``since``, if any, is counted from events,
+        so the window is exact. Both halves run as one statement.
+        """
+        first_bucket = since.replace(second=0, microsecond=0)
+        if first_bucket < since:
+            first_bucket += timedelta(minutes=1)
+        
+        buckets = select(func.coalesce(func.sum(events_rollup_1m.c.count), 0)).where(
+            events_rollup_1m.c.tenant_id == tenant_id,
+            events_rollup_1m.c.bucket >= first_bucket
+        )
+        head = select(func.count()).select_from(Event).where(
+            Event.tenant_id == tenant_id,
+            Event.event_timestamp >= since,
+            Event.event_timestamp < first_bucket,
+            Event.is_deleted == False
+        )
+        
+        if event_type:
+            buckets = buckets.where(events_rollup_1m.c.event_type == event_type)
+            head = head.where(Event.event_type == event_type)
+        
+        result = await session.execute(
+            select(buckets.scalar_subquery() + head.scalar_subquery())
+        )
+        return int(result.scalar())
+    
     async def get_last_by_tenant(
         self,
         session: AsyncSession,
@@ -595,7 +717,7 @@ class EventCRUDOperations(TenantCRUD[Event]):
         query = select(Event).where(
             and_(
                 Event.tenant_id == tenant_id,
-                Event.alert_processed == "false",
+                Event.alert_processed == False,
                 Event.event_timestamp >= since,
                 Event.is_deleted == False
             )
@@ -637,7 +759,9 @@ class AlertRuleCRUDOperations(TenantCRUD[AlertRule]):
     ) -> List[AlertRule]:
         """Get all active alert rules for a tenant."""
         result = await session.execute(
-            select(AlertRule).where(
+            select(AlertRule)
+            .options(raiseload("*"))
+            .where(
                 and_(
                     AlertRule.tenant_id == tenant_id,
                     AlertRule.is_active == True,
@@ -647,6 +771,71 @@ class AlertRuleCRUDOperations(TenantCRUD[AlertRule]):
         )
         return list(result.scalars().all())
     
+    async def get_names_by_ids(
+        self,
+        session: AsyncSession,
+        *,
+        ids: Iterable[uuid.UUID]
+    ) -> Dict[uuid.UUID, str]:
+        """Map alert rule IDs to names with a single lookup."""
+        ids = list(ids)
+        if not ids:
+            return {}
+        
+        result = await session.execute(
+            select(AlertRule.id, AlertRule.name).where(AlertRule.id.in_(ids))
+        )
+        return dict(result.tuples().all())
+    
+    async def list_rule_projections(
+        self,
+        session: AsyncSession,
+        *,
+        tenant_id: uuid.UUID,
+        columns: Sequence[str],
+        active_only: bool = False,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[RowMapping]:
+        """List the given columns of a tenant's alert rules as mapping rows.
+        
+        Read-only: rows skip ORM hydration and the identity map entirely.
+        """
+        query = select(*(getattr(AlertRule, column) for column in columns)).where(
+            and_(
+                AlertRule.tenant_id == tenant_id,
+                AlertRule.is_deleted == False
+            )
+        )
+        
+        if active_only:
+            query = query.where(AlertRule.is_active == True)
+        
+        query = query.order_by(desc(AlertRule.created_at)).offset(skip).limit(limit)
+        result = await session.execute(query)
+        return list(result.mappings().all())
+    
+    async def get_tenant_counters(
+        self,
+        session: AsyncSession,
+        *,
+        tenant_id: uuid.UUID
+    ) -> Dict[str, int]:
+        """Get total and active rule counts for a tenant in one scan."""
+        result = await session.execute(
+            select(
+                func.count().label("total"),
+                func.count().filter(AlertRule.is_active == True).label("active")
+            )
+            .where(
+                and_(
+                    AlertRule.tenant_id == tenant_id,
+                    AlertRule.is_deleted == False
+                )
+            )
+        )
+        return dict(result.one()._mapping)
+    
     async def get_rules_for_evaluation(
         self,
         session: AsyncSession,
@@ -690,7 +879,7 @@ class AlertCRUDOperations(TenantCRUD[Alert]):
         message: str,
         severity: str,
         trigger_data: Optional[Dict[str, Any]] = None,
-        event_id: Optional[uuid.UUID] = None
+        event_id: Optional[int] = None
     ) -> Alert:
         """Create a new alert."""
         alert_data = {
@@ -716,7 +905,7 @@ class AlertCRUDOperations(TenantCRUD[Alert]):
         """Get active alerts for a tenant."""
         result = await session.execute(
             select(Alert)
-            .options(selectinload(Alert.alert_rule))
+            .options(raiseload("*"))
             .where(
                 and_(
                     Alert.tenant_id == tenant_id,
@@ -729,6 +918,81 @@ class AlertCRUDOperations(TenantCRUD[Alert]):
         )
         return list(result.scalars().all())
     
+    async def list_alert_projections(
+        self,
+        session: AsyncSession,
+        *,
+        tenant_id: uuid.UUID,
+        columns: Sequence[str],
+        status: Optional[str] = None,
+        severity: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[RowMapping]:
+        """List the given columns of a tenant's alerts as mapping rows.
+        
+        Optionally filtered by status and severity. Read-only: rows skip ORM
+        hydration and the identity map entirely.
+        """
+        query = select(*(getattr(Alert, column) for column in columns)).where(
+            and_(
+                Alert.tenant_id == tenant_id,
+                Alert.is_deleted == False
+            )
+        )
+        
+        if status:
+            query = query.where(Alert.status == status)
+        if severity:
+            query = query.where(Alert.severity == severity)
+        
+        query = query.order_by(desc(Alert.triggered_at)).offset(skip).limit(limit)
+        result = await session.execute(query)
+        return list(result.mappings().all())
+    
+    async def count_by_status(
+        self,
+        session: AsyncSession,
+        *,
+        tenant_id: uuid.UUID,
+        status: str
+    ) -> int:
+        """Count alerts with a given status for a tenant."""
+        result = await session.execute(
+            select(func.count())
+            .select_from(Alert)
+            .where(
+                and_(
+                    Alert.tenant_id == tenant_id,
+                    Alert.status == status,
+                    Alert.is_deleted == False
+                )
+            )
+        )
+        return result.scalar()
+    
+    async def get_tenant_counters(
+        self,
+        session: AsyncSession,
+        *,
+        tenant_id: uuid.UUID
+    ) -> Dict[str, int]:
+        """Get total, active and resolved alert counts for a tenant in one scan."""
+        result = await session.execute(
+            select(
+                func.count().label("total"),
+                func.count().filter(Alert.status == "active").label("active"),
+                func.count().filter(Alert.status == "resolved").label("resolved")
+            )
+            .where(
+                and_(
+                    Alert.tenant_id == tenant_id,
+                    Alert.is_deleted == False
+                )
+            )
+        )
+        return dict(result.one()._mapping)
+    
     async def get_recent_alerts_for_rule(
         self,
         session: AsyncSession,
@@ -737,7 +1001,7 @@ class AlertCRUDOperations(TenantCRUD[Alert]):
         hours: int = 1
     ) -> List[Alert]:
         """Get recent alerts for a specific rule."""
-        cutoff = func.now() - func.interval(f'{hours} hours')
+        cutoff = func.now() - timedelta(hours=hours)
         
         result = await session.execute(
             select(Alert).where(
@@ -771,6 +1035,37 @@ class AlertCRUDOperations(TenantCRUD[Alert]):
             .limit(limit)
         )
         return list(result.scalars().all())
+    
+    async def get_recent_alert_rows(
+        self,
+        session: AsyncSession,
+        *,
+        tenant_id: uuid.UUID,
+        limit: int = 10
+    ) -> List[RowMapping]:
+        """Get lightweight rows for a tenant's most recent alerts.
+        
+        Ids come back as text straight from the driver, and no ORM objects
+        are built.
+        """
+        result = await session.execute(
+            select(
+                cast(Alert.id, String).label("id"),
+                Alert.title,
+                Alert.severity,
+                Alert.status,
+                Alert.triggered_at
+            )
+            .where(
+                and_(
+                    Alert.tenant_id == tenant_id,
+                    Alert.is_deleted == False
+                )
+            )
+            .order_by(desc(Alert.triggered_at))
+            .limit(limit)
+        )
+        return list(result.mappings().all())
 
 
 # Create CRUD instances
@@ -1,9 +1,13 @@
 """Alert models for rule-based alerting system."""
 
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, ForeignKey, Text, Index
+from sqlalchemy import DDL, BigInteger, Column, String, Integer, Float, Boolean, DateTime, ForeignKey, Text, Index, desc, event
+from sqlalchemy import cast as sql_cast
 from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -11,6 +15,12 @@ from core.database import Base, TenantMixin
 from core.constants import AlertSeverity, AlertStatus, NotificationChannel, TIME_WINDOWS
 
 
+# One notification attempt, kept in memory until the alert is persisted
+NotificationRecord = namedtuple(
+    "NotificationRecord", "channel ok status body_length error timestamp"
+)
+
+
 class AlertRule(Base, TenantMixin):
     """Alert rule model for defining alerting conditions."""
     
@@ -97,7 +107,6 @@ class AlertRule(Base, TenantMixin):
         Boolean,
         default=True,
         nullable=False,
-        index=True,
         doc="Whether this rule is active"
     )
     
@@ -141,7 +150,6 @@ class AlertRule(Base, TenantMixin):
         UUID(as_uuid=True),
         ForeignKey("tenants.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
         doc="Tenant this rule belongs to"
     )
     
@@ -163,6 +171,10 @@ class AlertRule(Base, TenantMixin):
         Index('idx_alert_rules_tenant_active', 'tenant_id', 'is_active'),
         Index('idx_alert_rules_evaluation', 'is_active', 'last_evaluated_at'),
         Index('idx_alert_rules_event_type', 'tenant_id', 'event_type'),
+        # Containment lookups (notification_channels @> '["slack"]');
+        # jsonb_path_ops is smaller than the default jsonb_ops and covers @>
+        Index('ix_alert_rules_channels_gin', 'notification_channels', postgresql_using='gin',
+              postgresql_ops={'notification_channels': 'jsonb_path_ops'}),
     )
     
     def get_time_window_seconds(self) -> int:
@@ -174,21 +186,20 @@ class AlertRule(Base, TenantMixin):
         if not self.last_triggered_at:
             return False
         
-        cooldown_end = self.last_triggered_at + func.interval(f'{self.cooldown_minutes} minutes')
-        return func.now() < cooldown_end
+        cooldown_end = self.last_triggered_at + timedelta(minutes=self.cooldown_minutes)
+        return datetime.now(timezone.utc) < cooldown_end
+    
+    def is_armed(self) -> bool:
+        """Check if rule is active and out of cooldown (no alert count needed)."""
+        return self.is_active and not self.is_in_cooldown()
+    
+    def within_rate_limit(self, recent_alerts_count: int) -> bool:
+        """Check if another alert fits under the hourly limit."""
+        return recent_alerts_count < self.max_alerts_per_hour
     
     def can_trigger_alert(self, recent_alerts_count: int) -> bool:
         """Check if rule can trigger an alert."""
-        if not self.is_active:
-            return False
-        
-        if self.is_in_cooldown():
-            return False
-        
-        if recent_alerts_count >= self.max_alerts_per_hour:
-            return False
-        
-        return True
+        return self.is_armed() and self.within_rate_limit(recent_alerts_count)
     
     def get_notification_channels(self) -> List[str]:
         """Get list of notification channels."""
@@ -293,9 +304,10 @@ class Alert(Base, TenantMixin):
     )
     
     # Related Event
+    # Not a foreign key: the partitioned events table has no unique key on
+    # id alone, so dangling references are cleared by cleanup_old_events
     event_id = Column(
-        UUID(as_uuid=True),
-        ForeignKey("events.id", ondelete="SET NULL"),
+        BigInteger,
         nullable=True,
         index=True,
         doc="Event that triggered this alert (if applicable)"
@@ -333,7 +345,6 @@ class Alert(Base, TenantMixin):
         UUID(as_uuid=True),
         ForeignKey("tenants.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
         doc="Tenant this alert belongs to"
     )
     
@@ -341,7 +352,6 @@ class Alert(Base, TenantMixin):
         UUID(as_uuid=True),
         ForeignKey("alert_rules.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
         doc="Alert rule that triggered this alert"
     )
     
@@ -359,14 +369,18 @@ class Alert(Base, TenantMixin):
     
     event = relationship(
         "Event",
+        primaryjoin="foreign(Alert.event_id) == Event.id",
         lazy="select"
     )
     
     # Database optimizations
     __table_args__ = (
-        Index('idx_alerts_tenant_status', 'tenant_id', 'status'),
+        # Covering index for alert listings filtered by status and/or severity,
+        # newest first; its (tenant_id, status) prefix serves status-only filters
+        Index('idx_alerts_tenant_status_severity', 'tenant_id', 'status', 'severity',
+              desc('triggered_at'), postgresql_include=['title']),
         Index('idx_alerts_tenant_severity', 'tenant_id', 'severity'),
-        Index('idx_alerts_triggered_at', 'tenant_id', 'triggered_at'),
+        Index('idx_alerts_triggered_at', 'tenant_id', desc('triggered_at')),
         Index('idx_alerts_rule_status', 'alert_rule_id', 'status'),
     )
     
@@ -380,15 +394,25 @@ class Alert(Base, TenantMixin):
         """Check if alert is resolved."""
         return self.status == AlertStatus.RESOLVED
     
-    @property
+    @hybrid_property
     def duration_minutes(self) -> Optional[int]:
         """Get alert duration in minutes."""
         if not self.resolved_at:
             # Calculate time since triggered
-            return int((func.now() - self.triggered_at).total_seconds() / 60)
+            return int((datetime.now(timezone.utc) - self.triggered_at).total_seconds() / 60)
         
         return int((self.resolved_at - self.triggered_at).total_seconds() / 60)
     
+    @duration_minutes.expression
+    def duration_minutes(cls):
+        """Alert duration in minutes, computed in SQL for column projections."""
+        return sql_cast(
+            func.floor(
+                func.extract("epoch", func.coalesce(cls.resolved_at, func.now()) - cls.triggered_at) / 60
+            ),
+            Integer
+        ).label("duration_minutes")
+    
     def resolve(self, resolved_by: str = "system", note: Optional[str] = None) -> None:
         """Resolve the alert."""
         self.status = AlertStatus.RESOLVED
@@ -408,24 +432,55 @@ class Alert(Base, TenantMixin):
         self.resolved_by = None
         self.resolution_note = None
     
-    def record_notification_sent(self, channel: str, success: bool, details: Optional[Dict] = None) -> None:
-        """Record a notification attempt."""
-        if not self.notifications_sent:
-            self.notifications_sent = {}
-        
-        if channel not in self.notifications_sent:
-            self.notifications_sent[channel] = []
+    def record_notification_sent(
+        self,
+        channel: str,
+        success: bool,
+        *,
+        status: Optional[int] = None,
+        body_length: Optional[int] = None,
+        error: Optional[str] = None
+    ) -> None:
+        """Record a notification attempt.
         
-        notification_record = {
-            'timestamp': func.now().isoformat(),
-            'success': success,
-            'details': details or {}
-        }
+        Records are buffered as tuples; flush_notification_records() writes
+        them to notifications_sent.
+        """
+        records = self.__dict__.get("_notification_records")
+        if records is None:
+            records = self.__dict__["_notification_records"] = []
         
-        self.notifications_sent[channel].append(notification_record)
+        records.append(NotificationRecord(
+            channel, success, status, body_length, error, datetime.now(timezone.utc)
+        ))
         
         if not success:
-            self.notification_failures += 1
+            self.notification_failures = (self.notification_failures or 0) + 1
+    
+    def flush_notification_records(self) -> None:
+        """Serialize buffered notification records into notifications_sent."""
+        records = self.__dict__.get("_notification_records")
+        if not records:
+            return
+        
+        # Assign a new dict so the JSONB change is tracked
+        notifications_sent = dict(self.notifications_sent or {})
+        for record in records:
+            details = {
+                key: value for key, value in (
+                    ("status", record.status),
+                    ("body_length", record.body_length),
+                    ("error", record.error),
+                ) if value is not None
+            }
+            notifications_sent.setdefault(record.channel, []).append({
+                'timestamp': record.timestamp.isoformat(),
+                'success': record.ok,
+                'details': details
+            })
+        
+        self.notifications_sent = notifications_sent
+        records.clear()
     
     def get_trigger_value(self, key: str, default: Any = None) -> Any:
         """Get a value from trigger data."""
@@ -462,3 +517,11 @@ class Alert(Base, TenantMixin):
             f"<Alert(id={self.id}, title='{self.title}', "
             f"severity='{self.severity}', status='{self.status}')>"
         )
+
+
+# Leave page space for HOT updates on status/notification changes
+event.listen(
+    Alert.__table__,
+    "after_create",
+    DDL("ALTER TABLE alerts SET (fillfactor = 90)"),
+)
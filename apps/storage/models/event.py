@@ -1,14 +1,15 @@
 """Event model for time-series data storage."""
 
+import uuid
 from typing import Any, Dict, Optional
 
-from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Index, Text
+from sqlalchemy import DDL, BigInteger, Column, Identity, PrimaryKeyConstraint, String, Integer, Float, Boolean, DateTime, ForeignKey, Index, Table, Text, desc, event
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from core.database import Base, TenantMixin
-from core.constants import EventType, ProcessingStatus, MAX_STRING_LENGTH
+from core.constants import EventType, ProcessingStatus, MAX_NAME_LENGTH, MAX_STRING_LENGTH
 
 
 class Event(Base, TenantMixin):
@@ -16,6 +17,25 @@ class Event(Base, TenantMixin):
     
     __tablename__ = "events"
     
+    # Sequential surrogate key: half the width of a UUID and appended at the
+    # right edge of the btree instead of splitting random pages
+    id = Column(
+        BigInteger,
+        Identity(always=True),
+        primary_key=True,
+        doc="Internal sequential identifier"
+    )
+    
+    # Identifier exposed through the API
+    public_id = Column(
+        UUID(as_uuid=True),
+        default=uuid.uuid4,
+        server_default=func.gen_random_uuid(),
+        nullable=False,
+        index=True,
+        doc="Public event identifier"
+    )
+    
     # Event Classification
     event_type = Column(
         String(50),
@@ -26,7 +46,7 @@ class Event(Base, TenantMixin):
     
     # Event Source Information
     source = Column(
-        String(MAX_STRING_LENGTH),
+        String(MAX_NAME_LENGTH),
         nullable=True,
         index=True,
         doc="Source of the event (service name, application, etc.)"
@@ -41,8 +61,8 @@ class Event(Base, TenantMixin):
     # Event Timing
     event_timestamp = Column(
         DateTime(timezone=True),
+        primary_key=True,
         nullable=False,
-        index=True,
         doc="When the event actually occurred (vs when it was ingested)"
     )
     
@@ -50,7 +70,6 @@ class Event(Base, TenantMixin):
         DateTime(timezone=True),
         server_default=func.now(),
         nullable=False,
-        index=True,
         doc="When the event was ingested into PulseStream"
     )
     
@@ -88,7 +107,6 @@ class Event(Base, TenantMixin):
         String(20),
         default=ProcessingStatus.PENDING,
         nullable=False,
-        index=True,
         doc="Processing status (pending, processing, completed, failed)"
     )
     
@@ -102,7 +120,6 @@ class Event(Base, TenantMixin):
     duration_ms = Column(
         Integer,
         nullable=True,
-        index=True,
         doc="Duration in milliseconds (for API calls, etc.)"
     )
     
@@ -148,10 +165,9 @@ class Event(Base, TenantMixin):
     
     # Alert Processing
     alert_processed = Column(
-        String(10),
-        default="false",
+        Boolean,
+        default=False,
         nullable=False,
-        index=True,
         doc="Whether this event has been processed for alerts"
     )
     
@@ -167,7 +183,6 @@ class Event(Base, TenantMixin):
         UUID(as_uuid=True),
         ForeignKey("tenants.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
         doc="Tenant this event belongs to"
     )
     
@@ -179,13 +194,28 @@ class Event(Base, TenantMixin):
     
     # Database optimizations
     __table_args__ = (
-        # Unique constraint for duplicate detection (tenant + external_id)
-        Index('idx_events_unique_external', 'tenant_id', 'external_id', unique=True, 
+        # Lookup index for duplicate detection (tenant + external_id). It cannot
+        # be unique on a partitioned table without including event_timestamp,
+        # so ingestion checks for an existing external_id before inserting.
+        Index('idx_events_unique_external', 'tenant_id', 'external_id',
               postgresql_where="external_id IS NOT NULL AND is_deleted = false"),
         
         # Time-based index for efficient querying by time ranges
-        Index('idx_events_tenant_timestamp', 'tenant_id', 'event_timestamp'),
+        # Append-mostly timestamps: BRIN keeps min/max per block range and stays
+        # a few KB instead of a full btree
+        Index('ix_events_event_timestamp', 'event_timestamp', postgresql_using='brin',
+              postgresql_with={'pages_per_range': 32}),
+        Index('ix_events_ingested_at', 'ingested_at', postgresql_using='brin',
+              postgresql_with={'pages_per_range': 32}),
+        
+        # Covering index in newest-first order: time-range listings are answered
+        # from the index alone, starting at the hot end
+        Index('idx_events_tenant_timestamp', 'tenant_id', desc('event_timestamp'),
+              postgresql_include=['event_type', 'status_code']),
         Index('idx_events_tenant_type_timestamp', 'tenant_id', 'event_type', 'event_timestamp'),
+        # Rule evaluation windows only ever read live events
+        Index('idx_events_active_tenant_type_timestamp', 'tenant_id', 'event_type',
+              desc('event_timestamp'), postgresql_where="is_deleted = false"),
         Index('idx_events_processing_status', 'processing_status', 'tenant_id'),
         Index('idx_events_alert_processing', 'alert_processed', 'tenant_id'),
         
@@ -201,8 +231,15 @@ class Event(Base, TenantMixin):
         Index('idx_events_payload_user_id', func.expr(
             "((payload->>'user_id'))"
         ), postgresql_using='gin'),
+        
+        # Range-partitioned by event time; see create_event_partitions
+        {'postgresql_partition_by': 'RANGE (event_timestamp)'},
     )
     
+    # Identity stays the id; event_timestamp is only in the table PK
+    # because PostgreSQL requires the partition key there
+    __mapper_args__ = {"primary_key": ["id"]}
+    
     @property
     def is_error(self) -> bool:
         """Check if this event represents an error."""
@@ -252,7 +289,7 @@ class Event(Base, TenantMixin):
     
     def mark_alert_processed(self) -> None:
         """Mark event as processed for alerts."""
-        self.alert_processed = "true"
+        self.alert_processed = True
     
     def add_alert_triggered(self) -> None:
         """Increment the alert counter."""
@@ -298,7 +335,7 @@ class Event(Base, TenantMixin):
     def to_dict_summary(self) -> Dict[str, Any]:
         """Convert to dictionary with summary information."""
         return {
-            'id': str(self.id),
+            'id': str(self.public_id),
             'event_type': self.event_type,
             'event_timestamp': self.event_timestamp.isoformat() if self.event_timestamp else None,
             'status_code': self.status_code,
@@ -317,3 +354,101 @@ class Event(Base, TenantMixin):
             f"<Event(id={self.id}, type='{self.event_type}', "
             f"timestamp={self.event_timestamp}, tenant_id={self.tenant_id})>"
         )
+
+
+# Uncompressed out-of-line payloads (see the initial migration); runs before
+# the default partition is created so partitions inherit it
+event.listen(
+    Event.__table__,
+    "after_create",
+    DDL("ALTER TABLE events ALTER COLUMN payload SET STORAGE EXTERNAL"),
+)
+
+# Catch-all partition so inserts succeed before monthly partitions exist
+event.listen(
+    Event.__table__,
+    "after_create",
+    DDL(
+        "CREATE TABLE IF NOT EXISTS events_default PARTITION OF events DEFAULT "
+        "WITH (fillfactor = 90)"
+    ),
+)
+
+
+# Per-minute counts of live (not soft-deleted) events, maintained by
+# statement-level insert and update triggers on events, so count-style rule
+# evaluations read one row per minute bucket instead of scanning events.
+# Retention cleanup drops whole buckets along with the events.
+events_rollup_1m = Table(
+    "events_rollup_1m",
+    Base.metadata,
+    Column("tenant_id", UUID(as_uuid=True), ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False),
+    Column("event_type", String(50), nullable=False),
+    Column("bucket", DateTime(timezone=True), nullable=False),
+    Column("count", BigInteger, nullable=False, default=0),
+    PrimaryKeyConstraint("tenant_id", "event_type", "bucket"),
+)
+
+EVENTS_ROLLUP_1M_FUNCTION = """
+CREATE OR REPLACE FUNCTION events_rollup_1m_upsert() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO events_rollup_1m (tenant_id, event_type, bucket, count)
+    SELECT tenant_id, event_type, date_trunc('minute', event_timestamp), count(*)
+    FROM new_events
+    WHERE NOT is_deleted
+    GROUP BY 1, 2, 3
+    ON CONFLICT (tenant_id, event_type, bucket)
+    DO UPDATE SET count = events_rollup_1m.count + EXCLUDED.count;
+    RETURN NULL;
+END
+$$
+"""
+
+EVENTS_ROLLUP_1M_TRIGGER = """
+CREATE OR REPLACE TRIGGER events_rollup_1m_insert
+AFTER INSERT ON events
+REFERENCING NEW TABLE AS new_events
+FOR EACH STATEMENT EXECUTE FUNCTION events_rollup_1m_upsert()
+"""
+
+# Updates move rows between buckets: the old live rows are taken out and the
+# new live rows added, which covers soft deletes (and restores) along with
+# any change of type or timestamp. Statements that change neither net to zero
+# per bucket and write nothing.
+EVENTS_ROLLUP_1M_UPDATE_FUNCTION = """
+CREATE OR REPLACE FUNCTION events_rollup_1m_adjust() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO events_rollup_1m (tenant_id, event_type, bucket, count)
+    SELECT tenant_id, event_type, bucket, sum(delta)
+    FROM (
+        SELECT tenant_id, event_type, date_trunc('minute', event_timestamp) AS bucket, -1 AS delta
+        FROM old_events
+        WHERE NOT is_deleted
+        UNION ALL
+        SELECT tenant_id, event_type, date_trunc('minute', event_timestamp), 1
+        FROM new_events
+        WHERE NOT is_deleted
+    ) AS changes
+    GROUP BY 1, 2, 3
+    HAVING sum(delta) <> 0
+    ON CONFLICT (tenant_id, event_type, bucket)
+    DO UPDATE SET count = events_rollup_1m.count + EXCLUDED.count;
+    RETURN NULL;
+END
+$$
+"""
+
+EVENTS_ROLLUP_1M_UPDATE_TRIGGER = """
+CREATE OR REPLACE TRIGGER events_rollup_1m_update
+AFTER UPDATE ON events
+REFERENCING OLD TABLE AS old_events NEW TABLE AS new_events
+FOR EACH STATEMENT EXECUTE FUNCTION events_rollup_1m_adjust()
+"""
+
+# The trigger needs both tables, so install it once the whole schema exists
+event.listen(Base.metadata, "after_create", DDL(EVENTS_ROLLUP_1M_FUNCTION))
+event.listen(Base.metadata, "after_create", DDL(EVENTS_ROLLUP_1M_TRIGGER))
+event.listen(Base.metadata, "after_create", DDL(EVENTS_ROLLUP_1M_UPDATE_FUNCTION))
+event.listen(Base.metadata, "after_create", DDL(EVENTS_ROLLUP_1M_UPDATE_TRIGGER))
@@ -1,15 +1,16 @@
 """Tenant model for multi-tenant architecture."""
 
+import hashlib
 import secrets
 from typing import List, Optional
 
-from sqlalchemy import Column, String, Boolean, Integer, DateTime, Text, UniqueConstraint
+from sqlalchemy import Column, String, Boolean, Integer, DateTime, Index, LargeBinary, Text, UniqueConstraint
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from core.database import Base
-from core.constants import MAX_STRING_LENGTH
+from core.constants import MAX_EMAIL_LENGTH, MAX_STRING_LENGTH
 
 
 class Tenant(Base):
@@ -34,11 +35,9 @@ class Tenant(Base):
     
     # API Access
     api_key = Column(
-        String(64),
+        LargeBinary(32),
         nullable=False,
-        unique=True,
-        index=True,
-        doc="API key for tenant authentication"
+        doc="SHA-256 digest of the tenant API key (the key itself is never stored)"
     )
     
     # Status and Configuration
@@ -89,13 +88,13 @@ class Tenant(Base):
     
     # Contact and Billing
     contact_email = Column(
-        String(MAX_STRING_LENGTH),
+        String(MAX_EMAIL_LENGTH),
         nullable=True,
         doc="Primary contact email for tenant"
     )
     
     billing_email = Column(
-        String(MAX_STRING_LENGTH),
+        String(MAX_EMAIL_LENGTH),
         nullable=True,
         doc="Billing contact email"
     )
@@ -168,7 +167,11 @@ class Tenant(Base):
     # Table constraints
     __table_args__ = (
         UniqueConstraint('slug', name='uq_tenant_slug'),
-        UniqueConstraint('api_key', name='uq_tenant_api_key'),
+        # Equality-only lookup on a random digest: a hash index is smaller than
+        # a btree; 256-bit random keys make a uniqueness check unnecessary
+        Index('ix_tenants_api_key', 'api_key', postgresql_using='hash'),
+        Index('ix_tenants_notification_settings_gin', 'notification_settings', postgresql_using='gin',
+              postgresql_ops={'notification_settings': 'jsonb_path_ops'}),
     )
     
     @classmethod
@@ -176,6 +179,15 @@ class Tenant(Base):
         """Generate a secure API key."""
         return secrets.token_urlsafe(32)
     
+    @staticmethod
+    def hash_api_key(api_key: str) -> bytes:
+        """Hash an API key for storage and lookup."""
+        return hashlib.sha256(api_key.encode()).digest()
+    
+    def set_api_key(self, api_key: str) -> None:
+        """Set a new API key (only its digest is stored)."""
+        self.api_key = self.hash_api_key(api_key)
+    
     def is_rate_limited(self, current_requests: int) -> bool:
         """Check if tenant has exceeded rate limits."""
         return current_requests >= self.rate_limit_per_minute
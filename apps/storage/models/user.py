@@ -2,14 +2,14 @@
 
 from typing import Optional, List
 
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import DDL, Column, String, Boolean, Integer, SmallInteger, DateTime, ForeignKey, Index, event
+from sqlalchemy.dialects.postgresql import CITEXT, UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from passlib.context import CryptContext
 
 from core.database import Base, TenantMixin
-from core.constants import MAX_STRING_LENGTH, TenantRole
+from core.constants import MAX_NAME_LENGTH, TenantRole
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -22,10 +22,10 @@ class User(Base, TenantMixin):
     
     # Basic Information
     email = Column(
-        String(MAX_STRING_LENGTH),
+        CITEXT,
         nullable=False,
         index=True,
-        doc="User email address (unique per tenant)"
+        doc="User email address (unique per tenant, case-insensitive)"
     )
     
     username = Column(
@@ -35,7 +35,7 @@ class User(Base, TenantMixin):
     )
     
     full_name = Column(
-        String(MAX_STRING_LENGTH),
+        String(MAX_NAME_LENGTH),
         nullable=True,
         doc="User's full name"
     )
@@ -85,8 +85,8 @@ class User(Base, TenantMixin):
     )
     
     login_count = Column(
-        String(20),
-        default="0",
+        Integer,
+        default=0,
         nullable=False,
         doc="Total login count"
     )
@@ -114,8 +114,8 @@ class User(Base, TenantMixin):
     
     # Security
     failed_login_attempts = Column(
-        String(10),
-        default="0",
+        SmallInteger,
+        default=0,
         nullable=False,
         doc="Number of failed login attempts"
     )
@@ -149,6 +149,13 @@ class User(Base, TenantMixin):
         lazy="select"
     )
     
+    # Database optimizations
+    __table_args__ = (
+        # Keyset pagination of a tenant's live users, in (created_at, id) order
+        Index('idx_users_active_tenant_created', 'tenant_id', 'created_at', 'id',
+              postgresql_where="is_deleted = false"),
+    )
+    
     # Class methods for password handling
     @classmethod
     def verify_password(cls, plain_password: str, hashed_password: str) -> bool:
@@ -200,13 +207,13 @@ class User(Base, TenantMixin):
         """Record a successful login."""
         self.last_login_at = func.now()
         self.last_active_at = func.now()
-        self.login_count = str(int(self.login_count) + 1)
-        self.failed_login_attempts = "0"
+        self.login_count += 1
+        self.failed_login_attempts = 0
     
     def record_failed_login(self) -> None:
         """Record a failed login attempt."""
-        current_attempts = int(self.failed_login_attempts)
-        self.failed_login_attempts = str(current_attempts + 1)
+        current_attempts = self.failed_login_attempts
+        self.failed_login_attempts = current_attempts + 1
         
         # Lock account after 5 failed attempts for 30 minutes
         if current_attempts >= 4:
@@ -253,3 +260,11 @@ class User(Base, TenantMixin):
     def __repr__(self) -> str:
         """Detailed representation."""
         return f"<User(id={self.id}, email='{self.email}', role='{self.role}', tenant_id={self.tenant_id})>"
+
+
+# CITEXT email column needs the extension before the table is created
+event.listen(
+    User.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS citext"),
+)
@@ -1,14 +1,18 @@
 """Core authentication and authorization for PulseStream."""
 
+import hashlib
+import time
 import uuid
 from datetime import datetime, timedelta
-from typing import Optional, Union, Dict, Any
+from typing import Optional, Union, Dict, Any, Tuple
 
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
 from core.config import settings
 from core.database import get_async_session
@@ -19,6 +23,14 @@ from apps.storage.crud import user_crud, tenant_crud
 
 logger = get_logger(__name__)
 
+# In-process cache of authenticated tenants, keyed by API key digest
+TENANT_CACHE_TTL_SECONDS = 60
+TENANT_CACHE_MAX_SIZE = 10_000
+
+# In-process cache of verified JWT payloads, keyed by token digest
+TOKEN_CACHE_TTL_SECONDS = 5
+TOKEN_CACHE_MAX_SIZE = 10_000
+
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -34,6 +46,41 @@ class AuthManager:
         self.algorithm = settings.algorithm
         self.access_token_expire_minutes = settings.access_token_expire_minutes
         self.refresh_token_expire_days = settings.refresh_token_expire_days
+        # Token digest -> (verified payload, expiry on the wall clock)
+        self._payload_cache: Dict[bytes, Tuple[Dict[str, Any], float]] = {}
+    
+    @staticmethod
+    def _token_digest(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+    
+    def _get_cached_payload(self, token_digest: bytes) -> Optional[Dict[str, Any]]:
+        """Get a cached token payload if it has not expired."""
+        entry = self._payload_cache.get(token_digest)
+        if entry is None:
+            return None
+        
+        payload, expires_at = entry
+        if expires_at < time.time():
+            self._payload_cache.pop(token_digest, None)
+            return None
+        return payload
+    
+    def _cache_payload(self, token_digest: bytes, payload: Dict[str, Any]) -> None:
+        """Cache a verified payload, never past the token's own expiry."""
+        expires_at = time.time() + TOKEN_CACHE_TTL_SECONDS
+        if isinstance(payload.get("exp"), (int, float)):
+            expires_at = min(expires_at, payload["exp"])
+        
+        if len(self._payload_cache) >= TOKEN_CACHE_MAX_SIZE:
+            self._payload_cache.pop(next(iter(self._payload_cache)))
+        self._payload_cache[token_digest] = (payload, expires_at)
+    
+    def invalidate_token(self, token: str) -> None:
+        """Drop a token's cached payload (e.g. on logout).
+        
+        Only affects this process; the token itself stays valid until it expires.
+        """
+        self._payload_cache.pop(self._token_digest(token), None)
     
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify a password against its hash."""
@@ -78,10 +125,21 @@ class AuthManager:
         return encoded_jwt
     
     def verify_token(self, token: str) -> Dict[str, Any]:
-        """Verify and decode a JWT token."""
+        """Verify and decode a JWT token.
+        
+        Payloads are cached for TOKEN_CACHE_TTL_SECONDS, so a client's burst
+        of requests verifies its token's signature once. Callers get their own
+        copy, so mutating it cannot corrupt the cached entry.
+        """
+        token_digest = self._token_digest(token)
+        cached_payload = self._get_cached_payload(token_digest)
+        if cached_payload is not None:
+            return dict(cached_payload)
+        
         try:
             payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            return payload
+            self._cache_payload(token_digest, payload)
+            return dict(payload)
         except JWTError as e:
             logger.warning(f"JWT verification failed: {e}")
             raise HTTPException(
@@ -208,6 +266,46 @@ class TenantAuthManager:
     def __init__(self):
         self.secret_key = settings.secret_key
         self.algorithm = settings.algorithm
+        # API key digest -> (detached tenant snapshot, expiry on the monotonic clock)
+        self._tenant_cache: Dict[bytes, Tuple[Tenant, float]] = {}
+    
+    def _get_cached_tenant(self, key_digest: bytes) -> Optional[Tenant]:
+        """Get a cached tenant snapshot if it has not expired."""
+        entry = self._tenant_cache.get(key_digest)
+        if entry is None:
+            return None
+        
+        tenant, expires_at = entry
+        if expires_at < time.monotonic():
+            self._tenant_cache.pop(key_digest, None)
+            return None
+        return tenant
+    
+    def _cache_tenant(self, key_digest: bytes, tenant: Tenant) -> None:
+        """Cache a detached snapshot of a tenant's loaded columns."""
+        # Snapshot rather than the request's instance, which the handler may
+        # still modify; the snapshot stays clean so it can be merged anywhere
+        snapshot = Tenant(**{
+            attr.key: getattr(tenant, attr.key) for attr in inspect(Tenant).column_attrs
+        })
+        make_transient_to_detached(snapshot)
+        
+        if len(self._tenant_cache) >= TENANT_CACHE_MAX_SIZE:
+            self._tenant_cache.pop(next(iter(self._tenant_cache)))
+        self._tenant_cache[key_digest] = (snapshot, time.monotonic() + TENANT_CACHE_TTL_SECONDS)
+    
+    def invalidate_tenant(self, tenant_id: uuid.UUID) -> None:
+        """Drop cached entries for a tenant after it changes.
+        
+        Only affects this process; other workers pick the change up within
+        TENANT_CACHE_TTL_SECONDS.
+        """
+        stale = [
+            key_digest for key_digest, (tenant, _) in self._tenant_cache.items()
+            if tenant.id == tenant_id
+        ]
+        for key_digest in stale:
+            self._tenant_cache.pop(key_digest, None)
     
     async def authenticate_tenant(
         self, 
@@ -248,6 +346,13 @@ class TenantAuthManager:
                     headers={"WWW-Authenticate": "APIKey"},
                 )
             
+            # Serve repeat keys from the cache: attach a copy to this
+            # request's session without reloading it
+            key_digest = Tenant.hash_api_key(api_key)
+            cached_tenant = self._get_cached_tenant(key_digest)
+            if cached_tenant is not None:
+                return await session.merge(cached_tenant, load=False)
+            
             # Authenticate tenant
             tenant = await self.authenticate_tenant(session, api_key)
             
@@ -258,6 +363,7 @@ class TenantAuthManager:
                     headers={"WWW-Authenticate": "APIKey"},
                 )
             
+            self._cache_tenant(key_digest, tenant)
             return tenant
             
         except HTTPException:
@@ -323,8 +429,10 @@ def require_permissions(*required_permissions: str):
 
 def require_roles(*required_roles: str):
     """Decorator to require specific user roles."""
+    allowed_roles = frozenset(required_roles)
+    
     def role_checker(current_user: User = Depends(get_current_active_user)):
-        if current_user.role not in required_roles:
+        if current_user.role not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Required roles: {required_roles}, user role: {current_user.role}"
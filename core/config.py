@@ -31,8 +31,10 @@ class Settings(BaseSettings):
     # Database
     database_url: PostgresDsn = Field(env="DATABASE_URL")
     database_echo: bool = False
-    database_pool_size: int = 10
-    database_max_overflow: int = 20
+    database_pool_size: int = 20
+    database_max_overflow: int = 40
+    database_pool_recycle: int = 1800
+    database_statement_cache_size: int = 256
     
     # Redis
     redis_url: RedisDsn = Field(env="REDIS_URL")
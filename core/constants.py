@@ -77,6 +77,8 @@ REFRESH_TOKEN_EXPIRE_DAYS = 7
 
 # Database constants
 MAX_STRING_LENGTH = 255
+MAX_NAME_LENGTH = 128
+MAX_EMAIL_LENGTH = 254  # RFC 5321 path limit
 MAX_TEXT_LENGTH = 10000
 MAX_JSON_DEPTH = 10
 
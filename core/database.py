@@ -1,14 +1,16 @@
 """Database connection and session management for PulseStream."""
 
 import uuid
+from contextlib import AsyncExitStack
 from typing import Any, AsyncGenerator, Dict, Optional
 
+import orjson
 from sqlalchemy import Column, DateTime, String, Boolean, create_engine, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base, declared_attr
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
 from sqlalchemy.sql import func
 
 from core.config import settings
@@ -16,6 +18,12 @@ from core.logging import get_logger
 
 logger = get_logger(__name__)
 
+
+def _json_serializer(value: Any) -> str:
+    """Serialize JSON/JSONB column values with orjson (UUIDs and datetimes included)."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 # Create sync engine for migrations
 sync_engine = create_engine(
     str(settings.database_url),
@@ -23,16 +31,25 @@ sync_engine = create_engine(
     pool_size=settings.database_pool_size,
     max_overflow=settings.database_max_overflow,
     pool_pre_ping=True,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
 )
 
-# Create async engine for application
+# Create async engine for application; one pooled connection per concurrent
+# request coroutine, warmed at startup by warm_database_pool(). Each connection
+# keeps its prepared statements, so repeated stats/list queries skip parse/plan
 async_database_url = str(settings.database_url).replace("postgresql://", "postgresql+asyncpg://")
 async_engine = create_async_engine(
     async_database_url,
     echo=settings.database_echo,
+    poolclass=AsyncAdaptedQueuePool,
     pool_size=settings.database_pool_size,
     max_overflow=settings.database_max_overflow,
     pool_pre_ping=True,
+    pool_recycle=settings.database_pool_recycle,
+    connect_args={"prepared_statement_cache_size": settings.database_statement_cache_size},
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
 )
 
 # Session factories
@@ -55,7 +72,6 @@ class BaseModel:
         UUID(as_uuid=True),
         primary_key=True,
         default=uuid.uuid4,
-        index=True,
         doc="Unique identifier"
     )
     
@@ -161,6 +177,19 @@ async def init_database() -> None:
         raise
 
 
+async def warm_database_pool() -> None:
+    """Open pool_size connections up front so the first burst doesn't pay for connects."""
+    try:
+        # Hold every connection at once; opening them one after another would
+        # just reuse the first
+        async with AsyncExitStack() as stack:
+            for _ in range(settings.database_pool_size):
+                await stack.enter_async_context(async_engine.connect())
+        logger.info("Database pool warmed", pool_size=settings.database_pool_size)
+    except Exception as e:
+        logger.warning("Failed to warm database pool", error=str(e))
+
+
 async def close_database() -> None:
     """Close database connections."""
     logger.info("Closing database connections")
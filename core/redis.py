@@ -1,6 +1,7 @@
 """Redis client configuration for PulseStream."""
 
 import redis
+import redis.asyncio
 from typing import Optional
 from core.config import settings
 from core.logging import get_logger
@@ -10,6 +11,9 @@ logger = get_logger(__name__)
 # Global Redis client instance
 _redis_client: Optional[redis.Redis] = None
 
+# Global asyncio Redis client, for request-path callers on the event loop
+_async_redis_client: Optional[redis.asyncio.Redis] = None
+
 
 def get_redis_client() -> redis.Redis:
     """Get Redis client instance."""
@@ -42,6 +46,28 @@ def get_redis_client() -> redis.Redis:
     return _redis_client
 
 
+def get_async_redis_client() -> redis.asyncio.Redis:
+    """Get asyncio Redis client instance.
+    
+    Connections are opened lazily on first use, so this never blocks; a
+    down Redis surfaces as an error from the awaited command instead.
+    """
+    global _async_redis_client
+    
+    if _async_redis_client is None:
+        _async_redis_client = redis.asyncio.from_url(
+            str(settings.redis_url),
+            decode_responses=True,
+            socket_connect_timeout=5,
+            socket_timeout=5,
+            retry_on_timeout=True,
+            health_check_interval=30,
+            max_connections=20
+        )
+    
+    return _async_redis_client
+
+
 def get_redis_client_sync() -> redis.Redis:
     """Get synchronous Redis client instance."""
     try:
@@ -70,7 +96,14 @@ def get_redis_client_sync() -> redis.Redis:
 
 async def close_redis_client():
     """Close Redis client connection."""
-    global _redis_client
+    global _redis_client, _async_redis_client
+    
+    if _async_redis_client:
+        try:
+            await _async_redis_client.aclose()
+        except Exception as e:
+            logger.error(f"Error closing async Redis client: {e}")
+        _async_redis_client = None
     
     if _redis_client:
         try:
@@ -9,6 +9,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
+from sqlalchemy.exc import SQLAlchemyError
 
 from core.config import settings
 from core.logging import configure_logging, get_logger
@@ -25,7 +26,12 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting PulseStream application", version=settings.app_version)
     
-    # TODO: Initialize database connection
+    from core.database import warm_database_pool
+    await warm_database_pool()
+    
+    from apps.alerting.notifications import get_notification_service
+    app.state.notification_service = get_notification_service()
+    
     # TODO: Initialize Redis connection
     # TODO: Initialize background tasks
     
@@ -34,7 +40,12 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down PulseStream application")
     
-    # TODO: Close database connections
+    from apps.alerting.notifications import close_notification_service
+    await close_notification_service()
+    
+    from core.database import close_database
+    await close_database()
+    
     # TODO: Close Redis connections
     # TODO: Cleanup background tasks
 
@@ -144,6 +155,25 @@ def create_app() -> FastAPI:
             },
         )
     
+    @app.exception_handler(SQLAlchemyError)
+    async def database_exception_handler(request: Request, exc: SQLAlchemyError):
+        """Handle database errors not dealt with by the endpoint."""
+        logger.error(
+            "Database error",
+            error=str(exc),
+            type=type(exc).__name__,
+            url=str(request.url),
+            exc_info=True,
+        )
+        
+        return JSONResponse(
+            status_code=500,
+            content={
+                "error": "DATABASE_ERROR",
+                "message": "A database error occurred",
+            },
+        )
+    
     @app.exception_handler(Exception)
     async def general_exception_handler(request: Request, exc: Exception):
         """Handle unexpected exceptions."""
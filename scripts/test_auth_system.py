@@ -37,11 +37,11 @@ async def test_tenant_registration():
             )
             
             # Register tenant
-            tenant, owner_user = await tenant_service.register_tenant(session, tenant_data)
+            tenant, owner_user, api_key, _ = await tenant_service.register_tenant(session, tenant_data)
             
             logger.info(f"✅ Tenant created: {tenant.name} (ID: {tenant.id})")
             logger.info(f"✅ Owner user created: {owner_user.email} (ID: {owner_user.id})")
-            logger.info(f"✅ API Key: {tenant.api_key}")
+            logger.info(f"✅ API Key: {api_key}")
             
             return tenant, owner_user
             
@@ -171,12 +171,12 @@ async def test_tenant_authentication():
                 timezone="UTC"
             )
             
-            tenant, _ = await tenant_service.register_tenant(session, tenant_data)
+            tenant, _, api_key, _ = await tenant_service.register_tenant(session, tenant_data)
             logger.info(f"✅ Test tenant created: {tenant.name}")
             
             # Test API key authentication
             authenticated_tenant = await tenant_auth_manager.authenticate_tenant(
-                session, tenant.api_key
+                session, api_key
             )
             
             assert authenticated_tenant is not None, "Tenant authentication failed"
@@ -278,8 +278,8 @@ async def test_multi_tenant_isolation():
                 timezone="UTC"
             )
             
-            tenant1, user1 = await tenant_service.register_tenant(session, tenant1_data)
-            tenant2, user2 = await tenant_service.register_tenant(session, tenant2_data)
+            tenant1, user1, _, _ = await tenant_service.register_tenant(session, tenant1_data)
+            tenant2, user2, _, _ = await tenant_service.register_tenant(session, tenant2_data)
             
             logger.info(f"✅ Created tenant 1: {tenant1.name} (ID: {tenant1.id})")
             logger.info(f"✅ Created tenant 2: {tenant2.name} (ID: {tenant2.id})")
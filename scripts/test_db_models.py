@@ -9,6 +9,7 @@ from typing import Dict, Any
 from core.database import get_async_session, init_database
 from core.logging import configure_logging, get_logger
 from apps.storage.crud import tenant_crud, user_crud, event_crud, alert_rule_crud
+from apps.storage.models.tenant import Tenant
 
 # Configure logging
 configure_logging("DEBUG", "console")
@@ -21,17 +22,19 @@ async def test_tenant_operations():
     
     async for session in get_async_session():
         # Create test tenant
+        api_key = Tenant.generate_api_key()
         tenant = await tenant_crud.create_tenant(
             session,
             name="Test Company",
             slug="test-company",
-            contact_email="admin@test-company.com"
+            contact_email="admin@test-company.com",
+            api_key=api_key
         )
         logger.info(f"Created tenant: {tenant}")
         
         # Get by API key
         found_tenant = await tenant_crud.get_by_api_key(
-            session, api_key=tenant.api_key
+            session, api_key=api_key
         )
         assert found_tenant is not None
         assert found_tenant.id == tenant.id
@@ -421,7 +421,7 @@ async def create_test_tenant(session) -> Any:
         tenant = Tenant(
             name="Test Ingestion Tenant",
             slug="test-ingestion-tenant",
-            api_key="test-api-key-12345",
+            api_key=Tenant.hash_api_key("test-api-key-12345"),
             contact_email="test@ingestion.com",
             subscription_tier="test",
             timezone="UTC"
@@ -34,6 +34,10 @@ celery_app.conf.update(
     worker_prefetch_multiplier=1,
     task_routes=settings.celery_task_routes,
     beat_schedule={
+        "create-event-partitions": {
+            "task": "create_event_partitions",
+            "schedule": 24 * 60 * 60.0,  # Daily
+        },
         # TODO: Add periodic tasks
         # "process-metrics": {
         #     "task": "apps.processing.tasks.process_metrics",